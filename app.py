@@ -1,10 +1,13 @@
 import streamlit as st
-from ui.utils import apply_custom_css
+from ui.styles import apply_custom_css
 from ui.header import render_header
 from ui.sidebar import render_sidebar
 from ui.config_form import render_config_form
-from ui.execution import run_k6_test
-from ui.results import render_results
+from ui.execution import run_k6_test, render_run_queue
+from ui.startup import start_background_startup
+
+# Hanya modul ringan yang di-import di atas. Modul berat (pandas, numpy, altair, fpdf) baru dimuat
+# saat halaman hasil / laporan dibutuhkan, atau lebih dulu oleh thread startup di background.
 
 # --- PAGE CONFIGURATION ---
 st.set_page_config(
@@ -20,6 +23,11 @@ apply_custom_css()
 # --- HEADER ---
 render_header()
 
+# --- STARTUP BACKGROUND (sekali per proses) ---
+# History index (scan + inotify/polling), HTTP API (JSON, untuk CI / chat-ops), dan pre-warm
+# modul hasil + bundle run terbaru ke cache bersama.
+start_background_startup()
+
 # --- INIT SESSION STATE ---
 if 'test_running' not in st.session_state: st.session_state.test_running = False
 if 'test_results_path' not in st.session_state: st.session_state.test_results_path = None
@@ -29,14 +37,19 @@ if 'test_success' not in st.session_state: st.session_state.test_success = False
 render_sidebar()
 
 # --- CONFIGURATION (FORM) ---
-run_btn, target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95 = render_config_form()
+run_btn, target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95, data_file, data_mode = render_config_form()
 
-# --- EXECUTION LOGIC ---
+# --- EXECUTION LOGIC (masuk antrian run global) ---
 if run_btn:
-    run_k6_test(target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95)
+    run_k6_test(target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95, data_file, data_mode)
+
+# --- RUN QUEUE STATUS ---
+render_run_queue()
 
-# --- RESULTS ANALYSIS ---
-render_results()
+# --- RESULTS ANALYSIS (import lazy: pandas/altair hanya dimuat jika ada hasil yang dibuka) ---
+if st.session_state.test_success and st.session_state.test_results_path:
+    from ui.results import render_results
+    render_results()
 
 # --- FOOTER ---
-st.markdown("<br><br><center><small>Built with ❤️ using Streamlit & k6</small></center>", unsafe_allow_html=True)
\ No newline at end of file
+st.markdown("<br><br><center><small>Built with ❤️ using Streamlit & k6</small></center>", unsafe_allow_html=True)
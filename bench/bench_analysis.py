@@ -0,0 +1,142 @@
+"""
+Benchmark layer analisis (kecepatan + memori + kebenaran verdict).
+
+Contoh:
+    python bench/bench_analysis.py                          # 100k & 1M, semua pola
+    python bench/bench_analysis.py --sizes 10M,50M --patterns saturation
+    python bench/bench_analysis.py --json bench_output.json
+
+File CSV dibuat otomatis oleh generate_k6_csv.py (deterministik, di-cache di bench/data/).
+Exit code 1 jika verdict get_breaking_point_analysis tidak sesuai pola yang disuntikkan.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.generate_k6_csv import PATTERNS, generate_k6_csv, parse_rows
+from ui.utils import get_breaking_point_analysis, get_latency_heatmap, get_metric_summary, get_timeline_chart_data, load_test_results
+from ui.rollups import build_rollups, rollup_path
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+BREAK_TOLERANCE_S = 10  # 2 bucket resample 5s
+
+def measure(fn, repeat=1):
+    """Jalankan fn: waktu terbaik dari `repeat` kali, lalu satu kali lagi dengan tracemalloc untuk peak memori."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, best, peak / (1024 * 1024)
+
+def ensure_dataset(size, pattern, seed):
+    """Pakai file yang sudah ada di bench/data/, generate jika belum."""
+    csv_path = os.path.join(DATA_DIR, f"{pattern}_{size}.csv")
+    manifest_path = os.path.splitext(csv_path)[0] + '.json'
+    if os.path.exists(csv_path) and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if manifest.get('seed') == seed:
+            return csv_path, manifest
+    print(f"  generate {pattern}_{size} ...", flush=True)
+    return csv_path, generate_k6_csv(csv_path, parse_rows(size), pattern, seed)
+
+def check_verdict(diagnosis, manifest):
+    """Bandingkan hasil diagnosis dengan pola yang disuntikkan. Return: list pesan error (kosong = OK)."""
+    if not diagnosis:
+        return ["diagnosis None"]
+    problems = []
+    if diagnosis['status'] != manifest['expected_status']:
+        problems.append(f"status {diagnosis['status']} != {manifest['expected_status']}")
+    elif diagnosis['status'] == 'broken':
+        if diagnosis['pattern'] != manifest['expected_pattern']:
+            problems.append(f"pattern {diagnosis['pattern']} != {manifest['expected_pattern']}")
+        if abs(diagnosis['rel_time'] - manifest['break_second']) > BREAK_TOLERANCE_S:
+            problems.append(f"rel_time {diagnosis['rel_time']:.0f}s != {manifest['break_second']}s")
+    return problems
+
+def bench_file(csv_path, manifest, repeat):
+    """Benchmark semua tahap analisis untuk satu file."""
+    df, t_load, m_load = measure(lambda: load_test_results(csv_path))
+    stages = {'load': (t_load, m_load)}
+
+    stats, t, m = measure(lambda: get_metric_summary(df, 'http_req_duration'), repeat)
+    stages['metric_summary'] = (t, m)
+
+    diagnosis, t, m = measure(lambda: get_breaking_point_analysis(df, stats), repeat)
+    stages['breaking_point'] = (t, m)
+
+    _, t, m = measure(lambda: get_timeline_chart_data(df), repeat)
+    stages['chart_data'] = (t, m)
+
+    _, t, m = measure(lambda: get_latency_heatmap(df), repeat)
+    stages['heatmap'] = (t, m)
+
+    # Mode berjendela (soak): peak memori harus konstan berapapun ukuran file
+    _, t, m = measure(lambda: build_rollups(csv_path))
+    stages['rollups'] = (t, m)
+    os.remove(rollup_path(csv_path))
+
+    return {
+        'file': manifest['file'],
+        'rows': manifest['rows'],
+        'stages': {name: {'seconds': round(t, 4), 'peak_mb': round(m, 1)} for name, (t, m) in stages.items()},
+        'problems': check_verdict(diagnosis, manifest),
+    }
+
+def print_report(results):
+    stage_names = list(results[0]['stages'].keys()) if results else []
+    header = f"{'file':<24}{'rows':>12}" + ''.join(f"{name:>22}" for name in stage_names) + "  verdict"
+    print()
+    print(header)
+    print('-' * len(header))
+    for res in results:
+        cells = ''.join(
+            f"{res['stages'][name]['seconds']:>10.3f}s {res['stages'][name]['peak_mb']:>8.1f}MB"
+            for name in stage_names
+        )
+        verdict = 'OK' if not res['problems'] else 'FAIL: ' + '; '.join(res['problems'])
+        print(f"{res['file']:<24}{res['rows']:>12,}{cells}  {verdict}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark layer analisis k6 dashboard.")
+    parser.add_argument('--sizes', default='100k,1M', help="Daftar ukuran dipisah koma (100k,1M,10M,50M)")
+    parser.add_argument('--patterns', default=','.join(PATTERNS), help="Daftar pola dipisah koma")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3, help="Jumlah pengulangan timing (diambil yang terbaik)")
+    parser.add_argument('--json', default=None, help="Simpan hasil ke file JSON")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes.split(','):
+        for pattern in args.patterns.split(','):
+            csv_path, manifest = ensure_dataset(size.strip(), pattern.strip(), args.seed)
+            print(f"  bench {manifest['file']} ...", flush=True)
+            results.append(bench_file(csv_path, manifest, args.repeat))
+            gc.collect()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if any(res['problems'] for res in results):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Benchmark startup dashboard (import + render pertama), tiap tahap di proses Python baru (cold import).
+
+Contoh:
+    python bench/bench_startup.py                            # import, render pertama, halaman hasil
+    python bench/bench_startup.py --repeat 5 --json startup.json
+    python bench/bench_startup.py --budget-import 0.1 --budget-render 1.5
+
+Tahap:
+    import          : import top-level app.py (dibaca dari app.py, jadi selalu sinkron)
+    first_render    : AppTest render pertama tanpa hasil terbuka, lalu satu rerun
+    results_cold    : render pertama dengan hasil terbuka, tanpa pre-warm (import berat + bundle dibangun)
+    results_warm    : buka run terbaru setelah thread startup selesai pre-warm (modul + bundle sudah di cache)
+
+Semua tahap berjalan di folder sementara (results/ kosong + satu run dari bench/data/), folder results/ repo tidak disentuh.
+Exit code 1 jika import top-level memuat modul berat (pandas, numpy, altair, pyarrow, fpdf) atau budget terlampaui.
+"""
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP_PATH = os.path.join(ROOT, 'app.py')
+HEAVY_MODULES = ('pandas', 'numpy', 'altair', 'pyarrow', 'fpdf')
+STAGES = ('import', 'first_render', 'results_cold', 'results_warm')
+BENCH_PROJECT = 'Bench_Startup'
+PREWARM_TIMEOUT_S = 300
+
+def app_import_source():
+    """Statement import top-level app.py (tanpa menjalankan Streamlit)."""
+    with open(APP_PATH) as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+def heavy_loaded():
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+# --- Child (satu tahap, proses baru) ---
+
+def child_import():
+    start = time.perf_counter()
+    import streamlit  # noqa: F401
+    t_streamlit = time.perf_counter() - start
+    start = time.perf_counter()
+    exec(app_import_source(), {})
+    t_app = time.perf_counter() - start
+    return {'seconds': t_streamlit + t_app, 'streamlit_s': t_streamlit, 'app_s': t_app, 'heavy_modules': heavy_loaded()}
+
+def _app_test():
+    from streamlit.testing.v1 import AppTest
+    return AppTest.from_file(APP_PATH, default_timeout=PREWARM_TIMEOUT_S)
+
+def _check(at):
+    errors = [e.value for e in at.exception]
+    if errors:
+        raise RuntimeError(f"App error: {errors[0]}")
+
+def child_first_render():
+    at = _app_test()
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    _check(at)
+    start = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - start
+    return {'seconds': first, 'rerun_s': rerun}
+
+def _open_results(at, path):
+    at.session_state.test_success = True
+    at.session_state.test_results_path = path
+    at.session_state.test_running = False
+
+def child_results_cold(path):
+    at = _app_test()
+    _open_results(at, path)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    _check(at)
+    start = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - start
+    return {'seconds': first, 'rerun_s': rerun}
+
+def child_results_warm(path):
+    at = _app_test()
+    at.run()
+    _check(at)
+    from ui.startup import get_startup_status
+    deadline = time.time() + PREWARM_TIMEOUT_S
+    while not get_startup_status()['done'] and time.time() < deadline:
+        time.sleep(0.05)
+    status = get_startup_status()
+    _open_results(at, path)
+    start = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - start
+    _check(at)
+    return {'seconds': first, 'prewarm_steps': status['steps'], 'prewarm_run': status['latest_run']}
+
+def run_child(stage, path):
+    if stage == 'import':
+        return child_import()
+    if stage == 'first_render':
+        return child_first_render()
+    if stage == 'results_cold':
+        return child_results_cold(path)
+    return child_results_warm(path)
+
+# --- Parent ---
+
+def prepare_workdir(source_csv):
+    """Folder kerja sementara: results/<proyek>/run.csv (satu-satunya run, jadi run terbaru yang di-pre-warm)."""
+    workdir = tempfile.mkdtemp(prefix='k6-startup-bench-')
+    os.makedirs(os.path.join(workdir, 'results', BENCH_PROJECT))
+    target = os.path.join('results', BENCH_PROJECT, os.path.basename(source_csv))
+    shutil.copy(source_csv, os.path.join(workdir, target))
+    return workdir, target
+
+def measure_stage(stage, workdir, path, repeat):
+    """Jalankan tahap `repeat` kali, masing-masing di proses baru. Return: median + semua sampel."""
+    env = dict(os.environ, K6_DASHBOARD_API_PORT='0', PYTHONPATH=ROOT)
+    if stage != 'results_warm':
+        env['K6_DASHBOARD_PREWARM'] = '0'
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', stage, '--path', path],
+                              cwd=workdir, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Tahap {stage} gagal:\n{proc.stderr[-2000:]}")
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    result = dict(samples[-1])
+    for field in ('seconds', 'rerun_s', 'streamlit_s', 'app_s'):
+        if field in result:
+            result[field] = statistics.median(s[field] for s in samples)
+    result['samples'] = [s['seconds'] for s in samples]
+    return result
+
+def print_report(results):
+    print()
+    print(f"{'stage':<16}{'median':>10}{'rerun':>10}  detail")
+    print('-' * 60)
+    for stage, res in results.items():
+        rerun = f"{res['rerun_s']:>9.3f}s" if 'rerun_s' in res else f"{'-':>10}"
+        if stage == 'import':
+            detail = f"streamlit {res['streamlit_s']:.3f}s + app {res['app_s']:.3f}s; modul berat: {', '.join(res['heavy_modules']) or '-'}"
+        elif stage == 'results_warm':
+            detail = 'pre-warm ' + ', '.join(f"{k} {v:.2f}s" for k, v in res['prewarm_steps'].items())
+        else:
+            detail = ''
+        print(f"{stage:<16}{res['seconds']:>9.3f}s{rerun}  {detail}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup (import + render pertama) k6 dashboard.")
+    parser.add_argument('--stages', default=','.join(STAGES), help="Daftar tahap dipisah koma")
+    parser.add_argument('--dataset', default='stable_100k', help="Run dari bench/data/ untuk tahap hasil")
+    parser.add_argument('--repeat', type=int, default=3, help="Jumlah proses per tahap (diambil median)")
+    parser.add_argument('--budget-import', type=float, default=None, help="Batas detik import app (di luar streamlit)")
+    parser.add_argument('--budget-render', type=float, default=None, help="Batas detik render pertama tanpa hasil")
+    parser.add_argument('--json', default=None, help="Simpan hasil ke file JSON")
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--path', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.path)))
+        return
+
+    from bench.bench_analysis import ensure_dataset
+    pattern, size = args.dataset.rsplit('_', 1)
+    source_csv, _ = ensure_dataset(size, pattern, 42)
+    workdir, path = prepare_workdir(source_csv)
+    try:
+        results = {}
+        for stage in args.stages.split(','):
+            stage = stage.strip()
+            print(f"  bench {stage} ...", flush=True)
+            results[stage] = measure_stage(stage, workdir, path, args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    problems = []
+    if results.get('import', {}).get('heavy_modules'):
+        problems.append(f"import top-level memuat modul berat: {', '.join(results['import']['heavy_modules'])}")
+    if args.budget_import is not None and 'import' in results and results['import']['app_s'] > args.budget_import:
+        problems.append(f"import app {results['import']['app_s']:.3f}s > budget {args.budget_import}s")
+    if args.budget_render is not None and 'first_render' in results and results['first_render']['seconds'] > args.budget_render:
+        problems.append(f"render pertama {results['first_render']['seconds']:.3f}s > budget {args.budget_render}s")
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""
+Generator data sintetis format CSV k6 (deterministik) untuk benchmark layer analisis.
+
+Contoh:
+    python bench/generate_k6_csv.py --rows 1000000 --pattern saturation
+    python bench/generate_k6_csv.py --rows 100000 --pattern sudden --seed 7 --out bench/data/custom.csv
+
+Setiap file ditemani manifest `<nama>.json` berisi pola yang disuntikkan
+(status, pattern, detik breaking point) agar benchmark bisa memverifikasi verdict
+`get_breaking_point_analysis`.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Urutan kolom mengikuti output `k6 run --out csv=...` (k6 v0.56)
+CSV_COLUMNS = [
+    'metric_name', 'timestamp', 'metric_value', 'check', 'error', 'error_code',
+    'expected_response', 'group', 'method', 'name', 'proto', 'scenario', 'service',
+    'status', 'subproto', 'tls_version', 'url', 'extra_tags', 'metadata',
+]
+
+# Metrik per request HTTP + per iterasi (sama seperti yang direkam k6 untuk main.js)
+HTTP_METRICS = [
+    'http_reqs', 'http_req_duration', 'http_req_blocked', 'http_req_connecting',
+    'http_req_tls_handshaking', 'http_req_sending', 'http_req_waiting',
+    'http_req_receiving', 'http_req_failed',
+]
+CHECK_NAMES = ['status is 200', 'response time < 500ms', 'response time < 1000ms']
+ITER_METRICS = ['data_sent', 'data_received', 'iteration_duration', 'iterations']
+ROWS_PER_ITERATION = len(HTTP_METRICS) + len(CHECK_NAMES) + len(ITER_METRICS)
+ROWS_PER_SECOND = 2  # vus + vus_max
+
+PATTERNS = ['stable', 'saturation', 'sudden']
+START_EPOCH = 1767225600  # 2026-01-01 00:00:00 UTC
+TARGET_URL = 'http://test-api.k6.io/public/crocodiles/'
+SLEEP_AVG = 2.0  # main.js: sleep(Math.random() * 2 + 1)
+
+def build_vus_profile(duration_s, peak_vus):
+    """
+    Profil VU mirip ramping-vus stress: ramp-up 60% durasi, hold 30%, ramp-down 10%.
+    Return: array VU per detik.
+    """
+    t = np.arange(duration_s)
+    ramp_end = int(duration_s * 0.6)
+    hold_end = int(duration_s * 0.9)
+    vus = np.empty(duration_s)
+    vus[:ramp_end] = peak_vus * (t[:ramp_end] + 1) / ramp_end
+    vus[ramp_end:hold_end] = peak_vus
+    down = t[hold_end:] - hold_end
+    vus[hold_end:] = peak_vus * (1 - (down + 1) / max(duration_s - hold_end, 1))
+    return np.maximum(np.round(vus), 1).astype(np.int64)
+
+def build_load_model(vus, pattern):
+    """
+    Hitung latency dasar (ms) dan probabilitas gagal per detik sesuai pola.
+    - stable: latency datar, tanpa error.
+    - saturation: latency naik setelah 50% peak VU, error timeout muncul setelah 80%.
+    - sudden: latency datar, error 503 / connection refused tiba-tiba setelah 70%.
+    Return: (base_latency_ms, fail_prob, break_second atau None)
+    """
+    peak = vus.max()
+    load = vus / peak
+    base_latency = np.full(len(vus), 80.0)
+    fail_prob = np.zeros(len(vus))
+
+    if pattern == 'saturation':
+        over = np.clip(load - 0.5, 0, None)
+        base_latency = 80.0 * (1 + 40 * over ** 2)
+        fail_prob = np.where(load > 0.8, np.clip((load - 0.8) * 2.5, 0.1, 0.5), 0.0)
+    elif pattern == 'sudden':
+        fail_prob = np.where(load > 0.7, 0.3, 0.0)
+
+    # Breaking point = detik pertama saat ramp-up menembus ambang error
+    failing = np.nonzero(fail_prob > 0)[0]
+    break_second = int(failing[0]) if len(failing) else None
+    return base_latency, fail_prob, break_second
+
+def _iterations_per_second(vus, base_latency, total_iterations):
+    """Iterasi per detik ~ VUs / (latency + sleep), diskalakan agar total sesuai target baris."""
+    rate = vus / (SLEEP_AVG + base_latency / 1000.0)
+    counts = np.floor(rate / rate.sum() * total_iterations).astype(np.int64)
+    return np.maximum(counts, 1)
+
+def _chunk_frame(rng, seconds, counts, base_latency, fail_prob, vus, peak_vus):
+    """Bangun DataFrame baris k6 untuk sekumpulan detik secara vektor."""
+    n = int(counts.sum())
+    sec_idx = np.repeat(np.arange(len(seconds)), counts)
+    ts = START_EPOCH + seconds[sec_idx]
+
+    # Fase request (ms) - lognormal, sesuai karakter metrik k6
+    waiting = rng.lognormal(np.log(base_latency[sec_idx] * 0.85), 0.35)
+    sending = rng.lognormal(np.log(0.05), 0.5, n)
+    receiving = rng.lognormal(np.log(base_latency[sec_idx] * 0.1), 0.5)
+    new_conn = rng.random(n) < 0.02
+    connecting = np.where(new_conn, rng.lognormal(np.log(3.0), 0.4, n), 0.0)
+    tls = np.where(new_conn, rng.lognormal(np.log(8.0), 0.4, n), 0.0)
+    blocked = np.where(new_conn, connecting + tls + rng.lognormal(np.log(0.5), 0.5, n), rng.exponential(0.01, n))
+
+    failed = rng.random(n) < fail_prob[sec_idx]
+    # Pola saturasi -> timeout 5s (main.js). Pola sudden -> campuran 503 cepat & connection refused.
+    timeout = failed & (base_latency[sec_idx] > 80.0)
+    http_503 = failed & ~timeout & (rng.random(n) < 0.5)
+    refused = failed & ~timeout & ~http_503
+    waiting = np.where(timeout, 5000.0, np.where(http_503, waiting * 0.1, np.where(refused, 0.0, waiting)))
+    receiving = np.where(refused | timeout, 0.0, receiving)
+    duration = sending + waiting + receiving
+
+    status = np.where(http_503, '503', np.where(failed, '0', '200'))
+    error_code = np.where(timeout, '1050', np.where(http_503, '1503', np.where(refused, '1212', '')))
+    expected = np.where(failed, 'false', 'true')
+
+    iter_duration = duration + blocked + (1000.0 + rng.random(n) * 2000.0)
+    data_sent = np.full(n, 180.0)
+    data_received = np.where(failed, 0.0, 1450.0)
+
+    # Matriks (n, ROWS_PER_ITERATION) lalu ravel -> baris berurutan per iterasi
+    values = np.column_stack([
+        np.ones(n), duration, blocked, connecting, tls, sending, waiting, receiving, failed.astype(float),
+        (status == '200').astype(float), (duration < 500).astype(float), (duration < 1000).astype(float),
+        data_sent, data_received, iter_duration, np.ones(n),
+    ])
+    k = ROWS_PER_ITERATION
+    n_http = len(HTTP_METRICS)
+    n_check = len(CHECK_NAMES)
+    is_http = np.tile(np.arange(k) < n_http, n)
+
+    rep_status = np.repeat(status, k)
+    rep_error_code = np.repeat(error_code, k)
+    rep_expected = np.repeat(expected, k)
+
+    frame = pd.DataFrame({
+        'metric_name': np.tile(np.array(HTTP_METRICS + ['checks'] * n_check + ITER_METRICS, dtype=object), n),
+        'timestamp': np.repeat(ts, k),
+        'metric_value': values.ravel(),
+        'check': np.tile(np.array([''] * n_http + CHECK_NAMES + [''] * len(ITER_METRICS), dtype=object), n),
+        'error': '',
+        'error_code': np.where(is_http, rep_error_code, ''),
+        'expected_response': np.where(is_http, rep_expected, ''),
+        'group': '',
+        'method': np.where(is_http, 'GET', ''),
+        'name': np.where(is_http, TARGET_URL, ''),
+        'proto': np.where(is_http, 'HTTP/1.1', ''),
+        'scenario': 'default',
+        'service': '',
+        'status': np.where(is_http, rep_status, ''),
+        'subproto': '',
+        'tls_version': '',
+        'url': np.where(is_http, TARGET_URL, ''),
+        'extra_tags': '',
+        'metadata': '',
+    })
+
+    # VU gauge per detik (k6 mengirim vus & vus_max setiap detik)
+    vu_frame = pd.DataFrame({
+        'metric_name': np.tile(np.array(['vus', 'vus_max'], dtype=object), len(seconds)),
+        'timestamp': np.repeat(START_EPOCH + seconds, 2),
+        'metric_value': np.column_stack([vus, np.full(len(seconds), peak_vus)]).ravel().astype(float),
+    })
+    return pd.concat([vu_frame, frame], ignore_index=True).sort_values('timestamp', kind='stable')
+
+def generate_k6_csv(out_path, rows, pattern='saturation', seed=42, duration_s=None, chunk_seconds=60):
+    """
+    Tulis CSV sintetis format k6 sebanyak ~`rows` baris ke `out_path`.
+    Return: dict manifest (juga ditulis ke `<out_path tanpa .csv>.json`).
+    """
+    if pattern not in PATTERNS:
+        raise ValueError(f"Pattern tidak dikenal: {pattern} (pilih: {', '.join(PATTERNS)})")
+
+    # Durasi ikut skala: run besar = run lebih lama (maks 2 jam), bukan hanya RPS lebih tinggi
+    if duration_s is None:
+        duration_s = int(np.clip(rows / 2000, 300, 7200))
+    total_iterations = max((rows - duration_s * ROWS_PER_SECOND) // ROWS_PER_ITERATION, duration_s)
+
+    # Peak VU ditaksir dari throughput yang dibutuhkan (VU ~ RPS x (sleep + latency))
+    peak_vus = int(max(10, total_iterations / duration_s * (SLEEP_AVG + 0.1) * 1.3))
+    vus = build_vus_profile(duration_s, peak_vus)
+    base_latency, fail_prob, break_second = build_load_model(vus, pattern)
+    counts = _iterations_per_second(vus, base_latency, total_iterations)
+
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    written = 0
+    with open(out_path, 'w', newline='') as f:
+        f.write(','.join(CSV_COLUMNS) + '\n')
+        for start in range(0, duration_s, chunk_seconds):
+            sl = slice(start, min(start + chunk_seconds, duration_s))
+            seconds = np.arange(sl.start, sl.stop)
+            chunk = _chunk_frame(rng, seconds, counts[sl], base_latency[sl], fail_prob[sl], vus[sl], vus.max())
+            chunk = chunk.reindex(columns=CSV_COLUMNS, fill_value='')
+            chunk.to_csv(f, header=False, index=False, float_format='%.6f')
+            written += len(chunk)
+
+    manifest = {
+        'file': os.path.basename(out_path),
+        'rows': int(written),
+        'seed': seed,
+        'duration_s': duration_s,
+        'peak_vus': int(vus.max()),
+        'pattern': pattern,
+        # Verdict yang diharapkan dari get_breaking_point_analysis
+        'expected_status': 'perfect' if pattern == 'stable' else 'broken',
+        'expected_pattern': {'saturation': 'degradasi_bertahap', 'sudden': 'sudden_failure'}.get(pattern),
+        'break_second': break_second,
+    }
+    with open(os.path.splitext(out_path)[0] + '.json', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def parse_rows(text):
+    """'100k' -> 100000, '10M' -> 10000000."""
+    text = text.strip().lower()
+    mult = {'k': 1_000, 'm': 1_000_000}.get(text[-1], 1)
+    return int(float(text.rstrip('km')) * mult)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate CSV sintetis format k6 untuk benchmark.")
+    parser.add_argument('--rows', default='100k', help="Jumlah baris target (contoh: 100k, 1M, 10M, 50M)")
+    parser.add_argument('--pattern', default='saturation', choices=PATTERNS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--duration', type=int, default=None, help="Durasi run dalam detik (default: skala dari --rows)")
+    parser.add_argument('--out', default=None, help="Path output CSV (default: bench/data/<pattern>_<rows>.csv)")
+    args = parser.parse_args()
+
+    out = args.out or os.path.join('bench', 'data', f"{args.pattern}_{args.rows}.csv")
+    manifest = generate_k6_csv(out, parse_rows(args.rows), args.pattern, args.seed, args.duration)
+    print(json.dumps(manifest, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -63,7 +63,20 @@ export const getScenarios = (type) => {
             gracefulRampDown: '1m',
         },
 
-        // 4. Smoke Test: Verifikasi script berfungsi
+        // 4. Soak Test: Beban stabil berjam-jam untuk mendeteksi memory leak / degradasi perlahan
+        // Naik pelan -> Tahan lama (default 4 jam) -> Turun
+        soak: {
+            executor: 'ramping-vus',
+            startVUs: 0,
+            stages: [
+                { duration: '5m', target: TARGET_VUS || 100 },                // Ramp-up pelan
+                { duration: __ENV.MY_DURATION || '4h', target: TARGET_VUS || 100 }, // Tahan berjam-jam
+                { duration: '5m', target: 0 },                                // Ramp-down
+            ],
+            gracefulRampDown: '1m',
+        },
+
+        // 5. Smoke Test: Verifikasi script berfungsi
         smoke: {
             executor: 'constant-vus',
             vus: 1, 
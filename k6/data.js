@@ -0,0 +1,102 @@
+import { SharedArray } from 'k6/data';
+import exec from 'k6/execution';
+
+// -------------------------------------------------------------------------
+// DATA POOL: Banyak payload / kredensial dari satu file (CSV, JSON array, NDJSON)
+// - DATA_FILE : path file (absolut, atau relatif terhadap folder k6/)
+// - DATA_MODE : round-robin (default) | random | unique (satu record tetap per VU)
+// File dibaca SEKALI di init context ke SharedArray -> memori tidak diduplikasi per VU.
+// -------------------------------------------------------------------------
+
+export const DATA_MODES = ['round-robin', 'random', 'unique'];
+
+// Parser CSV minimal (RFC 4180: field ber-quote, "" sebagai escape, koma/newline di dalam quote)
+function parseCsv(text) {
+    const rows = [];
+    let row = [];
+    let field = '';
+    let inQuotes = false;
+
+    for (let i = 0; i < text.length; i++) {
+        const c = text[i];
+        if (inQuotes) {
+            if (c === '"' && text[i + 1] === '"') { field += '"'; i++; }
+            else if (c === '"') { inQuotes = false; }
+            else { field += c; }
+        } else if (c === '"') {
+            inQuotes = true;
+        } else if (c === ',') {
+            row.push(field); field = '';
+        } else if (c === '\n' || c === '\r') {
+            if (c === '\r' && text[i + 1] === '\n') i++;
+            row.push(field); field = '';
+            if (row.length > 1 || row[0] !== '') rows.push(row);
+            row = [];
+        } else {
+            field += c;
+        }
+    }
+    row.push(field);
+    if (row.length > 1 || row[0] !== '') rows.push(row);
+
+    const header = (rows.shift() || []).map((name) => name.trim());
+    return rows.map((values) => {
+        const record = {};
+        header.forEach((name, idx) => { record[name] = values[idx] !== undefined ? values[idx] : ''; });
+        return record;
+    });
+}
+
+function parsePool(path, text) {
+    const lower = path.toLowerCase();
+    let records;
+    if (lower.endsWith('.csv')) {
+        records = parseCsv(text);
+    } else if (lower.endsWith('.ndjson') || lower.endsWith('.jsonl')) {
+        records = text.split('\n').filter((line) => line.trim() !== '').map((line) => JSON.parse(line));
+    } else {
+        records = JSON.parse(text);
+        if (!Array.isArray(records)) records = [records];
+    }
+    // Record skalar (misal array string token) dibungkus agar bisa dipakai sebagai {{value}}
+    return records.map((r) => (r !== null && typeof r === 'object' ? r : { value: r }));
+}
+
+export function loadDataPool(path) {
+    if (!path) return null;
+    const pool = new SharedArray('data pool', function () {
+        return parsePool(path, open(path));
+    });
+    if (pool.length === 0) {
+        throw new Error(`DATA_FILE ${path} tidak berisi record.`);
+    }
+    return pool;
+}
+
+// Pilih record untuk iterasi ini sesuai DATA_MODE
+export function pickRecord(pool, mode) {
+    if (!pool) return null;
+    if (mode === 'random') {
+        return pool[Math.floor(Math.random() * pool.length)];
+    }
+    if (mode === 'unique') {
+        // VU ke-N selalu memakai record ke-N (misal satu akun login per user); berulang jika record < VU
+        return pool[(exec.vu.idInTest - 1) % pool.length];
+    }
+    // round-robin global lintas VU
+    return pool[exec.scenario.iterationInTest % pool.length];
+}
+
+// Ganti placeholder {{field}} dengan nilai dari record. `escape` menentukan encoding nilai (URL / JSON string).
+export function renderTemplate(template, record, escape) {
+    if (!record || !template || template.indexOf('{{') === -1) return template;
+    return template.replace(/\{\{\s*([\w.-]+)\s*\}\}/g, (match, key) => {
+        if (!(key in record)) return match;
+        const value = record[key];
+        const text = typeof value === 'object' ? JSON.stringify(value) : String(value);
+        return escape ? escape(text) : text;
+    });
+}
+
+export const escapeUrl = encodeURIComponent;
+export const escapeJson = (text) => JSON.stringify(text).slice(1, -1);
@@ -1,6 +1,7 @@
 import http from 'k6/http';
 import { check, sleep } from 'k6';
 import { getScenarios, getThresholds } from './config.js';
+import { loadDataPool, pickRecord, renderTemplate, escapeUrl, escapeJson } from './data.js';
 
 // -------------------------------------------------------------------------
 // INIT CONTEXT: Setup Options (Scenarios & Thresholds)
@@ -14,6 +15,13 @@ export const options = {
     thresholds: getThresholds(),
 };
 
+// Data pool (opsional): dibaca sekali ke SharedArray, dipakai bersama semua VU
+const DATA_POOL = loadDataPool(__ENV.DATA_FILE);
+const DATA_MODE = __ENV.DATA_MODE || 'round-robin';
+if (DATA_POOL && DATA_MODE === 'unique' && __ENV.MY_VUS && DATA_POOL.length < parseInt(__ENV.MY_VUS)) {
+    console.warn(`DATA_MODE=unique: hanya ${DATA_POOL.length} record untuk ${__ENV.MY_VUS} VUs, record akan dipakai ulang.`);
+}
+
 // -------------------------------------------------------------------------
 // VU CODE: Logic Test per User
 // -------------------------------------------------------------------------
@@ -26,6 +34,10 @@ export default function () {
     }
 
     const METHOD = (__ENV.METHOD || 'GET').toUpperCase();
+
+    // Record data pool untuk iterasi ini -> placeholder {{field}} di URL, headers, dan body
+    const RECORD = pickRecord(DATA_POOL, DATA_MODE);
+    const REQUEST_URL = renderTemplate(BASE_URL, RECORD, escapeUrl);
     
     // Parse Headers custom (format JSON string, misal: '{"Authorization":"Bearer abc", "X-Custom":"123"}')
     // Default Header: Pura-pura jadi browser Chrome LENGKAP agar tidak kena blokir 403 WAF/Cloudflare
@@ -46,7 +58,7 @@ export default function () {
 
     if (__ENV.HEADERS) {
         try {
-            const customHeaders = JSON.parse(__ENV.HEADERS);
+            const customHeaders = JSON.parse(renderTemplate(__ENV.HEADERS, RECORD, escapeJson));
             HEADERS = { ...HEADERS, ...customHeaders };
         } catch (e) {
             console.error('Failed to parse HEADERS env var:', e);
@@ -64,7 +76,9 @@ export default function () {
         } 
         
         if (__ENV.PAYLOAD_DATA) {
-            PAYLOAD = __ENV.PAYLOAD_DATA; // Expecting raw JSON string
+            PAYLOAD = renderTemplate(__ENV.PAYLOAD_DATA, RECORD, escapeJson); // Expecting raw JSON string (template)
+        } else if (RECORD) {
+            PAYLOAD = JSON.stringify(RECORD); // Tanpa template body: record data pool dikirim apa adanya
         } else {
             // Default payload jika test butuh body tapi tidak disediakan
             PAYLOAD = JSON.stringify({ message: "k6 load test default payload" });
@@ -77,19 +91,23 @@ export default function () {
         headers: HEADERS,
         timeout: '5s'  // Paksa stop jika server tidak selesai merespon dalam 5 detik
     };
+    // URL hasil template dikelompokkan dengan nama URL aslinya (hindari ribuan tag `name` berbeda)
+    if (REQUEST_URL !== BASE_URL) {
+        requestConfig.tags = { name: BASE_URL };
+    }
 
     let res;
     try {
         if (METHOD === 'GET') {
-            res = http.get(BASE_URL, requestConfig);
+            res = http.get(REQUEST_URL, requestConfig);
         } else if (METHOD === 'POST') {
-            res = http.post(BASE_URL, PAYLOAD, requestConfig);
+            res = http.post(REQUEST_URL, PAYLOAD, requestConfig);
         } else if (METHOD === 'PUT') {
-            res = http.put(BASE_URL, PAYLOAD, requestConfig);
+            res = http.put(REQUEST_URL, PAYLOAD, requestConfig);
         } else if (METHOD === 'DELETE') {
-            res = http.del(BASE_URL, null, requestConfig);
+            res = http.del(REQUEST_URL, null, requestConfig);
         } else {
-            res = http.get(BASE_URL, requestConfig);
+            res = http.get(REQUEST_URL, requestConfig);
         }
     } catch (e) {
         // console.error(`Request Exception: ${e}`); // Disable logging biar terminal tidak merah
@@ -108,7 +126,7 @@ export default function () {
     // --- DEBUGGING ERROR ---
     // Jika status tidak sesuai, print error ke log console agar kelihatan di Terminal/Docker logs
     if (!checkRes && res.status !== expectedStatus) {
-        console.error(`❌ FAILURE: ${METHOD} ${BASE_URL} -> Status: ${res.status}`);
+        console.error(`❌ FAILURE: ${METHOD} ${REQUEST_URL} -> Status: ${res.status}`);
         // Tampilkan sedikit snippet body response untuk diagnosa (misal pesan error dari server)
         if (res.body) {
              console.error(`   Body: ${res.body.toString().slice(0, 200)}...`); 
@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from ui.generator_monitor import get_generator_analysis
+
+N_SAMPLES = 300
+TIMESTAMPS = pd.to_datetime(np.arange(N_SAMPLES), unit='s')
+
+def generator_frame(saturated_from, saturated_to):
+    cpu = np.full(N_SAMPLES, 0.3)
+    cpu[saturated_from:saturated_to] = 0.95
+    return pd.DataFrame({'timestamp': TIMESTAMPS, 'cpu_util': cpu, 'rss_mb': 100.0, 'mem_util': 0.1,
+                         'threads': 10, 'sockets': 5})
+
+def broken_at(second):
+    return {'status': 'broken', 'timestamp': TIMESTAMPS[0] + pd.Timedelta(seconds=second)}
+
+def test_scattered_spikes_are_not_saturation():
+    gen_df = generator_frame(0, 0)
+    gen_df.loc[::30, 'cpu_util'] = 0.95
+    analysis = get_generator_analysis(gen_df)
+    assert not analysis['saturated']
+    assert analysis['saturated_seconds'] == 1.0
+
+def test_breaking_point_inside_saturated_window_invalidates_diagnosis():
+    analysis = get_generator_analysis(generator_frame(100, 140), broken_at(120))
+    assert analysis['saturated']
+    assert analysis['first_saturated'] == 100.0
+    assert analysis['invalidates_diagnosis']
+
+def test_generator_recovered_before_breaking_point():
+    analysis = get_generator_analysis(generator_frame(10, 40), broken_at(250))
+    assert analysis['saturated']
+    assert not analysis['invalidates_diagnosis']
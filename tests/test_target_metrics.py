@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+
+from ui.target_metrics import detect_saturation, get_target_analysis
+
+RUN_START = 1_767_225_600
+WINDOW_S = 5
+N_WINDOWS = 40
+
+def k6_series():
+    ramp = np.linspace(10, 200, N_WINDOWS)
+    return pd.DataFrame({
+        'start_s': np.arange(N_WINDOWS) * WINDOW_S,
+        'p95': ramp * 2,
+        'error_rate': np.linspace(0, 0.2, N_WINDOWS),
+        'vus': ramp,
+    })
+
+def test_detect_saturation_without_samples():
+    result = detect_saturation(np.full(N_WINDOWS, np.nan), 'cpu_util', None, WINDOW_S)
+    assert result['peak'] is None
+    assert result['saturated_at_s'] is None
+
+def test_series_outside_run_window_is_dropped():
+    seconds = np.arange(0, N_WINDOWS * WINDOW_S, WINDOW_S)
+    target = pd.DataFrame({
+        'timestamp': np.concatenate([RUN_START + seconds, RUN_START + N_WINDOWS * WINDOW_S + seconds]),
+        'cpu_util': np.concatenate([np.linspace(0.2, 0.99, N_WINDOWS), np.full(N_WINDOWS, np.nan)]),
+        'late_pod_util': np.concatenate([np.full(N_WINDOWS, np.nan), np.linspace(0.1, 0.5, N_WINDOWS)]),
+    })
+    analysis = get_target_analysis(target, k6_series(), RUN_START, WINDOW_S)
+    names = [entry['name'] for entry in analysis['resources']]
+    assert names == ['cpu_util']
+    assert 'late_pod_util' not in analysis['aligned'].columns
+    assert analysis['first_saturated']['name'] == 'cpu_util'
+
+def test_no_series_overlaps_run():
+    target = pd.DataFrame({
+        'timestamp': RUN_START - 3600 + np.arange(N_WINDOWS) * WINDOW_S,
+        'cpu_util': np.linspace(0.2, 0.99, N_WINDOWS),
+    })
+    analysis = get_target_analysis(target, k6_series(), RUN_START, WINDOW_S)
+    assert analysis['overlap_windows'] == 0
+    assert analysis['resources'] == []
+    assert analysis['first_saturated'] is None
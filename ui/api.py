@@ -0,0 +1,433 @@
+import os
+import re
+import sys
+import hmac
+import json
+import socket
+import ipaddress
+import math
+import time
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
+import numpy as np
+import pandas as pd
+from .run_queue import get_run_queue, validate_run_params, public_job, QUEUED, RUNNING, FINISHED
+from .history_index import get_history_index
+from .result_cache import get_result_cache, run_cache_key, invalidate_run
+from .data_pool import DATA_DIR, list_data_pools
+from .regression import load_baseline, compare_to_baseline
+from .scenarios import load_run_metadata
+from .rollups import is_windowed_run, is_rollup_writer_active, build_soak_bundle, rollup_path, ROLLUP_WINDOW_S
+from .startup import get_startup_status
+from .target_metrics import attach_target_metrics, remove_target_metrics, TARGET_FORMATS
+
+# HTTP API JSON headless (CI / chat-ops) yang berjalan di proses dashboard yang sama,
+# sehingga memakai antrian run, index riwayat, dan cache hasil yang sama dengan UI.
+#   K6_DASHBOARD_API_PORT  : port API (default 8502, "0" = nonaktif)
+#   K6_DASHBOARD_API_HOST  : alamat bind (default 127.0.0.1). Alamat selain loopback hanya dipakai jika token diisi;
+#                            tanpa token API tetap bind ke 127.0.0.1 (API bisa menjalankan k6 ke URL mana pun).
+#   K6_DASHBOARD_API_TOKEN : jika diisi, setiap request wajib "Authorization: Bearer <token>"
+DEFAULT_API_PORT = 8502
+DEFAULT_API_HOST = "127.0.0.1"
+API_HOLDER = "http-api"     # Holder di ResultCache: bundle tetap di-cache tapi tidak di-pin
+STREAM_INTERVAL = 1.0       # Detik antar event progress pada /events
+MAX_BODY_BYTES = 1024 * 1024
+MAX_METRICS_BYTES = 64 * 1024 * 1024  # Export metrik target (soak berjam-jam bisa beberapa MB)
+# Field bundle hasil get_window_aggregates() yang dikirim oleh /aggregates
+AGGREGATE_KEYS = ('total_reqs', 'failed_reqs', 'failure_rate', 'stats', 'latency_hist', 'latency_heatmap', 'phase_breakdown',
+                  'phase_timeline', 'error_analysis', 'checks', 'chart_df', 'rps_df')
+
+def to_json_safe(obj):
+    """Konversi hasil analisis (DataFrame, Timestamp, numpy, NaN) ke struktur yang bisa di-json.dumps."""
+    if isinstance(obj, pd.DataFrame):
+        frame = obj if isinstance(obj.index, pd.RangeIndex) else obj.reset_index()
+        return json.loads(frame.to_json(orient='records', date_format='iso'))
+    if isinstance(obj, pd.Series):
+        return to_json_safe(obj.to_frame())
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, dict):
+        return {str(k): to_json_safe(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_json_safe(v) for v in obj]
+    if isinstance(obj, np.ndarray):
+        return to_json_safe(obj.tolist())
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+def _load_bundle(path):
+    """Bundle run dari ResultCache bersama UI (run yang sedang dibuka di dashboard langsung tersedia)."""
+    from .utils import build_run_bundle  # Import lokal: utils ikut memuat streamlit
+    cache = get_result_cache()
+    key = run_cache_key(path)
+    bundle = cache.acquire(key, lambda: build_run_bundle(path), API_HOLDER)
+    cache.release(key, API_HOLDER)
+    return bundle
+
+def _load_soak_bundle(path):
+    """
+    Run soak / sangat besar: bundle dari rollup per menit (tanpa load CSV penuh), cache sama dengan UI.
+    Soak yang masih berjalan dan belum punya rollup: None (menunggu writer, rollup tidak dibangun dari CSV setengah jadi).
+    """
+    if not os.path.exists(rollup_path(path)):
+        return None if is_rollup_writer_active(path) else build_soak_bundle(path)
+    cache = get_result_cache()
+    key = run_cache_key(path, rollup_path(path))
+    bundle = cache.acquire(key, lambda: build_soak_bundle(path), API_HOLDER)
+    cache.release(key, API_HOLDER)
+    return bundle
+
+def _public_target(target):
+    """Analisis metrik target tanpa tabel per jendela (aligned) agar respons tetap kecil."""
+    return {k: v for k, v in target.items() if k != 'aligned'} if target else None
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "k6-dashboard-api/1.0"
+
+    ROUTES = [
+        ('GET', r'/api/health', 'health'),
+        ('GET', r'/api/jobs', 'list_jobs'),
+        ('POST', r'/api/jobs', 'submit_job'),
+        ('GET', r'/api/jobs/(?P<job_id>\w+)', 'get_job'),
+        ('DELETE', r'/api/jobs/(?P<job_id>\w+)', 'cancel_job'),
+        ('GET', r'/api/jobs/(?P<job_id>\w+)/events', 'stream_job'),
+        ('GET', r'/api/projects', 'list_projects'),
+        ('GET', r'/api/runs/(?P<project>[^/]+)/(?P<filename>[^/]+)/summary', 'run_summary'),
+        ('GET', r'/api/runs/(?P<project>[^/]+)/(?P<filename>[^/]+)/aggregates', 'run_aggregates'),
+        ('GET', r'/api/runs/(?P<project>[^/]+)/(?P<filename>[^/]+)/diagnosis', 'run_diagnosis'),
+        ('POST', r'/api/runs/(?P<project>[^/]+)/(?P<filename>[^/]+)/target-metrics', 'attach_run_target_metrics'),
+        ('DELETE', r'/api/runs/(?P<project>[^/]+)/(?P<filename>[^/]+)/target-metrics', 'remove_run_target_metrics'),
+    ]
+
+    def log_message(self, format, *args):
+        pass  # Jangan banjiri log Streamlit dengan access log
+
+    # --- Dispatch ---
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            self._authorize()
+            path_matched = False
+            for route_method, pattern, handler in self.ROUTES:
+                match = re.fullmatch(pattern, url.path.rstrip('/'))
+                if not match:
+                    continue
+                path_matched = True
+                if route_method == method:
+                    params = {k: unquote(v) for k, v in match.groupdict().items()}
+                    return getattr(self, handler)(**params)
+            raise ApiError(405 if path_matched else 404, "Method tidak didukung." if path_matched else "Endpoint tidak ditemukan.")
+        except ApiError as e:
+            self._send_json(e.status, {'error': str(e)})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            self._send_json(500, {'error': f"{type(e).__name__}: {e}"})
+
+    def _authorize(self):
+        token = os.environ.get("K6_DASHBOARD_API_TOKEN")
+        if token and not hmac.compare_digest(self.headers.get('Authorization', ''), f"Bearer {token}"):
+            raise ApiError(401, "Token API tidak valid.")
+
+    def _send_json(self, status, payload):
+        body = json.dumps(to_json_safe(payload)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self, limit):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > limit:
+            raise ApiError(413, "Body request terlalu besar.")
+        return self.rfile.read(length)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "Body request terlalu besar.")
+        try:
+            data = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ApiError(400, "Body harus JSON.")
+        if not isinstance(data, dict):
+            raise ApiError(400, "Body harus objek JSON.")
+        return data
+
+    def _run_path(self, project, filename):
+        """Path run dari index riwayat (bukan dari path mentah request, mencegah path traversal)."""
+        info = get_history_index().get_run(project, filename)
+        if info is None or not os.path.exists(info['path']):
+            raise ApiError(404, f"Run {project}/{filename} tidak ditemukan.")
+        return info['path']
+
+    # --- Jobs ---
+    def health(self):
+        queue = get_run_queue()
+        jobs = queue.jobs()
+        self._send_json(200, {
+            'status': 'ok',
+            'queue': {
+                'max_running': queue.max_running,
+                'running': sum(1 for j in jobs if j['state'] == RUNNING),
+                'queued': sum(1 for j in jobs if j['state'] == QUEUED),
+            },
+            'cache': get_result_cache().stats(),
+            'startup': get_startup_status(),
+        })
+
+    def list_jobs(self):
+        self._send_json(200, {'jobs': [public_job(j) for j in get_run_queue().jobs()]})
+
+    def submit_job(self):
+        params = self._read_json()
+        if params.get('data_file'):
+            # Hanya file di folder data/ yang boleh dipakai (k6 membaca file ini dan mengirim isinya)
+            name = os.path.basename(params['data_file'])
+            if name not in list_data_pools():
+                raise ApiError(400, f"Data pool {name} tidak ada di folder {DATA_DIR}/.")
+            params['data_file'] = os.path.abspath(os.path.join(DATA_DIR, name))
+        try:
+            params = validate_run_params(params)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        queue = get_run_queue()
+        job_id = queue.submit(params, owner=API_HOLDER)
+        self._send_json(202, {'job': public_job(queue.get(job_id))})
+
+    def _get_job(self, job_id):
+        job = get_run_queue().get(job_id)
+        if job is None:
+            raise ApiError(404, f"Job {job_id} tidak ditemukan.")
+        return job
+
+    def get_job(self, job_id):
+        job = self._get_job(job_id)
+        payload = public_job(job)
+        if job['state'] != FINISHED:
+            payload['log_tail'] = get_run_queue().log_tail(job_id)
+        self._send_json(200, {'job': payload})
+
+    def cancel_job(self, job_id):
+        self._get_job(job_id)
+        cancelled = get_run_queue().cancel(job_id)
+        self._send_json(200 if cancelled else 409, {'cancelled': cancelled, 'job': public_job(self._get_job(job_id))})
+
+    def stream_job(self, job_id):
+        """Server-Sent Events: 'progress' & 'log' tiap detik selama job aktif, lalu 'done' berisi job final."""
+        queue = get_run_queue()
+        job = self._get_job(job_id)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+
+        last_log = None
+        while job['state'] != FINISHED:
+            elapsed = time.time() - job['started_at'] if job['started_at'] else 0
+            self._send_event('progress', {
+                'state': job['state'],
+                'position': job.get('position'),
+                'eta_start': job.get('eta_start'),
+                'eta_finish': job.get('eta_finish'),
+                'elapsed': round(elapsed, 1),
+                'expected_duration': job['expected_duration'],
+                'progress': min(elapsed / max(job['expected_duration'], 1), 1.0),
+            })
+            log = queue.log_tail(job_id)
+            if log and log != last_log:
+                self._send_event('log', {'tail': log})
+                last_log = log
+            time.sleep(STREAM_INTERVAL)
+            job = queue.get(job_id) or {**job, 'state': FINISHED}
+        self._send_event('done', public_job(job))
+
+    def _send_event(self, event, data):
+        self.wfile.write(f"event: {event}\ndata: {json.dumps(to_json_safe(data))}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    # --- Riwayat & hasil analisis ---
+    def list_projects(self):
+        history = get_history_index()
+        self._send_json(200, {'projects': {
+            project: [{'filename': r['filename'], 'size': r['size'],
+                       'start_time': datetime.fromtimestamp(r['start_time']).isoformat(timespec='seconds')}
+                      for r in history.runs(project)]
+            for project in history.projects()
+        }})
+
+    def run_summary(self, project, filename):
+        path = self._run_path(project, filename)
+        metadata = load_run_metadata(path)
+        if is_windowed_run(path, metadata):
+            soak = _load_soak_bundle(path)
+            rollups = soak['rollups'] if soak else None
+            return self._send_json(200, {
+                'project': project,
+                'run': filename,
+                'windowed': True,
+                'duration_s': float(rollups['start_s'].iloc[-1]) + ROLLUP_WINDOW_S if rollups is not None else 0,
+                'total_reqs': soak['total_reqs'] if soak else 0,
+                'failed_reqs': soak['failed_reqs'] if soak else 0,
+                'failure_rate': soak['failure_rate'] if soak else 0.0,
+                'stats': soak['stats'] if soak else None,
+                'metadata': metadata,
+                'drift': soak['drift'] if soak else None,
+            })
+        bundle = _load_bundle(path)
+        baseline = load_baseline(os.path.dirname(path))
+        regression = None
+        if baseline is not None and baseline['run'] != bundle['sketch']['run']:
+            regression = compare_to_baseline(bundle['sketch'], baseline)
+        self._send_json(200, {
+            'project': project,
+            'run': filename,
+            'target_url': bundle['target_url'],
+            'run_start': bundle['run_start'],
+            'duration_s': bundle['duration_s'],
+            'total_reqs': bundle['total_reqs'],
+            'failed_reqs': bundle['failed_reqs'],
+            'failure_rate': bundle['failure_rate'],
+            'stats': bundle['stats'],
+            'windowed': False,
+            'metadata': metadata,
+            'regression': regression,
+        })
+
+    def run_aggregates(self, project, filename):
+        """Agregat seluruh tes, atau jendela ?start=&end= (detik dari awal tes) seperti zoom di dashboard."""
+        from .utils import slice_time_window, get_window_aggregates
+        try:
+            start_s = float(self.query.get('start', 0))
+            end_s = float(self.query['end']) if 'end' in self.query else None
+        except ValueError:
+            raise ApiError(400, "start/end harus angka (detik).")
+        path = self._run_path(project, filename)
+
+        if is_windowed_run(path, load_run_metadata(path)):
+            # Run panjang: agregat per menit dari rollup
+            soak = _load_soak_bundle(path)
+            rollups = soak['rollups'] if soak else pd.DataFrame(columns=['start_s'])
+            in_window = rollups['start_s'] >= start_s
+            if end_s is not None:
+                in_window &= rollups['start_s'] < end_s
+            return self._send_json(200, {'windowed': True, 'rollups': rollups[in_window]})
+
+        bundle = _load_bundle(path)
+        view = bundle
+        if 'start' in self.query or end_s is not None:
+            run_start = bundle['run_start']
+            end_s = bundle['duration_s'] if end_s is None else end_s
+            window_df = slice_time_window(bundle['df'], run_start + pd.Timedelta(seconds=start_s), run_start + pd.Timedelta(seconds=end_s))
+            view = get_window_aggregates(window_df, run_start)
+        self._send_json(200, {'windowed': False, **{key: view[key] for key in AGGREGATE_KEYS}})
+
+    def run_diagnosis(self, project, filename):
+        path = self._run_path(project, filename)
+        if is_windowed_run(path, load_run_metadata(path)):
+            soak = _load_soak_bundle(path)
+            return self._send_json(200, {'windowed': True, 'drift': soak['drift'] if soak else None,
+                                         'target': _public_target(soak['target']) if soak else None})
+        bundle = _load_bundle(path)
+        diagnosis = {k: v for k, v in bundle['diagnosis'].items() if k != 'target'} if bundle['diagnosis'] else None
+        self._send_json(200, {'diagnosis': diagnosis, 'generator': bundle['generator'], 'target': _public_target(bundle['target'])})
+
+    def attach_run_target_metrics(self, project, filename):
+        """Lampirkan export metrik server (body mentah: CSV, NDJSON, atau Prometheus text; ?format= opsional)."""
+        path = self._run_path(project, filename)
+        fmt = self.query.get('format')
+        if fmt is not None and fmt not in TARGET_FORMATS:
+            raise ApiError(400, f"format harus salah satu dari: {', '.join(TARGET_FORMATS)}.")
+        try:
+            frame = attach_target_metrics(path, self._read_body(MAX_METRICS_BYTES), self.query.get('filename'), fmt)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ApiError(400, f"Metrik target tidak valid: {e}")
+        invalidate_run(path)
+        self._send_json(201, {
+            'series': list(frame.columns.drop('timestamp')),
+            'samples': len(frame),
+            'start': datetime.fromtimestamp(frame['timestamp'].iloc[0]).isoformat(timespec='seconds'),
+            'end': datetime.fromtimestamp(frame['timestamp'].iloc[-1]).isoformat(timespec='seconds'),
+        })
+
+    def remove_run_target_metrics(self, project, filename):
+        path = self._run_path(project, filename)
+        remove_target_metrics(path)
+        invalidate_run(path)
+        self._send_json(200, {'removed': True})
+
+_server = None
+_server_lock = threading.Lock()
+
+def is_loopback_host(host):
+    """True jika host hanya bisa dijangkau dari mesin ini (127.0.0.0/8, ::1, localhost)."""
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        try:
+            return all(ipaddress.ip_address(info[4][0]).is_loopback for info in socket.getaddrinfo(host, None))
+        except (socket.gaierror, ValueError):
+            return False
+
+def resolve_bind_host():
+    """Alamat bind API. Host non-loopback tanpa K6_DASHBOARD_API_TOKEN ditolak: peringatan keras, bind ke 127.0.0.1."""
+    host = os.environ.get("K6_DASHBOARD_API_HOST", DEFAULT_API_HOST)
+    if not os.environ.get("K6_DASHBOARD_API_TOKEN") and not is_loopback_host(host):
+        print(f"PERINGATAN: HTTP API tidak di-bind ke {host} karena K6_DASHBOARD_API_TOKEN kosong "
+              f"(siapa pun di jaringan bisa menjalankan k6 ke URL apa pun). API hanya tersedia di {DEFAULT_API_HOST}; "
+              f"isi K6_DASHBOARD_API_TOKEN untuk membukanya.", file=sys.stderr)
+        return DEFAULT_API_HOST
+    return host
+
+def start_api_server():
+    """Jalankan HTTP API di thread background sekali per proses. Return: server, atau None jika nonaktif / port dipakai."""
+    global _server
+    with _server_lock:
+        if _server is None:
+            port = int(os.environ.get("K6_DASHBOARD_API_PORT", DEFAULT_API_PORT))
+            if port == 0:
+                return None
+            host = resolve_bind_host()
+            try:
+                _server = ThreadingHTTPServer((host, port), ApiHandler)
+            except OSError as e:
+                print(f"HTTP API tidak dijalankan ({host}:{port}): {e}", file=sys.stderr)
+                _server = False
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, daemon=True, name="k6-dashboard-api").start()
+        return _server or None
+
+if __name__ == "__main__":
+    # Mode standalone (tanpa UI). Jangan jalankan bersamaan dengan dashboard pada folder results/ yang sama:
+    # keduanya akan punya antrian run sendiri-sendiri.
+    port = int(os.environ.get("K6_DASHBOARD_API_PORT", DEFAULT_API_PORT))
+    host = resolve_bind_host()
+    get_history_index()
+    print(f"k6 dashboard API di http://{host}:{port}/api")
+    ThreadingHTTPServer((host, port), ApiHandler).serve_forever()
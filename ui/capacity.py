@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+# Model kapasitas: Universal Scalability Law (Gunther) + cek Little's Law, dari rollup 5 detik
+#   X(N) = lambda * N / (1 + sigma * (N - 1) + kappa * N * (N - 1))
+#   sigma = contention (antrian/lock), kappa = coherency (biaya koordinasi, membuat throughput turun lagi)
+MIN_VU_LEVELS = 3          # Minimal 3 level VU berbeda agar kurva bisa di-fit
+MIN_R2 = 0.8               # R^2 di bawah ini = fit kurang bisa dipercaya
+LITTLE_TOLERANCE = 0.15    # Selisih median |L - N| / N di atas 15% = data tidak konsisten
+SIGMA_GRID = np.concatenate([[0.0], np.geomspace(1e-5, 1.0, 60)])
+KAPPA_GRID = np.concatenate([[0.0], np.geomspace(1e-8, 1e-1, 60)])
+REFINE_STEPS = 2
+
+def usl_throughput(n, lam, sigma, kappa):
+    n = np.asarray(n, dtype=float)
+    return lam * n / (1 + sigma * (n - 1) + kappa * n * (n - 1))
+
+def _grid_fit(n, x, w, sigmas, kappas):
+    """
+    Least squares berbobot untuk semua kombinasi (sigma, kappa) di grid sekaligus.
+    Lambda punya solusi tertutup untuk sigma/kappa tetap, jadi cukup search 2 dimensi.
+    Return: (sse, lambda, sigma, kappa) terbaik.
+    """
+    s = sigmas[:, None, None]
+    k = kappas[None, :, None]
+    shape = n / (1 + s * (n - 1) + k * n * (n - 1))
+    lam = (w * x * shape).sum(axis=2) / np.maximum((w * shape * shape).sum(axis=2), 1e-12)
+    sse = (w * (x - lam[:, :, None] * shape) ** 2).sum(axis=2)
+    i, j = np.unravel_index(np.argmin(sse), sse.shape)
+    return sse[i, j], lam[i, j], sigmas[i], kappas[j]
+
+def _refine(grid, value):
+    """Grid lebih rapat di sekitar nilai terbaik (skala log, tetap menyertakan 0)."""
+    idx = int(np.searchsorted(grid, value))
+    lo = grid[max(idx - 1, 1)] if value > 0 else 0.0
+    hi = grid[min(idx + 1, len(grid) - 1)]
+    if value == 0:
+        return np.concatenate([[0.0], np.geomspace(grid[1] / 10, grid[1], 20)])
+    return np.concatenate([[0.0], np.geomspace(max(lo, 1e-12), hi, 21)])
+
+def fit_usl(vus, throughput):
+    """
+    Fit USL ke pasangan (VUs, throughput) per bucket. Bucket dengan VU yang sama dirata-rata
+    (bobot = jumlah bucket) agar fitting tetap murah untuk run panjang.
+    Return: dict {lambda, sigma, kappa, r2} atau None jika level VU kurang dari MIN_VU_LEVELS.
+    """
+    vus = np.asarray(vus, dtype=float)
+    throughput = np.asarray(throughput, dtype=float)
+    levels, inverse, counts = np.unique(np.round(vus), return_inverse=True, return_counts=True)
+    if len(levels) < MIN_VU_LEVELS:
+        return None
+    mean_x = np.bincount(inverse, weights=throughput) / counts
+    n, x, w = levels, mean_x, counts.astype(float)
+
+    sigmas, kappas = SIGMA_GRID, KAPPA_GRID
+    _, lam, sigma, kappa = _grid_fit(n, x, w, sigmas, kappas)
+    for _ in range(REFINE_STEPS):
+        sigmas, kappas = _refine(sigmas, sigma), _refine(kappas, kappa)
+        _, lam, sigma, kappa = _grid_fit(n, x, w, sigmas, kappas)
+
+    # R^2 dihitung pada semua bucket (bukan rata-rata per level) agar noise tetap terlihat
+    residual = throughput - usl_throughput(vus, lam, sigma, kappa)
+    total = ((throughput - throughput.mean()) ** 2).sum()
+    r2 = 1 - (residual ** 2).sum() / total if total > 0 else 0.0
+    return {'lambda': float(lam), 'sigma': float(sigma), 'kappa': float(kappa), 'r2': float(r2)}
+
+def check_littles_law(analysis_df):
+    """
+    Little's Law: VUs aktif = iterasi per detik x durasi iterasi rata-rata (detik).
+    Return: dict {median_error, consistent, buckets} atau None jika metrik iterasi tidak ada.
+    """
+    if 'iteration_rate' not in analysis_df or 'iteration_avg' not in analysis_df:
+        return None
+    active = analysis_df[(analysis_df['vus'] > 0) & (analysis_df['iteration_rate'] > 0)]
+    if active.empty:
+        return None
+    predicted = active['iteration_rate'] * active['iteration_avg'] / 1000
+    error = float(((predicted - active['vus']).abs() / active['vus']).median())
+    return {'median_error': error, 'consistent': error <= LITTLE_TOLERANCE, 'buckets': len(active)}
+
+def get_capacity_model(analysis_df):
+    """
+    Model kapasitas dari rollup 5 detik (kolom: vus, rps, errors, + iteration_rate/iteration_avg jika ada).
+    Throughput = request sukses per detik (goodput), sampai VU puncak terakhir (ramp-down diabaikan).
+    Return: dict hasil fit, prediksi puncak, cek Little's Law, dan data grafik; atau None jika data tidak cukup.
+    """
+    vus = analysis_df['vus'].to_numpy()
+    if len(vus) == 0 or vus.max() <= 0:
+        return None
+    last_peak = np.nonzero(vus == vus.max())[0][-1]
+    window = analysis_df.iloc[:last_peak + 1]
+    window = window[window['vus'] > 0]
+    goodput = (window['rps'] - window['errors'] / 5).clip(lower=0)
+
+    fit = fit_usl(window['vus'], goodput)
+    if fit is None:
+        return None
+
+    lam, sigma, kappa = fit['lambda'], fit['sigma'], fit['kappa']
+    max_vus = float(window['vus'].max())
+    if kappa > 0 and sigma < 1:
+        peak_vus = float(np.sqrt((1 - sigma) / kappa))
+        peak_rps = float(usl_throughput(peak_vus, lam, sigma, kappa))
+    else:
+        peak_vus, peak_rps = None, None  # Tidak ada titik puncak (throughput naik terus menuju asimtot)
+    asymptote_rps = lam / sigma if sigma > 0 else None
+
+    # Data grafik: rata-rata observasi per level VU + kurva model (diperpanjang sampai puncak, maks 2x VU teruji)
+    observed = pd.DataFrame({'VUs': np.round(window['vus'].to_numpy()), 'RPS': goodput.to_numpy()})
+    observed = observed.groupby('VUs', as_index=False)['RPS'].mean()
+    curve_max = min(max(max_vus, peak_vus or 0), max_vus * 2)
+    curve_n = np.linspace(1, curve_max, 100)
+    curve = pd.DataFrame({'VUs': curve_n, 'RPS': usl_throughput(curve_n, lam, sigma, kappa)})
+
+    return {
+        **fit,
+        'peak_vus': int(round(peak_vus)) if peak_vus is not None else None,
+        'peak_rps': peak_rps,
+        'asymptote_rps': asymptote_rps,
+        'max_tested_vus': int(max_vus),
+        'extrapolated': peak_vus is not None and peak_vus > max_vus,
+        'reliable': fit['r2'] >= MIN_R2,
+        'littles_law': check_littles_law(analysis_df),
+        'observed': observed,
+        'curve': curve,
+    }
@@ -0,0 +1,173 @@
+import numpy as np
+
+# Parameter engine change-point (bucket resample 5 detik)
+MIN_SEGMENT = 2          # Minimal 2 bucket (10 detik) per segmen
+PENALTY_FACTOR = 3.0     # Penalti PELT = PENALTY_FACTOR * log(n) (lebih ketat dari BIC agar tahan noise)
+MIN_CONFIDENCE = 0.9     # Knee dengan confidence di bawah ini tidak dilaporkan
+MIN_EFFECT = 0.1         # Knee dengan perubahan level < 10% tidak dilaporkan
+BOOTSTRAP_SAMPLES = 500
+BOOTSTRAP_SEED = 0
+CONFIDENCE_WINDOW = 120  # Maks 120 bucket (10 menit) di tiap sisi knee untuk bootstrap
+
+def _robust_sigma(x):
+    """Estimasi noise dari selisih antar bucket (MAD), tidak terpengaruh level shift."""
+    diffs = np.diff(x)
+    if len(diffs) == 0:
+        return 0.0
+    sigma = np.median(np.abs(diffs - np.median(diffs))) / (0.6745 * np.sqrt(2))
+    if sigma == 0:
+        sigma = diffs.std() / np.sqrt(2)
+    return float(sigma)
+
+def pelt_change_points(x, penalty=None, min_size=MIN_SEGMENT):
+    """
+    PELT (Pruned Exact Linear Time) untuk perubahan mean dengan cost Gaussian.
+    Return: list index awal segmen baru (tanpa 0 dan len(x)).
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    sigma = _robust_sigma(x)
+    if n < 2 * min_size or sigma == 0:
+        return []
+
+    z = x / sigma
+    if penalty is None:
+        penalty = PENALTY_FACTOR * np.log(n)
+
+    s1 = np.concatenate([[0.0], np.cumsum(z)])
+    s2 = np.concatenate([[0.0], np.cumsum(z * z)])
+    F = np.full(n + 1, np.inf)
+    F[0] = -penalty
+    last = np.zeros(n + 1, dtype=np.int64)
+    candidates = np.array([0], dtype=np.int64)
+
+    for t in range(min_size, n + 1):
+        if t - min_size >= min_size:
+            candidates = np.append(candidates, t - min_size)
+        seg_len = t - candidates
+        cost = (s2[t] - s2[candidates]) - (s1[t] - s1[candidates]) ** 2 / seg_len
+        total = F[candidates] + cost
+        best = np.argmin(total)
+        F[t] = total[best] + penalty
+        last[t] = candidates[best]
+        # Pruning: kandidat yang tidak mungkin optimal lagi dibuang -> kompleksitas ~linear
+        candidates = candidates[total <= F[t]]
+
+    change_points = []
+    t = n
+    while t > 0:
+        t = int(last[t])
+        if t > 0:
+            change_points.append(t)
+    return sorted(change_points)
+
+def cusum_confidence(x, samples=BOOTSTRAP_SAMPLES, seed=BOOTSTRAP_SEED):
+    """
+    Confidence adanya perubahan pada x (CUSUM + bootstrap, metode Taylor).
+    Return: 0..1 (proporsi urutan acak yang range CUSUM-nya lebih kecil dari data asli).
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) < 3:
+        return 0.0
+    centered = x - x.mean()
+    cusum = np.cumsum(centered)
+    s_diff = cusum.max() - cusum.min()
+    if s_diff == 0:
+        return 0.0
+
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.tile(centered, (samples, 1)), axis=1)
+    boot = np.cumsum(shuffled, axis=1)
+    boot_diff = boot.max(axis=1) - boot.min(axis=1)
+    return float((boot_diff < s_diff).mean())
+
+def _window(x, lo, knee, hi):
+    """Potongan series di sekitar knee, dibatasi CONFIDENCE_WINDOW agar bootstrap tetap murah di run panjang."""
+    return x[max(lo, knee - CONFIDENCE_WINDOW):min(hi, knee + CONFIDENCE_WINDOW)]
+
+def detect_knees(x, direction='up', min_rel=0.0, min_abs=0.0):
+    """
+    Cari knee pada series dan onset perubahan yang signifikan.
+    - knees: change-point dengan confidence >= MIN_CONFIDENCE dan perubahan level >= MIN_EFFECT.
+    - onset: knee setelah plateau terpanjang dalam rangkaian knee berturut-turut searah `direction`
+      yang membawa level melewati plateau * (1 + min_rel) + min_abs (untuk 'down': plateau * (1 - min_rel) - min_abs).
+    Return: dict {'baseline', 'knees', 'onset'}.
+    """
+    x = np.asarray(x, dtype=float)
+    if len(x) == 0:
+        return {'baseline': 0.0, 'knees': [], 'onset': None}
+
+    change_points = pelt_change_points(x)
+    bounds = [0] + change_points + [len(x)]
+    means = [x[bounds[k]:bounds[k + 1]].mean() for k in range(len(bounds) - 1)]
+
+    knees = []
+    for k in range(1, len(means)):
+        before, after = float(means[k - 1]), float(means[k])
+        if abs(after - before) < MIN_EFFECT * abs(before):
+            continue
+        confidence = cusum_confidence(_window(x, bounds[k - 1], bounds[k], bounds[k + 1]))
+        if confidence < MIN_CONFIDENCE:
+            continue
+        knees.append({
+            'index': bounds[k],
+            'before': before,
+            'after': after,
+            'direction': 'up' if after > before else 'down',
+            'confidence': confidence,
+        })
+
+    sign = 1 if direction == 'up' else -1
+    onset = None
+    chain_start = None
+    for k in range(1, len(means)):
+        if sign * (means[k] - means[k - 1]) <= 0:
+            chain_start = None  # Arah berbalik, bukan degradasi berkelanjutan
+            continue
+        if chain_start is None:
+            chain_start = k
+
+        # Onset = knee setelah plateau terpanjang di dalam rangkaian (bukan artefak awal tes yang pendek)
+        start = max(range(chain_start, k + 1), key=lambda j: bounds[j] - bounds[j - 1])
+        start_level = means[start - 1]
+        threshold = start_level * (1 + sign * min_rel) + sign * min_abs
+        if sign * (means[k] - threshold) > 0:
+            onset = {
+                'index': bounds[start],
+                'before': float(start_level),
+                'after': float(means[start]),
+                'level': float(means[k]),
+                'direction': direction,
+                'confidence': cusum_confidence(_window(x, bounds[start - 1], bounds[start], bounds[k + 1])),
+            }
+            break
+
+    return {'baseline': float(means[0]), 'knees': knees, 'onset': onset}
+
+def detect_change_points(analysis_df):
+    """
+    Jalankan deteksi knee pada rollup 5 detik (kolom: latency_p95, errors, rps, vus).
+    - latency: P95 naik > 2x baseline (saturasi).
+    - errors: error rate naik > 1 poin persen (breaking point).
+    - throughput: RPS per VU turun > 20% sebelum ramp-down (RPS berhenti naik walau VU bertambah).
+    Return: dict per series {'baseline', 'knees', 'onset'} dengan index posisi di analysis_df.
+    """
+    requests = (analysis_df['rps'] * 5).to_numpy()
+    error_rate = np.divide(analysis_df['errors'].to_numpy(), requests,
+                           out=np.zeros(len(requests)), where=requests > 0) * 100
+
+    result = {
+        'latency': detect_knees(analysis_df['latency_p95'].to_numpy(), 'up', min_rel=1.0),
+        'errors': detect_knees(error_rate, 'up', min_abs=1.0),
+    }
+
+    # Efisiensi throughput hanya dihitung saat ada VU aktif, sampai VU puncak terakhir (abaikan ramp-down)
+    vus = analysis_df['vus'].to_numpy()
+    last_peak = np.nonzero(vus == vus.max())[0][-1] if len(vus) else -1
+    active = np.nonzero(vus[:last_peak + 1] > 0)[0]
+    efficiency = analysis_df['rps'].to_numpy()[active] / analysis_df['vus'].to_numpy()[active]
+    throughput = detect_knees(efficiency, 'down', min_rel=0.2)
+    for knee in throughput['knees'] + ([throughput['onset']] if throughput['onset'] else []):
+        knee['index'] = int(active[knee['index']])
+    result['throughput'] = throughput
+    return result
@@ -1,5 +1,7 @@
 import streamlit as st
 import os
+from .history_index import get_history_index
+from .data_pool import DATA_DIR, DATA_MODES, list_data_pools, describe_data_pool
 
 def render_config_form():
     with st.expander("🛠️ Konfigurasi Tes Baru", expanded=not st.session_state.test_success):
@@ -16,9 +18,8 @@ def render_config_form():
             
             with c2_sub:
                 # --- FOLDER / PROJECT SELECTION ---
-                if not os.path.exists("results"): os.makedirs("results")
-                # Get existing folders
-                existing_projects = [f for f in os.listdir("results") if os.path.isdir(os.path.join("results", f))]
+                # Get existing folders (dari index riwayat, bukan scan folder)
+                existing_projects = get_history_index().projects()
                 
                 # Options: existing + Create New
                 project_options = ["➕ Buat Proyek Baru"] + existing_projects
@@ -73,12 +74,33 @@ def render_config_form():
                 else:
                     payload_data = manual_payload
 
+            # --- DATA POOL (banyak payload / kredensial, dibaca sekali ke SharedArray k6) ---
+            data_file, data_mode, pool_records = None, 'round-robin', None
+            with st.expander("📦 Data Pool (Opsional)"):
+                st.caption("Pakai banyak record dari folder `data/` (CSV, JSON array, NDJSON) agar tiap iterasi mengirim data berbeda. "
+                           "Gunakan placeholder `{{nama_field}}` di URL, body, atau headers. Tanpa template body, record dikirim sebagai body JSON.")
+                pool_files = list_data_pools()
+                if pool_files:
+                    selected_pool = st.selectbox("File Data Pool", ["(Tidak dipakai)"] + pool_files)
+                    if selected_pool != "(Tidak dipakai)":
+                        data_mode = st.radio("Mode Pemilihan Record", list(DATA_MODES), format_func=DATA_MODES.get, horizontal=True)
+                        try:
+                            pool_info = describe_data_pool(os.path.join(DATA_DIR, selected_pool))
+                            data_file = os.path.abspath(os.path.join(DATA_DIR, selected_pool))
+                            pool_records = pool_info['records']
+                            st.caption(f"{pool_records:,} record · placeholder: " + ", ".join(f"`{{{{{f}}}}}`" for f in pool_info['fields']))
+                            st.dataframe(pool_info['preview'], hide_index=True, use_container_width=True)
+                        except ValueError as e:
+                            st.error(str(e))
+                else:
+                    st.caption("Belum ada file .csv / .json / .ndjson di folder `data/`.")
+
         # --- Column 2: Scenario Strategy (Dynamic) ---
         with col2:
             st.markdown("### 2. Strategi Load Test")
             test_type = st.selectbox(
                 "Pilih Skenario", 
-                ["load", "stress", "spike", "smoke"], 
+                ["load", "stress", "spike", "soak", "smoke"], 
                 index=0,
                 format_func=lambda x: x.capitalize()
             )
@@ -105,6 +127,14 @@ def render_config_form():
                 duration = st.text_input("Durasi Lonjakan", value="1m", 
                                          help="Berapa lama lonjakan bertahan sebelum hilang?")
 
+            elif test_type == "soak":
+                st.info("🕰️ **Soak Test**: Beban stabil berjam-jam (4-12 jam) untuk mendeteksi memory leak & degradasi perlahan. "
+                        "Hasil dianalisis per menit selama tes berjalan, jadi durasi panjang tetap ringan dibuka.")
+                vus = st.number_input("Target User Stabil (VUs)", min_value=1, max_value=5000, value=100,
+                                      help="Beban normal yang ditahan sepanjang tes.")
+                duration = st.text_input("Durasi Soak", value="4h",
+                                         help="Lama fase stabil (contoh: 4h, 8h, 12h). Ramp-up & ramp-down masing-masing 5 menit.")
+
             elif test_type == "smoke":
                 st.success("✅ **Smoke Test**: Validasi script (1 User). Cek apakah koneksi berhasil.")
                 vus = 1
@@ -127,8 +157,12 @@ def render_config_form():
             with c4:
                 threshold_p95 = st.number_input("Max P95 Latency (ms)", value=500, help="Batas toleransi latency P95.")
 
+        if data_file and data_mode == 'unique' and pool_records is not None and pool_records < vus:
+            st.warning(f"⚠️ Mode Unik per VU: hanya {pool_records:,} record untuk {vus:,} VUs. Sebagian user akan memakai record yang sama.")
+
         st.markdown("---")
-        run_btn = st.button("🚀 Jalankan Tes Sekarang", disabled=st.session_state.test_running, type="primary")
+        run_btn = st.button("🚀 Jalankan Tes Sekarang", disabled=st.session_state.test_running, type="primary",
+                            help="Tes masuk antrian global dan dijalankan begitu slot run tersedia.")
         
-        return run_btn, target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95
+        return run_btn, target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95, data_file, data_mode
 
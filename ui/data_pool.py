@@ -0,0 +1,59 @@
+import os
+import csv
+import json
+
+# Data pool untuk k6/data.js (DATA_FILE & DATA_MODE): banyak payload / kredensial dalam satu file
+DATA_DIR = "data"
+DATA_POOL_EXTENSIONS = ('.csv', '.json', '.ndjson', '.jsonl')
+DATA_MODES = {
+    'round-robin': "Round-robin (bergiliran lintas VU)",
+    'random': "Random (acak tiap iterasi)",
+    'unique': "Unik per VU (1 record tetap per user)",
+}
+PREVIEW_RECORDS = 3
+
+def list_data_pools(folder=DATA_DIR):
+    """File data pool yang tersedia di folder data/."""
+    if not os.path.isdir(folder):
+        return []
+    return sorted(f for f in os.listdir(folder) if f.lower().endswith(DATA_POOL_EXTENSIONS))
+
+def describe_data_pool(path):
+    """
+    Ringkasan file data pool untuk form: jumlah record, nama field (untuk placeholder {{field}}), dan contoh record.
+    Parsing mengikuti k6/data.js (record skalar dibungkus jadi {"value": ...}).
+    Return: dict {records, fields, preview} atau raise ValueError jika format tidak valid.
+    """
+    lower = path.lower()
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            if lower.endswith('.csv'):
+                reader = csv.DictReader(f)
+                preview, count = [], 0
+                for row in reader:
+                    if count < PREVIEW_RECORDS:
+                        preview.append(row)
+                    count += 1
+                fields = [name.strip() for name in (reader.fieldnames or [])]
+            elif lower.endswith(('.ndjson', '.jsonl')):
+                preview, count = [], 0
+                for line in f:
+                    if not line.strip():
+                        continue
+                    if count < PREVIEW_RECORDS:
+                        preview.append(json.loads(line))
+                    count += 1
+                fields = None
+            else:
+                records = json.load(f)
+                if not isinstance(records, list):
+                    records = [records]
+                preview, count = records[:PREVIEW_RECORDS], len(records)
+                fields = None
+    except (OSError, ValueError, csv.Error) as e:
+        raise ValueError(f"File data pool tidak valid: {e}")
+
+    preview = [r if isinstance(r, dict) else {'value': r} for r in preview]
+    if fields is None:
+        fields = list(dict.fromkeys(key for record in preview for key in record))
+    return {'records': count, 'fields': fields, 'preview': preview}
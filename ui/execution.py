@@ -1,91 +1,145 @@
 import streamlit as st
-import subprocess
-import os
+import time
 from datetime import datetime
+from .session import session_holder_id
+from .run_queue import get_run_queue, validate_run_params, QUEUED, RUNNING, SUCCESS, THRESHOLD_FAILED, CANCELLED, INTERRUPTED
 
-def run_k6_test(target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95):
-    if not target_url:
-        st.error("URL Wajib diisi!")
+STATE_LABELS = {QUEUED: "⏳ Antri", RUNNING: "▶️ Berjalan", 'finished': "🏁 Selesai"}
+OUTCOME_LABELS = {
+    SUCCESS: "✅ Sukses",
+    THRESHOLD_FAILED: "⚠️ Threshold Terlampaui",
+    'failed': "❌ Gagal",
+    CANCELLED: "🛑 Dibatalkan",
+    INTERRUPTED: "⚡ Terputus (Restart)",
+}
+
+def _format_eta(epoch):
+    remaining = max(0, int(epoch - time.time()))
+    return f"{datetime.fromtimestamp(epoch).strftime('%H:%M:%S')} (~{remaining // 60}m {remaining % 60}s lagi)"
+
+def run_k6_test(target_url, method, project_name, csv_name, test_type, vus, duration, payload_data, headers, expected_status, threshold_p95, data_file=None, data_mode='round-robin'):
+    """Masukkan tes ke antrian run global (dijalankan di background sesuai batas run paralel)."""
+    try:
+        params = validate_run_params({
+            'target_url': target_url,
+            'method': method,
+            'project_name': project_name,
+            'csv_name': csv_name,
+            'test_type': test_type,
+            'vus': vus,
+            'duration': duration,
+            'payload_data': payload_data,
+            'headers': headers,
+            'expected_status': expected_status,
+            'threshold_p95': threshold_p95,
+            'data_file': data_file,
+            'data_mode': data_mode,
+        })
+    except ValueError as e:
+        st.error(str(e))
+        return
+
+    job_id = get_run_queue().submit(params, owner=session_holder_id())
+    st.session_state.active_job_id = job_id
+    st.session_state.test_running = True
+    st.rerun()
+
+def _render_own_job(queue, job):
+    """Status job milik session ini: posisi antrian / progress + terminal, dan tombol batal."""
+    if job['state'] == QUEUED:
+        st.info(f"⏳ **Tes Anda dalam antrian** (posisi {job['position']}). Perkiraan mulai: **{_format_eta(job['eta_start'])}**.")
     else:
-        st.session_state.test_running = True
-        if not os.path.exists("results"): os.makedirs("results")
-        
-        # 1. Tentukan Nama Folder Proyek
-        safe_folder_name = "".join(c for c in (project_name if project_name else "Default_Project") if c.isalnum() or c in (' ', '_', '-')).strip().replace(" ", "_")
-        test_folder = os.path.join("results", safe_folder_name)
-        if not os.path.exists(test_folder):
-            os.makedirs(test_folder)
-
-        # 2. Tentukan Nama File CSV
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        if csv_name and csv_name.strip():
-            # User input custom name
-            safe_filename = "".join(c for c in csv_name if c.isalnum() or c in (' ', '_', '-')).strip().replace(" ", "_")
-            # Cek apakah user sudah pake .csv atau belum
-            if not safe_filename.lower().endswith(".csv"):
-                 safe_filename += ".csv"
-            # Optional: Append timestamp kecil biar ga overwrite kalau nama sama? 
-            # Atau kita biarkan overwrite? User minta "custom", biasanya expect exactly that name.
-            # Tapi untuk safety data load testing, lebih baik warning atau append. 
-            # Kita 'smart append' jika file sudah ada.
-            
-            final_filename = safe_filename
-            counter = 1
-            while os.path.exists(os.path.join(test_folder, final_filename)):
-                base = safe_filename.replace(".csv", "")
-                final_filename = f"{base}_{counter}.csv"
-                counter += 1
-            
-            output_csv = os.path.join(test_folder, final_filename)
-        else:
-            # Default auto-generate timestamp
-            output_csv = os.path.join(test_folder, f"{timestamp}.csv")
-        
-        # Environment variables for k6 script
-        env = os.environ.copy()
-        env["TARGET_URL"] = target_url
-        env["METHOD"] = method
-        env["TEST_TYPE"] = test_type
-        env["MY_VUS"] = str(vus) # Ensure your script.js uses __ENV.MY_VUS
-        env["MY_DURATION"] = duration # Ensure your script.js uses __ENV.MY_DURATION
-        env["HEADERS"] = headers # Pass headers JSON
-        env["EXPECTED_STATUS"] = str(expected_status)
-        env["THRESHOLD_P95"] = str(threshold_p95)
-        
-        if payload_data: env["PAYLOAD_DATA"] = payload_data.replace('\n', '')
-
-        # Live Terminal
+        elapsed = time.time() - job['started_at']
+        st.progress(min(elapsed / max(job['expected_duration'], 1), 1.0),
+                    text=f"▶️ Tes berjalan: {int(elapsed)}s / ~{int(job['expected_duration'])}s. Perkiraan selesai: {_format_eta(job['eta_finish'])}")
+        if job['params']['test_type'] == 'soak' and job['output_csv']:
+            _render_live_rollups(job['output_csv'])
         st.markdown("### 🖥️ Terminal Output")
-        terminal = st.empty()
-        full_logs = ""
-        
-        # Command
-        cmd = ["k6", "run", "--out", f"csv={output_csv}", "k6/main.js"] # Ensure script.js exists
-        
-        try:
-            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1, env=env, encoding='utf-8')
-            
-            while True:
-                line = process.stdout.readline()
-                if not line and process.poll() is not None: break
-                if line:
-                    full_logs += line
-                    terminal.code(full_logs[-2000:], language="bash") # Show last 2000 chars
-            
-            if process.poll() == 0 or (os.path.exists(output_csv) and os.path.getsize(output_csv) > 0):
-                # SUKSES (Code 0) ATAU Ada Hasil CSV (meskipun Code != 0 karena Threshold failure)
-                st.session_state.test_success = True
-                st.session_state.test_results_path = output_csv
-                
-                if process.poll() == 0:
-                    st.success("Tes Selesai dengan Sempurna!")
-                else:
-                    st.warning("Tes Selesai! (Warning: Beberapa request gagal atau Threshold terlampaui - Normal untuk Stress Test)")
-                
-                st.rerun() # Refresh to show results
+        st.code(queue.log_tail(job['id']) or "Menunggu output k6...", language="bash")
+
+    if st.button("🛑 Batalkan Tes Saya", key=f"cancel_own_{job['id']}"):
+        queue.cancel(job['id'])
+        st.toast("Permintaan pembatalan dikirim.", icon="🛑")
+
+def _render_live_rollups(output_csv):
+    """Soak yang sedang berjalan: agregat per menit yang sudah ditulis (P95 & RPS)."""
+    from .rollups import load_rollups  # Berat (numpy/pandas): hanya saat ada soak berjalan
+    rollups, _ = load_rollups(output_csv, build=False)
+    if rollups is None:
+        st.caption("🕰️ Agregat per menit pertama muncul setelah ~2 menit.")
+        return
+    latest = rollups.iloc[-1]
+    st.caption(f"🕰️ Menit ke-{int(latest['minute']) + 1}: P95 {latest['p95'] or 0:.0f} ms · {latest['rps']:.1f} RPS · error {latest['error_rate']:.2f}%")
+    st.line_chart(rollups.set_index(rollups['start_s'] / 3600)[['p95', 'rps']], height=180)
+
+def _finish_own_job(job):
+    """Job milik session ini selesai: buka hasilnya (jika ada) lalu rerun halaman penuh."""
+    st.session_state.active_job_id = None
+    st.session_state.test_running = False
+    if job['outcome'] in (SUCCESS, THRESHOLD_FAILED) and job['output_csv']:
+        st.session_state.test_success = True
+        st.session_state.test_results_path = job['output_csv']
+        if job['outcome'] == SUCCESS:
+            st.session_state.run_notice = ('success', "Tes Selesai dengan Sempurna!")
+        else:
+            st.session_state.run_notice = ('warning', "Tes Selesai! (Warning: Beberapa request gagal atau Threshold terlampaui - Normal untuk Stress Test)")
+    elif job['outcome'] == CANCELLED:
+        st.session_state.run_notice = ('warning', "Tes dibatalkan.")
+    else:
+        st.session_state.run_notice = ('error', f"Gagal menjalankan k6. {job.get('error') or ''}")
+    st.rerun(scope="app")
+
+def _render_queue_table(queue, jobs, owner):
+    active = [j for j in jobs if j['state'] != 'finished']
+    finished = [j for j in jobs if j['state'] == 'finished'][:10]
+
+    if active:
+        for job in active:
+            params = job['params']
+            mine = " (Anda)" if job['owner'] == owner else ""
+            eta = _format_eta(job['eta_finish'] if job['state'] == RUNNING else job['eta_start'])
+            eta_label = "selesai" if job['state'] == RUNNING else "mulai"
+            col_info, col_btn = st.columns([0.85, 0.15])
+            col_info.markdown(f"{STATE_LABELS[job['state']]}{mine} · **{params.get('project_name') or 'Default_Project'}** · "
+                              f"{params['test_type']} {params['vus']} VUs / {params['duration']} · ETA {eta_label}: {eta}")
+            if col_btn.button("Batal", key=f"cancel_{job['id']}", use_container_width=True):
+                queue.cancel(job['id'])
+                st.rerun(scope="fragment")
+    else:
+        st.caption("Tidak ada tes yang sedang berjalan atau antri.")
+
+    if finished:
+        st.markdown("##### Riwayat Antrian")
+        st.dataframe([{
+            'Selesai': datetime.fromtimestamp(j['finished_at']).strftime('%d %b %H:%M:%S'),
+            'Proyek': j['params'].get('project_name') or 'Default_Project',
+            'Skenario': f"{j['params']['test_type']} {j['params']['vus']} VUs / {j['params']['duration']}",
+            'Hasil': OUTCOME_LABELS.get(j['outcome'], j['outcome']),
+        } for j in finished], use_container_width=True, hide_index=True)
+
+def render_run_queue():
+    """Panel antrian run global. Auto-refresh (fragment) selama masih ada job aktif."""
+    notice = st.session_state.pop('run_notice', None)
+    if notice:
+        getattr(st, notice[0])(notice[1])
+
+    queue = get_run_queue()
+    has_active = any(j['state'] != 'finished' for j in queue.jobs())
+
+    @st.fragment(run_every=2 if has_active else None)
+    def queue_status():
+        owner = session_holder_id()
+        jobs = queue.jobs()
+        job_id = st.session_state.get('active_job_id')
+        if job_id:
+            job = next((j for j in jobs if j['id'] == job_id), None)
+            if job is None or job['state'] == 'finished':
+                _finish_own_job(job or {'outcome': None, 'output_csv': None, 'error': "Job tidak ditemukan di antrian."})
             else:
-                st.error("Gagal menjalankan k6. Tidak ada data output yang dihasilkan.")
-        except Exception as e:
-            st.error(f"Error executing k6: {e}")
-        
-        st.session_state.test_running = False
+                _render_own_job(queue, job)
+
+        active_count = sum(1 for j in jobs if j['state'] != 'finished')
+        with st.expander(f"📋 Antrian Run Global ({active_count} aktif, maks {queue.max_running} paralel)", expanded=active_count > 0 and not job_id):
+            _render_queue_table(queue, jobs, owner)
+
+    queue_status()
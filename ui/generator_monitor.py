@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import threading
+
+# Self-monitoring proses k6 (load generator) via /proc (Linux/Docker).
+# Di OS tanpa /proc (Windows/Mac) sampler tidak berjalan dan analisis di-skip.
+SAMPLE_INTERVAL = 1.0    # Detik antar sample
+GEN_CPU_LIMIT = 0.85     # >85% CPU yang tersedia = k6 kehabisan CPU
+GEN_MEM_LIMIT = 0.90     # >90% memori yang tersedia = k6 kehabisan memori
+MIN_SATURATED_SECONDS = 10
+SATURATION_GRACE_SECONDS = 5  # Breaking point sesaat setelah generator pulih masih dianggap akibat generator
+
+def generator_metrics_path(results_path):
+    """File sidecar metrik generator: results/Proyek/run.csv -> results/Proyek/run.generator.ndjson"""
+    return os.path.splitext(results_path)[0] + ".generator.ndjson"
+
+def _read_first_line(path):
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+def get_cpu_capacity():
+    """Jumlah core yang boleh dipakai (kuota cgroup v2/v1 jika ada, selain itu os.cpu_count())."""
+    cpu_max = _read_first_line("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, period = cpu_max.split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+    quota = _read_first_line("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read_first_line("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return float(os.cpu_count() or 1)
+
+def get_memory_capacity_mb():
+    """Memori yang tersedia untuk container/host dalam MB (limit cgroup jika lebih kecil dari MemTotal)."""
+    limits = []
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        value = _read_first_line(path)
+        if value and value.isdigit():
+            limits.append(int(value) / (1024 * 1024))
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    limits.append(int(line.split()[1]) / 1024)
+                    break
+    except OSError:
+        pass
+    return min(limits) if limits else None
+
+def read_process_sample(pid):
+    """
+    Baca CPU time (detik), RSS (MB), jumlah thread, dan socket terbuka proses dari /proc.
+    Return: dict atau None jika proses sudah selesai / /proc tidak tersedia.
+    """
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # Field setelah "(comm)" -> utime=14, stime=15, num_threads=20 (1-based)
+            fields = f.read().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / ticks
+        threads = int(fields[17])
+
+        rss_mb = 0.0
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss_mb = int(line.split()[1]) / 1024
+                    break
+
+        sockets = 0
+        fd_dir = f"/proc/{pid}/fd"
+        for fd in os.listdir(fd_dir):
+            try:
+                if os.readlink(os.path.join(fd_dir, fd)).startswith("socket:"):
+                    sockets += 1
+            except OSError:
+                continue
+
+        return {'cpu_seconds': cpu_seconds, 'rss_mb': rss_mb, 'threads': threads, 'sockets': sockets}
+    except (OSError, IndexError, ValueError):
+        return None
+
+def _sample_loop(pid, out_path, interval, stop_event):
+    cpu_capacity = get_cpu_capacity()
+    mem_capacity = get_memory_capacity_mb()
+    prev = read_process_sample(pid)
+    prev_time = time.time()
+    if prev is None:
+        return
+
+    with open(out_path, "a") as f:
+        while not stop_event.wait(interval):
+            sample = read_process_sample(pid)
+            now = time.time()
+            if sample is None:
+                break
+            cpu_pct = (sample['cpu_seconds'] - prev['cpu_seconds']) / max(now - prev_time, 1e-6) * 100
+            f.write(json.dumps({
+                'timestamp': round(now, 3),
+                'cpu_pct': round(cpu_pct, 1),
+                'cpu_util': round(cpu_pct / (cpu_capacity * 100), 4),
+                'rss_mb': round(sample['rss_mb'], 1),
+                'mem_util': round(sample['rss_mb'] / mem_capacity, 4) if mem_capacity else None,
+                'threads': sample['threads'],
+                'sockets': sample['sockets'],
+            }) + "\n")
+            f.flush()
+            prev, prev_time = sample, now
+
+def start_generator_monitor(pid, results_path, interval=SAMPLE_INTERVAL):
+    """
+    Mulai sampling proses k6 di background thread.
+    Return: fungsi stop() untuk menghentikan sampler (dipanggil setelah k6 selesai).
+    """
+    stop_event = threading.Event()
+    if not os.path.exists(f"/proc/{pid}"):
+        return stop_event.set
+
+    thread = threading.Thread(
+        target=_sample_loop,
+        args=(pid, generator_metrics_path(results_path), interval, stop_event),
+        daemon=True,
+    )
+    thread.start()
+
+    def stop():
+        stop_event.set()
+        thread.join(timeout=interval * 2)
+    return stop
+
+def load_generator_metrics(results_path):
+    """Load metrik generator untuk sebuah run. Return: DataFrame atau None jika tidak ada."""
+    path = generator_metrics_path(results_path)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    import pandas as pd  # Berat: baru dimuat saat halaman hasil dibuka
+    gen_df = pd.read_json(path, lines=True)
+    gen_df['timestamp'] = pd.to_datetime(gen_df['timestamp'], unit='s')
+    return gen_df
+
+def get_generator_analysis(gen_df, diagnosis=None):
+    """
+    Cek apakah k6 sendiri yang menjadi bottleneck (CPU / memori generator jenuh).
+    Return: dict ringkasan atau None jika tidak ada data generator.
+    """
+    if gen_df is None or gen_df.empty:
+        return None
+    import pandas as pd  # Sudah dimuat oleh pemanggil (gen_df); import lokal agar modul tetap ringan
+
+    start = gen_df['timestamp'].iloc[0]
+    interval = gen_df['timestamp'].diff().dt.total_seconds().median() if len(gen_df) > 1 else SAMPLE_INTERVAL
+    mem_util = gen_df['mem_util'].fillna(0) if 'mem_util' in gen_df else 0
+    saturated = (gen_df['cpu_util'] >= GEN_CPU_LIMIT) | (mem_util >= GEN_MEM_LIMIT)
+
+    # Jenuh = sample jenuh berturut-turut (run-length), bukan jumlah spike yang tersebar sepanjang tes
+    saturated_seconds, first_saturated, window_start, window_end = 0.0, None, None, None
+    if saturated.any():
+        run_id = (~saturated).cumsum()
+        lengths = saturated.groupby(run_id).sum()
+        longest = gen_df.loc[saturated & (run_id == lengths.idxmax()), 'timestamp']
+        saturated_seconds = float(lengths.max() * interval)
+        window_start = longest.iloc[0]
+        window_end = longest.iloc[-1] + pd.Timedelta(seconds=interval)  # Sample terakhir mewakili satu interval
+        first_saturated = (window_start - start).total_seconds()
+
+    is_saturated = saturated_seconds >= MIN_SATURATED_SECONDS
+    # Breaking point terjadi selama generator jenuh -> diagnosis target tidak bisa dipercaya.
+    # Generator yang sudah pulih sebelum breaking point tidak membatalkan diagnosis.
+    invalidates_diagnosis = bool(
+        is_saturated and diagnosis and diagnosis.get('status') == 'broken'
+        and window_start <= diagnosis['timestamp'] <= window_end + pd.Timedelta(seconds=SATURATION_GRACE_SECONDS)
+    )
+
+    return {
+        'saturated': is_saturated,
+        'saturated_seconds': saturated_seconds,   # Durasi jendela jenuh berturut-turut terpanjang
+        'first_saturated': first_saturated,       # Awal jendela tersebut (detik dari sample pertama)
+        'invalidates_diagnosis': invalidates_diagnosis,
+        'max_cpu_util': float(gen_df['cpu_util'].max()),
+        'max_rss_mb': float(gen_df['rss_mb'].max()),
+        'max_mem_util': float(gen_df['mem_util'].max()) if 'mem_util' in gen_df and gen_df['mem_util'].notna().any() else None,
+        'max_threads': int(gen_df['threads'].max()),
+        'max_sockets': int(gen_df['sockets'].max()),
+    }
@@ -0,0 +1,232 @@
+import os
+import sys
+import struct
+import select
+import threading
+import ctypes
+import ctypes.util
+
+# Index riwayat tes (results/<proyek>/<run>.csv) di memori.
+# Di-scan sekali saat startup lalu diperbarui via inotify (Linux) atau polling mtime folder (fallback,
+# juga untuk volume network yang tidak mengirim event inotify). Paksa polling dengan K6_DASHBOARD_HISTORY_WATCH=poll.
+RESULTS_ROOT = "results"
+POLL_INTERVAL = 5.0
+
+# Konstanta inotify (linux/inotify.h)
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_Q_OVERFLOW = 0x4000
+IN_IGNORED = 0x8000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+def read_run_start_time(path):
+    """
+    Waktu mulai run sebenarnya = timestamp baris data pertama CSV k6 (hanya baca 2 baris).
+    Fallback ke mtime jika file masih kosong / formatnya tidak dikenal.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            header = f.readline().strip().split(',')
+            first_row = f.readline().strip().split(',')
+        return float(first_row[header.index('timestamp')])
+    except (OSError, ValueError, IndexError):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+class HistoryIndex:
+    """Index thread-safe {proyek: {nama_file: info_run}} untuk sidebar & form konfigurasi."""
+
+    def __init__(self, root=RESULTS_ROOT):
+        self.root = root
+        self.mode = None
+        self._lock = threading.Lock()
+        self._projects = {}
+        self._dir_mtimes = {}
+        self._stop = threading.Event()
+        os.makedirs(root, exist_ok=True)
+        self.rescan()
+
+    # --- Update incremental ---
+    def add_run(self, path):
+        """Tambah/perbarui satu run (dipanggil run_k6_test setelah selesai, atau oleh watcher)."""
+        if not path.endswith('.csv'):
+            return
+        project = os.path.basename(os.path.dirname(path))
+        filename = os.path.basename(path)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return
+        info = {
+            'project': project,
+            'filename': filename,
+            'path': os.path.join(self.root, project, filename),
+            'start_time': read_run_start_time(path),
+            'size': size,
+        }
+        with self._lock:
+            self._projects.setdefault(project, {})[filename] = info
+
+    def remove_run(self, path):
+        """Hapus satu run dari index (tombol hapus di sidebar, atau event delete)."""
+        project = os.path.basename(os.path.dirname(path))
+        filename = os.path.basename(path)
+        with self._lock:
+            runs = self._projects.get(project)
+            if runs is not None:
+                runs.pop(filename, None)
+                if not runs and not os.path.isdir(os.path.join(self.root, project)):
+                    del self._projects[project]
+
+    def _scan_project(self, project):
+        folder = os.path.join(self.root, project)
+        try:
+            names = [f for f in os.listdir(folder) if f.endswith('.csv')]
+            self._dir_mtimes[folder] = os.stat(folder).st_mtime_ns
+        except OSError:
+            with self._lock:
+                self._projects.pop(project, None)
+            return
+        with self._lock:
+            known = self._projects.get(project, {})
+            current = {name: known[name] for name in names if name in known}
+            self._projects[project] = current
+        for name in names:
+            if name not in current:
+                self.add_run(os.path.join(folder, name))
+
+    def rescan(self):
+        """Scan penuh folder results (startup, atau saat event inotify overflow)."""
+        try:
+            projects = [f for f in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, f))]
+            self._dir_mtimes[self.root] = os.stat(self.root).st_mtime_ns
+        except OSError:
+            projects = []
+        with self._lock:
+            for gone in set(self._projects) - set(projects):
+                del self._projects[gone]
+        for project in projects:
+            self._scan_project(project)
+
+    # --- Query ---
+    def projects(self):
+        with self._lock:
+            return sorted(self._projects, key=str.lower)
+
+    def runs(self, project):
+        """List info run dalam proyek, terbaru dulu (berdasarkan waktu mulai run, bukan nama file)."""
+        with self._lock:
+            runs = list(self._projects.get(project, {}).values())
+        return sorted(runs, key=lambda r: r['start_time'], reverse=True)
+
+    def get_run(self, project, filename):
+        with self._lock:
+            return self._projects.get(project, {}).get(filename)
+
+    # --- Watcher ---
+    def start_watching(self):
+        if os.environ.get("K6_DASHBOARD_HISTORY_WATCH") != "poll" and sys.platform.startswith("linux"):
+            try:
+                thread = threading.Thread(target=self._inotify_loop, args=(self._init_inotify(),), daemon=True)
+                self.mode = "inotify"
+                thread.start()
+                return
+            except OSError:
+                pass
+        self.mode = "polling"
+        threading.Thread(target=self._poll_loop, daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _init_inotify(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init()
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init gagal")
+        self._libc = libc
+        self._watches = {}
+        self._add_watch(fd, self.root)
+        for project in self.projects():
+            self._add_watch(fd, os.path.join(self.root, project))
+        return fd
+
+    def _add_watch(self, fd, folder):
+        wd = self._libc.inotify_add_watch(fd, os.fsencode(folder), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch gagal: {folder}")
+        self._watches[wd] = folder
+
+    def _inotify_loop(self, fd):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], 1.0)
+            if not ready:
+                continue
+            buf = os.read(fd, 64 * 1024)
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _, name_len = EVENT_HEADER.unpack_from(buf, offset)
+                name = buf[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + name_len].rstrip(b'\0').decode(errors='replace')
+                offset += EVENT_HEADER.size + name_len
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)  # Folder proyek sudah dihapus
+                    continue
+                try:
+                    self._handle_event(fd, self._watches.get(wd), mask, name)
+                except OSError:
+                    continue
+        os.close(fd)
+
+    def _handle_event(self, fd, folder, mask, name):
+        if mask & IN_Q_OVERFLOW:
+            self.rescan()
+            return
+        if folder is None:
+            return
+        path = os.path.join(folder, name)
+        if folder == self.root:
+            # Event folder proyek
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_watch(fd, path)
+                self._scan_project(name)
+            elif mask & IN_ISDIR and mask & (IN_DELETE | IN_MOVED_FROM):
+                with self._lock:
+                    self._projects.pop(name, None)
+        elif mask & (IN_CREATE | IN_CLOSE_WRITE | IN_MOVED_TO):
+            self.add_run(path)
+        elif mask & (IN_DELETE | IN_MOVED_FROM):
+            self.remove_run(path)
+
+    def _poll_loop(self):
+        """Fallback: cukup stat mtime folder (bukan walk penuh); scan ulang hanya folder yang berubah."""
+        while not self._stop.wait(POLL_INTERVAL):
+            try:
+                if os.stat(self.root).st_mtime_ns != self._dir_mtimes.get(self.root):
+                    self.rescan()
+                    continue
+                for project in self.projects():
+                    folder = os.path.join(self.root, project)
+                    if os.stat(folder).st_mtime_ns != self._dir_mtimes.get(folder):
+                        self._scan_project(project)
+            except OSError:
+                continue
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_history_index():
+    """Singleton index riwayat (scan sekali saat pertama dipanggil, lalu dipantau di background)."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = HistoryIndex()
+            _index.start_watching()
+        return _index
@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import numpy as np
+from .scenarios import load_run_metadata
+
+# Regression gate: bandingkan run baru dengan baseline yang di-pin per proyek.
+# Baseline disimpan sebagai sketch kecil (histogram latency + agregat), bukan CSV penuh:
+#   results/<proyek>/.baseline.json
+BASELINE_FILENAME = ".baseline.json"
+SKETCH_VERSION = 1
+
+# Bucket latency tetap (log-scale 0.1 ms .. 120 s, ~6% per bucket) agar histogram dua run bisa dibandingkan langsung
+LATENCY_EDGES = np.geomspace(0.1, 120_000, 241)
+THROUGHPUT_WINDOW_S = 30
+
+DEFAULT_TOLERANCES = {
+    'p95_pct': 10.0,         # P95 boleh naik maks 10%
+    'error_rate_pp': 1.0,    # Error rate boleh naik maks 1 poin persen
+    'throughput_pct': 10.0,  # Median throughput per jendela boleh turun maks 10%
+    'alpha': 0.01,           # Batas p-value uji statistik
+}
+
+# --- Sketch run ---
+
+def build_run_sketch(df, run_start, path=None):
+    """
+    Ringkasan kompak satu run untuk regression gate (~beberapa KB, berapapun ukuran CSV).
+    Return: dict sketch (JSON-serializable).
+    """
+    reqs = df.loc[df['metric_name'] == 'http_req_duration', ['timestamp', 'metric_value']]
+    failed = df.loc[df['metric_name'] == 'http_req_failed', ['timestamp', 'metric_value']]
+    values = reqs['metric_value'].to_numpy(dtype=float)
+    counts, _ = np.histogram(np.clip(values, LATENCY_EDGES[0], LATENCY_EDGES[-1]), bins=LATENCY_EDGES)
+
+    # Goodput (request sukses / detik) per jendela 30 detik dari awal tes
+    ok = failed[failed['metric_value'].to_numpy() == 0]
+    seconds = ((ok['timestamp'].to_numpy() - run_start.to_datetime64()) / np.timedelta64(1, 's')) if not ok.empty else np.array([])
+    windows = np.bincount((seconds // THROUGHPUT_WINDOW_S).astype(np.int64)) / THROUGHPUT_WINDOW_S if len(seconds) else np.array([])
+
+    metadata = load_run_metadata(path) if path else None
+    return {
+        'version': SKETCH_VERSION,
+        'run': os.path.basename(path) if path else None,
+        'total_reqs': int(len(values)),
+        'failed_reqs': int(failed['metric_value'].sum()) if not failed.empty else 0,
+        'p50': float(np.percentile(values, 50)) if len(values) else None,
+        'p95': float(np.percentile(values, 95)) if len(values) else None,
+        'p99': float(np.percentile(values, 99)) if len(values) else None,
+        'latency_hist': counts.tolist(),
+        'throughput_windows': np.round(windows, 3).tolist(),
+        'config': {k: metadata.get(k) for k in ('test_type', 'vus', 'duration', 'method', 'target_url')} if metadata else None,
+    }
+
+# --- Baseline per proyek ---
+
+def baseline_path(project_folder):
+    return os.path.join(project_folder, BASELINE_FILENAME)
+
+def load_baseline(project_folder):
+    """Return: dict {run, pinned_at, tolerances, sketch} atau None jika proyek belum punya baseline."""
+    try:
+        with open(baseline_path(project_folder)) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        return None
+    baseline['tolerances'] = {**DEFAULT_TOLERANCES, **baseline.get('tolerances', {})}
+    return baseline
+
+def save_baseline(project_folder, sketch, tolerances=None):
+    """Pin sketch sebagai baseline proyek (menggantikan baseline lama). Toleransi lama dipertahankan jika tidak diisi."""
+    previous = load_baseline(project_folder)
+    baseline = {
+        'run': sketch['run'],
+        'pinned_at': time.time(),
+        'tolerances': tolerances or (previous['tolerances'] if previous else dict(DEFAULT_TOLERANCES)),
+        'sketch': sketch,
+    }
+    return _write_baseline(project_folder, baseline)
+
+def update_tolerances(project_folder, tolerances):
+    baseline = load_baseline(project_folder)
+    if baseline is None:
+        return None
+    baseline['tolerances'] = {**DEFAULT_TOLERANCES, **tolerances}
+    return _write_baseline(project_folder, baseline)
+
+def clear_baseline(project_folder):
+    """Lepas baseline proyek (run berikutnya tidak dibandingkan sampai ada baseline baru). Return: True jika ada yang dihapus."""
+    try:
+        os.remove(baseline_path(project_folder))
+    except FileNotFoundError:
+        return False
+    return True
+
+def _write_baseline(project_folder, baseline):
+    """Tulis atomik (tmp + rename): pembaca lain (session lain, API) tidak pernah melihat file setengah jadi."""
+    tmp = baseline_path(project_folder) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(baseline, f)
+    os.replace(tmp, baseline_path(project_folder))
+    return baseline
+
+# --- Uji statistik (numpy, pada histogram bucket yang sama) ---
+
+def mann_whitney_binned(base_counts, new_counts):
+    """
+    Mann-Whitney U satu sisi (H1: latency run baru lebih besar) dari histogram, dengan midrank & koreksi ties per bucket.
+    Return: (p_value, auc) - auc = P(baru > baseline) + 0.5 P(sama), 0.5 = tidak ada perbedaan.
+    """
+    a = np.asarray(base_counts, dtype=float)
+    b = np.asarray(new_counts, dtype=float)
+    n_a, n_b = a.sum(), b.sum()
+    if n_a == 0 or n_b == 0:
+        return 1.0, 0.5
+    c = a + b
+    n = n_a + n_b
+    midrank = np.cumsum(c) - c + (c + 1) / 2
+    u_b = (b * midrank).sum() - n_b * (n_b + 1) / 2
+    mean = n_a * n_b / 2
+    tie_term = ((c ** 3 - c).sum()) / (n * (n - 1)) if n > 1 else 0.0
+    var = n_a * n_b / 12 * ((n + 1) - tie_term)
+    if var <= 0:
+        return 1.0, 0.5
+    z = (u_b - mean) / math.sqrt(var)
+    return 0.5 * math.erfc(z / math.sqrt(2)), float(u_b / (n_a * n_b))
+
+def ks_binned(base_counts, new_counts):
+    """
+    Kolmogorov-Smirnov dua sampel dari histogram (statistik D pada batas bucket, p-value asimtotik).
+    Return: (d, p_value).
+    """
+    a = np.asarray(base_counts, dtype=float)
+    b = np.asarray(new_counts, dtype=float)
+    n_a, n_b = a.sum(), b.sum()
+    if n_a == 0 or n_b == 0:
+        return 0.0, 1.0
+    d = float(np.abs(np.cumsum(a) / n_a - np.cumsum(b) / n_b).max())
+    en = math.sqrt(n_a * n_b / (n_a + n_b))
+    lam = (en + 0.12 + 0.11 / en) * d
+    if lam < 1e-3:
+        return d, 1.0
+    k = np.arange(1, 101)
+    p = 2 * np.sum((-1) ** (k - 1) * np.exp(-2 * k ** 2 * lam ** 2))
+    return d, float(min(max(p, 0.0), 1.0))
+
+def two_proportion_test(fail_a, n_a, fail_b, n_b):
+    """Uji z dua proporsi satu sisi (H1: error rate run baru lebih tinggi). Return: p_value."""
+    if n_a == 0 or n_b == 0:
+        return 1.0
+    pooled = (fail_a + fail_b) / (n_a + n_b)
+    se = math.sqrt(pooled * (1 - pooled) * (1 / n_a + 1 / n_b))
+    if se == 0:
+        return 1.0
+    z = (fail_b / n_b - fail_a / n_a) / se
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+# --- Verdict ---
+
+def compare_to_baseline(sketch, baseline):
+    """
+    Bandingkan sketch run baru dengan baseline memakai toleransi baseline.
+    Regresi dinyatakan hanya jika perubahan melewati toleransi DAN signifikan secara statistik (p < alpha),
+    agar noise kecil pada run dengan ribuan request tidak memicu gagal.
+    Return: dict {status: 'pass'|'regression', checks, comparable, config_diff, baseline_run}.
+    """
+    base = baseline['sketch']
+    tol = baseline['tolerances']
+    alpha = tol['alpha']
+    checks = []
+
+    # 1. Distribusi latency (Mann-Whitney satu sisi + KS) & P95
+    mw_p, auc = mann_whitney_binned(base['latency_hist'], sketch['latency_hist'])
+    ks_d, ks_p = ks_binned(base['latency_hist'], sketch['latency_hist'])
+    p95_change = (sketch['p95'] / base['p95'] - 1) * 100 if base['p95'] and sketch['p95'] is not None else 0.0
+    checks.append({
+        'name': 'Latency P95',
+        'baseline': base['p95'],
+        'current': sketch['p95'],
+        'change': p95_change,
+        'unit': '%',
+        'tolerance': tol['p95_pct'],
+        'p_value': mw_p,
+        'regressed': p95_change > tol['p95_pct'] and mw_p < alpha,
+        'detail': f"Mann-Whitney p={mw_p:.2g} (P(baru > baseline)={auc:.2f}), KS D={ks_d:.3f} p={ks_p:.2g}",
+    })
+
+    # 2. Error rate (poin persen)
+    base_rate = base['failed_reqs'] / base['total_reqs'] * 100 if base['total_reqs'] else 0.0
+    new_rate = sketch['failed_reqs'] / sketch['total_reqs'] * 100 if sketch['total_reqs'] else 0.0
+    err_p = two_proportion_test(base['failed_reqs'], base['total_reqs'], sketch['failed_reqs'], sketch['total_reqs'])
+    checks.append({
+        'name': 'Error Rate',
+        'baseline': base_rate,
+        'current': new_rate,
+        'change': new_rate - base_rate,
+        'unit': 'pp',
+        'tolerance': tol['error_rate_pp'],
+        'p_value': err_p,
+        'regressed': new_rate - base_rate > tol['error_rate_pp'] and err_p < alpha,
+        'detail': f"Uji dua proporsi p={err_p:.2g}",
+    })
+
+    # 3. Throughput per jendela 30 detik (jendela yang sama-sama ada di kedua run)
+    base_windows = np.asarray(base['throughput_windows'], dtype=float)
+    new_windows = np.asarray(sketch['throughput_windows'], dtype=float)
+    m = min(len(base_windows), len(new_windows))
+    valid = base_windows[:m] > 0
+    if valid.any():
+        ratios = new_windows[:m][valid] / base_windows[:m][valid]
+        median_change = (float(np.median(ratios)) - 1) * 100
+        worst = int(np.nonzero(valid)[0][np.argmin(ratios)])
+        # Sign test satu sisi: berapa jendela yang lebih lambat dari baseline (binomial, p=0.5)
+        slower = int((ratios < 1).sum())
+        sign_p = 0.5 * math.erfc(((slower - len(ratios) / 2) / math.sqrt(len(ratios) / 4)) / math.sqrt(2))
+        checks.append({
+            'name': 'Throughput (per 30s)',
+            'baseline': float(np.median(base_windows[:m][valid])),
+            'current': float(np.median(new_windows[:m][valid])),
+            'change': median_change,
+            'unit': '%',
+            'tolerance': -tol['throughput_pct'],
+            'p_value': sign_p,
+            'regressed': median_change < -tol['throughput_pct'] and sign_p < alpha,
+            'detail': f"{slower}/{len(ratios)} jendela lebih lambat, terburuk detik {worst * THROUGHPUT_WINDOW_S}-{(worst + 1) * THROUGHPUT_WINDOW_S} ({(ratios.min() - 1) * 100:+.0f}%)",
+        })
+
+    # Konfigurasi skenario berbeda -> perbandingan throughput/latency tidak apple-to-apple
+    config_diff = []
+    if base.get('config') and sketch.get('config'):
+        config_diff = [k for k in ('test_type', 'vus', 'duration', 'method', 'target_url') if base['config'].get(k) != sketch['config'].get(k)]
+
+    return {
+        'status': 'regression' if any(c['regressed'] for c in checks) else 'pass',
+        'checks': checks,
+        'comparable': not config_diff,
+        'config_diff': config_diff,
+        'baseline_run': baseline['run'],
+    }
+
+# --- CLI (untuk CI / script): exit 1 jika regresi ---
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regression gate: bandingkan run k6 dengan baseline proyek.")
+    parser.add_argument("csv", help="CSV hasil k6 (results/<proyek>/<run>.csv)")
+    parser.add_argument("--pin", action="store_true", help="Jadikan run ini baseline proyek lalu keluar")
+    parser.add_argument("--unpin", action="store_true", help="Lepas baseline proyek run ini lalu keluar")
+    parser.add_argument("--p95-tolerance", type=float, help="Kenaikan P95 maksimal (persen)")
+    parser.add_argument("--error-tolerance", type=float, help="Kenaikan error rate maksimal (poin persen)")
+    parser.add_argument("--throughput-tolerance", type=float, help="Penurunan throughput maksimal (persen)")
+    parser.add_argument("--alpha", type=float, help="Batas p-value uji statistik")
+    parser.add_argument("--json", action="store_true", help="Cetak verdict sebagai JSON")
+    args = parser.parse_args(argv)
+
+    project_folder = os.path.dirname(os.path.abspath(args.csv))
+    if args.unpin:
+        print(f"Baseline proyek {os.path.basename(project_folder)} dilepas" if clear_baseline(project_folder)
+              else f"Proyek {os.path.basename(project_folder)} belum punya baseline")
+        return 0
+
+    from .utils import load_test_results  # Import lokal: utils mengimpor modul ini
+    df = load_test_results(args.csv)
+    sketch = build_run_sketch(df, df['timestamp'].iloc[0], args.csv)
+
+    overrides = {key: value for key, value in {
+        'p95_pct': args.p95_tolerance,
+        'error_rate_pp': args.error_tolerance,
+        'throughput_pct': args.throughput_tolerance,
+        'alpha': args.alpha,
+    }.items() if value is not None}
+
+    if args.pin:
+        baseline = load_baseline(project_folder)
+        tolerances = {**(baseline['tolerances'] if baseline else DEFAULT_TOLERANCES), **overrides}
+        save_baseline(project_folder, sketch, tolerances)
+        print(f"Baseline proyek di-pin ke {sketch['run']}")
+        return 0
+
+    baseline = load_baseline(project_folder)
+    if baseline is None:
+        print(f"Proyek {os.path.basename(project_folder)} belum punya baseline (jalankan dengan --pin).", file=sys.stderr)
+        return 2
+    baseline['tolerances'].update(overrides)
+    verdict = compare_to_baseline(sketch, baseline)
+
+    if args.json:
+        print(json.dumps(verdict, indent=2))
+    else:
+        print(f"Baseline: {verdict['baseline_run']}  |  Run: {sketch['run']}")
+        if not verdict['comparable']:
+            print(f"PERINGATAN: konfigurasi berbeda dari baseline ({', '.join(verdict['config_diff'])})")
+        for check in verdict['checks']:
+            flag = "REGRESI" if check['regressed'] else "OK"
+            print(f"  [{flag:>7}] {check['name']:<22} {check['baseline']:.2f} -> {check['current']:.2f} "
+                  f"({check['change']:+.1f}{check['unit']}, toleransi {check['tolerance']:+g}{check['unit']})  {check['detail']}")
+        print(f"Verdict: {verdict['status'].upper()}")
+    return 1 if verdict['status'] == 'regression' else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+import os
+import sys
+import time
+import threading
+from collections import OrderedDict
+from .scenarios import rollup_path, target_metrics_path
+from .generator_monitor import generator_metrics_path
+
+# Cache hasil tes lintas session Streamlit (satu proses = satu cache).
+# Batas memori bisa diatur lewat env K6_DASHBOARD_CACHE_MB.
+DEFAULT_CACHE_MB = 1024
+LEASE_TTL = 30 * 60  # Referensi session yang tidak diperbarui > 30 menit dianggap sudah ditutup
+
+def estimate_nbytes(obj):
+    """Perkiraan ukuran memori objek hasil analisis (DataFrame, Series, ndarray, dict/list bersarang)."""
+    # Import lokal: sidebar memakai cache (statistik) sebelum pandas/numpy perlu dimuat
+    import numpy as np
+    import pandas as pd
+    if isinstance(obj, pd.DataFrame):
+        total = int(obj.memory_usage(index=True, deep=False).sum())
+        # Kolom object: sampling (deep=True pada jutaan string terlalu lambat)
+        for col in obj.columns[obj.dtypes == object]:
+            sample = obj[col].iloc[:1000]
+            if len(sample):
+                total += int(sum(sys.getsizeof(v) for v in sample) / len(sample) * len(obj))
+        return total
+    if isinstance(obj, pd.Series):
+        return estimate_nbytes(obj.to_frame())
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(v) for v in obj)
+    return sys.getsizeof(obj)
+
+def _file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def cache_key(path, sidecars=()):
+    """
+    Key cache = path absolut + mtime + ukuran (+ mtime/ukuran tiap sidecar), agar file yang berubah otomatis di-load ulang.
+    Elemen pertama selalu path absolut (dipakai invalidate).
+    """
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, *(_file_stamp(p) for p in sidecars))
+
+def run_cache_key(results_path, data_path=None):
+    """
+    Key bundle sebuah run: file data (CSV, atau rollup untuk mode berjendela) + sidecar yang ikut dianalisis
+    (metrik generator & metrik server target). Lampiran baru lewat CLI / proses lain langsung terlihat di dashboard.
+    """
+    return cache_key(data_path or results_path, (generator_metrics_path(results_path), target_metrics_path(results_path)))
+
+def invalidate_run(results_path):
+    """Buang bundle run (biasa & berjendela) dari cache bersama, mis. setelah lampiran berubah atau run dihapus."""
+    cache = get_result_cache()
+    cache.invalidate(results_path)
+    cache.invalidate(rollup_path(results_path))
+
+class _Entry:
+    __slots__ = ('value', 'nbytes', 'holders')
+
+    def __init__(self, value, nbytes):
+        self.value = value
+        self.nbytes = nbytes
+        self.holders = {}  # holder_id -> waktu terakhir acquire
+
+class _InFlight:
+    __slots__ = ('event', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.error = None
+
+class ResultCache:
+    """
+    Cache LRU thread-safe dengan batas byte, reference counting per session, dan single-flight loading
+    (request bersamaan untuk run yang sama hanya memicu satu kali parse).
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def acquire(self, key, loader, holder):
+        """Ambil value untuk key (load via loader() jika belum ada) dan catat holder sebagai pemakai."""
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    entry.holders[holder] = time.time()
+                    return entry.value
+
+                inflight = self._inflight.get(key)
+                if inflight is None:
+                    inflight = self._inflight[key] = _InFlight()
+                    self.misses += 1
+                    break
+                self.coalesced += 1
+
+            # Session lain sedang load run yang sama -> tunggu hasilnya, jangan parse ulang
+            inflight.event.wait()
+            if inflight.error is not None:
+                raise inflight.error
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                inflight.error = e
+                del self._inflight[key]
+            inflight.event.set()
+            raise
+
+        entry = _Entry(value, estimate_nbytes(value))
+        entry.holders[holder] = time.time()
+        with self._lock:
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            del self._inflight[key]
+            self._evict()
+        inflight.event.set()
+        return value
+
+    def release(self, key, holder):
+        """Lepas referensi holder; entry boleh di-evict jika tidak ada holder lain."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.holders.pop(holder, None)
+            self._evict()
+
+    def invalidate(self, path):
+        """Buang semua versi cache untuk sebuah file (misal setelah file dihapus)."""
+        abspath = os.path.abspath(path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == abspath]:
+                self._bytes -= self._entries.pop(key).nbytes
+
+    def _is_pinned(self, entry, now):
+        return any(now - seen < LEASE_TTL for seen in entry.holders.values())
+
+    def _evict(self):
+        """Evict LRU entry yang tidak sedang dipakai sampai total byte di bawah batas (dipanggil dengan lock)."""
+        if self._bytes <= self.max_bytes:
+            return
+        now = time.time()
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if self._is_pinned(entry, now):
+                continue
+            del self._entries[key]
+            self._bytes -= entry.nbytes
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            now = time.time()
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'pinned': sum(1 for e in self._entries.values() if self._is_pinned(e, now)),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+            }
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_result_cache():
+    """Singleton cache untuk seluruh proses (dipakai bersama oleh semua session)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_mb = float(os.environ.get("K6_DASHBOARD_CACHE_MB", DEFAULT_CACHE_MB))
+            _cache = ResultCache(int(max_mb * 1024 * 1024))
+        return _cache
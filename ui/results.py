@@ -1,11 +1,31 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import altair as alt
 import os
 from datetime import datetime
-from .utils import get_metric_summary, explain_metric, get_breaking_point_analysis
+from .utils import explain_metric, build_run_bundle, slice_time_window, get_window_aggregates, find_check_breaches, ERROR_CLASS_HINTS, CHECK_MIN_PASS_RATE, CHECK_WINDOW_S
+from .generator_monitor import GEN_CPU_LIMIT
+from .result_cache import get_result_cache, run_cache_key, invalidate_run
+from .session import session_holder_id
+from .regression import load_baseline, save_baseline, update_tolerances, clear_baseline, compare_to_baseline
+from .rollups import build_rollups, build_soak_bundle, is_windowed_run, is_rollup_writer_active, rollup_path, ROLLUP_WINDOW_S
+from .scenarios import load_run_metadata, target_metrics_path
+from .target_metrics import attach_target_metrics, remove_target_metrics, describe_resource, CORR_MIN_WINDOWS
 
-def generate_pdf_report(target_url, filename, stats, failure_rate, total_reqs, failed_reqs, diagnosis):
+# Rekomendasi PDF (bahasa Inggris, mengikuti isi laporan) per kelas error
+PDF_ERROR_CLASS_HINTS = {
+    'Timeout': 'Requests hit the 5s timeout. Profile slow endpoints and worker/queue capacity.',
+    'Connection Refused': 'Server refused new connections. Check max connections and listen backlog.',
+    'Connection Reset': 'Connections were reset. Check keep-alive/idle timeouts and worker crashes.',
+    'DNS Error': 'DNS resolution failed. Check resolver capacity.',
+    'TLS Error': 'TLS handshakes failed. Check certificates and load balancer handshake limits.',
+    'Rate Limited (429)': 'Requests were rate limited (429). Whitelist the load generator or lower the load.',
+    'HTTP 5xx': 'Server returned 5xx. Check application logs and downstream dependencies.',
+    'HTTP 4xx': 'Requests were rejected (4xx). Check payload, auth token and expected status.',
+}
+
+def generate_pdf_report(target_url, filename, stats, failure_rate, total_reqs, failed_reqs, diagnosis, checks=None, check_level=CHECK_MIN_PASS_RATE, regression=None, drift=None, target=None):
     """Generate PDF report using fpdf2"""
     try:
         from fpdf import FPDF
@@ -77,6 +97,51 @@ def generate_pdf_report(target_url, filename, stats, failure_rate, total_reqs, f
         pdf.cell(0, 6, latency_verdict, ln=True)
         pdf.ln(4)
         
+        # Regression Gate (vs pinned project baseline, always the full run)
+        if regression is not None:
+            pdf.set_font('Helvetica', 'B', 11)
+            pdf.cell(0, 8, f'Regression Gate (baseline: {regression["baseline_run"]})', ln=True, fill=True)
+            pdf.set_font('Helvetica', 'B', 9)
+            if regression['status'] == 'regression':
+                pdf.set_text_color(200, 0, 0)
+                pdf.cell(0, 6, 'RESULT: REGRESSION - ' + ', '.join(c['name'] for c in regression['checks'] if c['regressed']), ln=True)
+            else:
+                pdf.set_text_color(0, 150, 0)
+                pdf.cell(0, 6, 'RESULT: PASS - no significant regression against the baseline.', ln=True)
+            pdf.set_text_color(0, 0, 0)
+            pdf.set_font('Helvetica', '', 9)
+            for c in regression['checks']:
+                state = 'REGRESSED' if c['regressed'] else 'ok'
+                pdf.cell(0, 5, f'- {c["name"]}: {c["baseline"]:.2f} -> {c["current"]:.2f} ({c["change"]:+.1f}{c["unit"]}, tolerance {c["tolerance"]:+g}{c["unit"]}, p={c["p_value"]:.2g}) {state}', ln=True)
+            if not regression['comparable']:
+                pdf.cell(0, 5, f'Note: test configuration differs from the baseline ({", ".join(regression["config_diff"])}).', ln=True)
+            pdf.ln(4)
+        
+        # Long-run drift (soak / windowed analysis)
+        if drift is not None:
+            pdf.set_font('Helvetica', 'B', 11)
+            pdf.cell(0, 8, f'Long-Run Drift (steady phase {drift["steady_start_s"] / 3600:.1f}-{drift["steady_end_s"] / 3600:.1f} h)', ln=True, fill=True)
+            pdf.set_font('Helvetica', '', 9)
+            for series in drift['series'].values():
+                state = 'DEGRADING' if series['degrading'] else 'stable'
+                pdf.cell(0, 5, f'- {series["label"]}: {series["start"]:.2f} -> {series["end"]:.2f} ({series["slope_per_hour"]:+.3f}/h, Mann-Kendall p={series["p_value"]:.2g}) {state}', ln=True)
+            if drift['p95_threshold_eta_h'] is not None:
+                pdf.cell(0, 5, f'At the current trend P95 crosses the threshold in ~{drift["p95_threshold_eta_h"]:.1f} h.', ln=True)
+            pdf.ln(4)
+        
+        # Checks (SLO)
+        if checks is not None:
+            pdf.set_font('Helvetica', 'B', 11)
+            pdf.cell(0, 8, f'Checks (Pass Rate, threshold {check_level:g}%)', ln=True, fill=True)
+            pdf.set_font('Helvetica', '', 9)
+            breaches = find_check_breaches(checks['timeline'], check_level)
+            for name, row in checks['summary'].iterrows():
+                line = f'{name}: {row["Pass Rate (%)"]:.2f}% ({int(row["Lulus"]):,}/{int(row["Total"]):,})'
+                if name in breaches.index:
+                    line += f' - first below threshold at {int(breaches.loc[name, "Mulai Detik"])}s ({breaches.loc[name, "Pass Rate (%)"]:.1f}%)'
+                pdf.cell(0, 6, line, ln=True)
+            pdf.ln(4)
+        
         # Forensic Analysis
         if diagnosis:
             pdf.set_font('Helvetica', 'B', 11)
@@ -102,6 +167,78 @@ def generate_pdf_report(target_url, filename, stats, failure_rate, total_reqs, f
                 pdf.cell(0, 6, f'Baseline P95: {diagnosis["stable_latency"]:.0f} ms', ln=True)
                 pdf.cell(0, 6, f'Degraded P95: {diagnosis["degraded_latency"]:.0f} ms', ln=True)
                 pdf.cell(0, 6, f'Failure Pattern: {pattern_text}', ln=True)
+                if diagnosis.get('error_class'):
+                    pdf.cell(0, 6, f'Error Class at Break: {diagnosis["error_class"]} ({diagnosis["error_class_share"]:.0f}% of errors)', ln=True)
+                if diagnosis['break_confidence'] is not None:
+                    pdf.cell(0, 6, f'Break Confidence: {diagnosis["break_confidence"]:.0%}', ln=True)
+                if diagnosis['saturation_confidence'] is not None:
+                    pdf.cell(0, 6, f'Saturation Confidence: {diagnosis["saturation_confidence"]:.0%}', ln=True)
+            
+            if diagnosis.get('throughput_knee_vus'):
+                pdf.cell(0, 6, f'Throughput Knee: RPS per user drops beyond ~{diagnosis["throughput_knee_vus"]} VUs', ln=True)
+            
+            # Change-points (maks 8 baris agar laporan tetap ringkas)
+            if diagnosis.get('change_points'):
+                pdf.ln(2)
+                pdf.set_font('Helvetica', 'B', 9)
+                pdf.cell(0, 6, 'Detected Change-Points (PELT + CUSUM):', ln=True)
+                pdf.set_font('Helvetica', '', 9)
+                for cp in diagnosis['change_points'][:8]:
+                    arrow = 'up' if cp['direction'] == 'up' else 'down'
+                    pdf.cell(0, 5, f'- {cp["rel_time"]}s @ {cp["vus"]} VUs: {cp["series"]} {arrow} {cp["before"]:.2f} -> {cp["after"]:.2f} (conf {cp["confidence"]:.0%})', ln=True)
+        
+        # Capacity Model (Universal Scalability Law)
+        capacity = diagnosis.get('capacity') if diagnosis else None
+        if capacity:
+            pdf.ln(2)
+            pdf.set_font('Helvetica', 'B', 9)
+            pdf.cell(0, 6, 'Capacity Model (Universal Scalability Law):', ln=True)
+            pdf.set_font('Helvetica', '', 9)
+            pdf.cell(0, 5, f'lambda: {capacity["lambda"]:.2f} RPS/user | sigma (contention): {capacity["sigma"]:.4f} | kappa (coherency): {capacity["kappa"]:.6f} | R2: {capacity["r2"]:.2f}', ln=True)
+            if capacity['peak_vus']:
+                extrapolated = f' (extrapolated beyond {capacity["max_tested_vus"]} tested VUs)' if capacity['extrapolated'] else ''
+                pdf.cell(0, 5, f'Predicted Peak Throughput: ~{capacity["peak_rps"]:.0f} RPS at ~{capacity["peak_vus"]} VUs{extrapolated}', ln=True)
+            elif capacity['asymptote_rps']:
+                pdf.cell(0, 5, f'No peak: throughput approaches ~{capacity["asymptote_rps"]:.0f} RPS (contention only).', ln=True)
+            else:
+                pdf.cell(0, 5, f'Linear scaling up to {capacity["max_tested_vus"]} VUs (no contention detected).', ln=True)
+            if not capacity['reliable']:
+                pdf.cell(0, 5, 'Fit quality is low (R2 < 0.8); treat the prediction as indicative only.', ln=True)
+            if capacity['littles_law']:
+                state = 'consistent' if capacity['littles_law']['consistent'] else 'INCONSISTENT'
+                pdf.cell(0, 5, f"Little's Law check: {state} (median deviation {capacity['littles_law']['median_error']:.0%})", ln=True)
+        
+        # Load Generator Health
+        generator = diagnosis.get('generator') if diagnosis else None
+        if generator:
+            pdf.ln(2)
+            pdf.set_font('Helvetica', 'B', 9)
+            pdf.cell(0, 6, 'Load Generator (k6) Health:', ln=True)
+            pdf.set_font('Helvetica', '', 9)
+            pdf.cell(0, 5, f'Max CPU: {generator["max_cpu_util"]:.0%} | Max RSS: {generator["max_rss_mb"]:.0f} MB | Max Sockets: {generator["max_sockets"]}', ln=True)
+            if generator['saturated']:
+                pdf.set_text_color(200, 0, 0)
+                pdf.cell(0, 5, f'WARNING: Generator saturated for ~{generator["saturated_seconds"]:.0f}s. Results may reflect k6 limits, not the target.', ln=True)
+                pdf.set_text_color(0, 0, 0)
+        
+        # Target (server) resources, dari metrik yang dilampirkan
+        if target and target['resources']:
+            pdf.ln(2)
+            pdf.set_font('Helvetica', 'B', 9)
+            pdf.cell(0, 6, f'Target Resources (attached server metrics, {target["window_s"]}s windows):', ln=True)
+            pdf.set_font('Helvetica', '', 9)
+            first = target['first_saturated']
+            if first:
+                pdf.set_text_color(200, 0, 0)
+                pdf.cell(0, 5, f'First saturated: {first["name"]} at {first["saturated_at_s"]}s', ln=True)
+                pdf.set_text_color(0, 0, 0)
+            else:
+                pdf.cell(0, 5, 'No correlated resource saturated during the test.', ln=True)
+            for entry in target['resources'][:8]:
+                corr = ', '.join(f'r={entry[key]["r"]:+.2f} vs {label} (lag {entry[key]["lag_s"]}s)'
+                                 for key, label in (('p95', 'P95'), ('error_rate', 'errors')) if entry[key])
+                saturated = f'saturated at {entry["saturated_at_s"]}s' if entry['saturated_at_s'] is not None else 'not saturated'
+                pdf.cell(0, 5, f'- {entry["name"][:48]}: {saturated}; {corr or "n/a"}{" [related]" if entry["related"] else ""}', ln=True)
         
         pdf.ln(4)
         
@@ -116,10 +253,24 @@ def generate_pdf_report(target_url, filename, stats, failure_rate, total_reqs, f
             pdf.cell(0, 6, '- Profile database queries for optimization.', ln=True)
             pdf.cell(0, 6, '- Consider implementing caching strategies.', ln=True)
         if diagnosis and diagnosis['status'] == 'broken':
-            if diagnosis['pattern'] == 'degradasi_bertahap':
-                pdf.cell(0, 6, '- Check for memory leaks or connection pool issues.', ln=True)
+            if diagnosis.get('error_class'):
+                pdf.cell(0, 6, f'- {PDF_ERROR_CLASS_HINTS.get(diagnosis["error_class"], "Check server error logs.")}', ln=True)
+            elif diagnosis['pattern'] == 'degradasi_bertahap':
+                if not (target and target['first_saturated']):
+                    pdf.cell(0, 6, '- Check for memory leaks or connection pool issues.', ln=True)
             else:
                 pdf.cell(0, 6, '- Check rate limiting and max connections config.', ln=True)
+            if target and target['first_saturated']:
+                pdf.cell(0, 6, f'- Start with {target["first_saturated"]["name"][:60]}: it saturated first.', ln=True)
+        if generator and generator['saturated']:
+            pdf.cell(0, 6, '- Re-run with fewer VUs per k6 instance or a larger load generator.', ln=True)
+        if drift and drift['degrading']:
+            if target and target['first_saturated']:
+                pdf.cell(0, 6, f'- Slow degradation under constant load: {target["first_saturated"]["name"][:60]} saturated first.', ln=True)
+            else:
+                pdf.cell(0, 6, '- Slow degradation under constant load: check for memory/handle leaks and growing caches or tables.', ln=True)
+        if capacity and capacity['peak_vus'] and capacity['reliable']:
+            pdf.cell(0, 6, f'- Keep concurrency below ~{capacity["peak_vus"]} users; beyond it the model predicts throughput will drop.', ln=True)
         if failure_rate == 0 and stats['p95'] < 500:
             pdf.cell(0, 6, '- System performs well. Continue monitoring.', ln=True)
         
@@ -129,44 +280,439 @@ def generate_pdf_report(target_url, filename, stats, failure_rate, total_reqs, f
         print(f"PDF generation error: {e}")
         return None
 
+def _acquire_session_bundle(key, loader):
+    """
+    Ambil bundle dari cache bersama. Session ini tercatat sebagai pemakai (refcount)
+    sehingga run yang sedang dibuka tidak di-evict; bundle yang sebelumnya dipegang session ini dilepas.
+    Dipakai halaman hasil biasa & berjendela agar pin/release selalu sama.
+    """
+    holder = session_holder_id()
+    cache = get_result_cache()
+    
+    prev_key = st.session_state.get('cache_key_held')
+    if prev_key and prev_key != key:
+        cache.release(prev_key, holder)
+    
+    bundle = cache.acquire(key, loader, holder)
+    st.session_state.cache_key_held = key
+    return bundle
+
+def acquire_run_bundle(path):
+    """Bundle run (CSV di-load penuh) dari cache bersama."""
+    return _acquire_session_bundle(run_cache_key(path), lambda: build_run_bundle(path))
+
+def render_time_window(bundle, path):
+    """
+    Pemilih jendela waktu (preset stage, brush pada grafik, atau slider).
+    Return: (view, window) - agregat untuk jendela terpilih (bundle jika seluruh tes) dan (start_s, end_s) atau None.
+    """
+    duration_s = bundle['duration_s']
+    presets = {label: (start_s, end_s) for label, start_s, end_s in bundle['stage_presets']}
+    
+    # Reset zoom saat run yang dibuka berganti
+    if st.session_state.get('zoom_run') != path or 'zoom_range' not in st.session_state:
+        st.session_state.zoom_run = path
+        st.session_state.zoom_range = (0, duration_s)
+        st.session_state.zoom_preset = next(iter(presets))
+    
+    def apply_preset():
+        st.session_state.zoom_range = presets[st.session_state.zoom_preset]
+    
+    def apply_brush():
+        selection = st.session_state.zoom_brush.selection.get('brush') or {}
+        if 'detik' in selection:
+            start_s, end_s = selection['detik']
+            st.session_state.zoom_range = (max(0, int(start_s)), min(duration_s, int(np.ceil(end_s))))
+    
+    with st.expander("🔎 Zoom Jendela Waktu", expanded=st.session_state.zoom_range != (0, duration_s)):
+        st.caption("Pilih stage, tarik (brush) area pada grafik, atau geser slider. Ringkasan, persentil, breakdown latency, "
+                   "analisis error, dan grafik dihitung ulang hanya untuk jendela ini. Diagnostik breaking point tetap untuk seluruh tes.")
+        st.selectbox("Preset Stage", list(presets), key='zoom_preset', on_change=apply_preset)
+        
+        rps_df = bundle['rps_df']
+        if not rps_df.empty:
+            brush_df = pd.DataFrame({
+                'detik': (rps_df['timestamp'] - bundle['run_start']).dt.total_seconds(),
+                'RPS': rps_df['RPS'],
+            })
+            brush = alt.selection_interval(encodings=['x'], name='brush')
+            st.altair_chart(alt.Chart(brush_df).mark_area(color='#0E61FE', opacity=0.5).encode(
+                x=alt.X('detik:Q', title='Detik ke-'),
+                y=alt.Y('RPS:Q', title='RPS'),
+            ).add_params(brush).properties(height=120), use_container_width=True,
+                key='zoom_brush', on_select=apply_brush, selection_mode='brush')
+        
+        st.slider("Rentang (detik)", 0, max(duration_s, 1), key='zoom_range')
+    
+    start_s, end_s = st.session_state.zoom_range
+    if (start_s, end_s) == (0, duration_s) or end_s <= start_s:
+        return bundle, None
+    
+    # Agregat jendela dihitung sekali per rentang (per session); potongan data via binary search di df terurut
+    cached = st.session_state.get('zoom_view')
+    if cached and cached[0] == (path, start_s, end_s):
+        return cached[1], (start_s, end_s)
+    run_start = bundle['run_start']
+    window_df = slice_time_window(bundle['df'], run_start + pd.Timedelta(seconds=start_s), run_start + pd.Timedelta(seconds=end_s))
+    view = get_window_aggregates(window_df, run_start)
+    st.session_state.zoom_view = ((path, start_s, end_s), view)
+    return view, (start_s, end_s)
+
+def render_regression_gate(bundle, path):
+    """
+    Regression gate: bandingkan run ini (seluruh tes) dengan baseline yang di-pin untuk proyeknya.
+    Return: verdict dari compare_to_baseline() atau None jika belum ada baseline / run ini baseline-nya.
+    """
+    project_folder = os.path.dirname(path)
+    sketch = bundle['sketch']
+    baseline = load_baseline(project_folder)
+    is_baseline = baseline is not None and baseline['run'] == sketch['run']
+    verdict = compare_to_baseline(sketch, baseline) if baseline and not is_baseline else None
+
+    if verdict is None:
+        title = "🧪 Regression Gate: run ini adalah baseline proyek" if is_baseline else "🧪 Regression Gate: belum ada baseline"
+    else:
+        title = "🧪 Regression Gate: ❌ REGRESI" if verdict['status'] == 'regression' else "🧪 Regression Gate: ✅ LULUS"
+
+    with st.expander(title, expanded=verdict is not None and verdict['status'] == 'regression'):
+        if baseline is None:
+            st.caption("Pin satu run sebagai baseline proyek. Setiap run berikutnya otomatis dibandingkan: apakah P95, "
+                       "error rate, atau throughput per jendela mengalami regresi (uji statistik + toleransi).")
+        elif verdict is not None:
+            card = 'analysis-card' if verdict['status'] == 'regression' else 'stable-card'
+            reasons = [c['name'] for c in verdict['checks'] if c['regressed']]
+            headline = (f"❌ Regresi pada: {', '.join(reasons)}" if reasons
+                        else "✅ Tidak ada regresi signifikan dibanding baseline")
+            st.markdown(f"""
+            <div class="{card}">
+                <h4>{headline}</h4>
+                <p>Baseline: <strong>{verdict['baseline_run']}</strong> (di-pin {datetime.fromtimestamp(baseline['pinned_at']).strftime('%d %b %Y %H:%M')}).
+                Regresi = perubahan melewati toleransi <em>dan</em> signifikan secara statistik (p &lt; {baseline['tolerances']['alpha']:g}).</p>
+            </div>
+            """, unsafe_allow_html=True)
+            if not verdict['comparable']:
+                st.warning(f"⚠️ Konfigurasi tes berbeda dari baseline ({', '.join(verdict['config_diff'])}). Perbandingan mungkin tidak apple-to-apple.")
+            st.dataframe(pd.DataFrame([{
+                'Metrik': c['name'],
+                'Baseline': round(c['baseline'], 2),
+                'Run Ini': round(c['current'], 2),
+                'Perubahan': f"{c['change']:+.1f}{c['unit']}",
+                'Toleransi': f"{c['tolerance']:+g}{c['unit']}",
+                'p-value': f"{c['p_value']:.2g}",
+                'Status': "❌ Regresi" if c['regressed'] else "✅ OK",
+                'Detail': c['detail'],
+            } for c in verdict['checks']]), use_container_width=True, hide_index=True)
+
+        col_pin, col_tol = st.columns(2)
+        if not is_baseline and col_pin.button("📌 Jadikan Baseline Proyek", use_container_width=True,
+                                              help="Ganti baseline proyek dengan run ini. Toleransi yang sudah diatur tetap dipakai."):
+            save_baseline(project_folder, sketch)
+            st.rerun()
+        if is_baseline and col_pin.button("📍 Lepas Baseline", use_container_width=True,
+                                          help="Hapus baseline proyek. Run lain tidak dibandingkan sampai baseline baru di-pin."):
+            clear_baseline(project_folder)
+            st.rerun()
+        if baseline is not None:
+            with col_tol.popover("⚙️ Toleransi", use_container_width=True):
+                with st.form("regression_tolerances"):
+                    tol = baseline['tolerances']
+                    p95_pct = st.number_input("Kenaikan P95 maks (%)", 0.0, 1000.0, float(tol['p95_pct']), step=1.0)
+                    error_rate_pp = st.number_input("Kenaikan error rate maks (poin %)", 0.0, 100.0, float(tol['error_rate_pp']), step=0.5)
+                    throughput_pct = st.number_input("Penurunan throughput maks (%)", 0.0, 100.0, float(tol['throughput_pct']), step=1.0)
+                    alpha = st.number_input("Alpha (p-value)", 0.0001, 0.5, float(tol['alpha']), step=0.005, format="%.4f")
+                    if st.form_submit_button("Simpan", use_container_width=True):
+                        update_tolerances(project_folder, {'p95_pct': p95_pct, 'error_rate_pp': error_rate_pp,
+                                                           'throughput_pct': throughput_pct, 'alpha': alpha})
+                        st.rerun()
+    return verdict
+
+def format_offset(seconds, hours=False):
+    """Offset dari awal tes untuk teks UI: 'detik ke-105' atau 'jam ke-2.7' (run berjendela)."""
+    return f"jam ke-{seconds / 3600:.1f}" if hours else f"detik ke-{seconds:.0f}"
+
+def resource_card_html(target, hours=False):
+    """Bagian kartu diagnosis: resource server yang jenuh pertama (dari metrik target terlampir)."""
+    if not target:
+        return ""
+    first = target['first_saturated']
+    if first:
+        timing = ""
+        if target['leads_symptom'] is not None and target['symptom_s'] is not None:
+            gap = target['symptom_s'] - first['saturated_at_s']
+            if abs(gap) < target['window_s']:
+                timing = ", bersamaan dengan gejala pertama (jendela yang sama)"
+            elif target['leads_symptom']:
+                timing = f", <strong>{gap:.0f} detik sebelum</strong> gejala pertama"
+            else:
+                timing = f", {-gap:.0f} detik setelah gejala pertama (kemungkinan akibat, bukan penyebab)"
+        return (f"<hr><h5>🖥️ Resource Jenuh Pertama: {first['name']}</h5>"
+                f"<p><em>Jenuh di {format_offset(first['saturated_at_s'], hours)}{timing}. {describe_resource(first)}.</em></p>")
+    strongest = target['strongest']
+    if strongest:
+        return (f"<hr><h5>🖥️ Tidak Ada Resource yang Jenuh</h5><p><em>Paling berkorelasi: {strongest['name']} "
+                f"({describe_resource(strongest)}). Bottleneck kemungkinan di luar metrik yang dilampirkan.</em></p>")
+    return ""
+
+def render_target_metrics(path, target, hours=False):
+    """
+    Lampiran metrik server (CPU, memori, koneksi DB, ...) untuk run ini: upload, tabel korelasi ber-lag
+    terhadap P95 & error rate, dan grafik resource vs P95 yang sudah disejajarkan per jendela.
+    """
+    st.markdown("### 🖥️ Metrik Server (Target)")
+    attached = os.path.exists(target_metrics_path(path))
+    with st.expander("📎 Lampirkan / Ganti Metrik Server" if attached else "📎 Lampirkan Metrik Server", expanded=False):
+        st.caption("Export dari sistem yang dites: CSV / NDJSON (kolom `timestamp` + satu kolom per metrik, atau `timestamp,metric,value`) "
+                   "atau file scrape Prometheus (timestamp ms per sampel, atau baris `# scrape <unix>` sebelum tiap scrape). "
+                   "Counter `*_total` otomatis diubah menjadi rate per detik. Jam server harus sinkron dengan mesin k6.")
+        upload = st.file_uploader("File metrik", type=['csv', 'ndjson', 'jsonl', 'json', 'prom', 'metrics', 'txt'],
+                                  key=f"target_upload_{path}")
+        col_attach, col_remove = st.columns(2)
+        if col_attach.button("📎 Lampirkan", disabled=upload is None, use_container_width=True, key=f"target_attach_{path}"):
+            try:
+                frame = attach_target_metrics(path, upload.getvalue(), upload.name)
+            except ValueError as e:
+                st.error(f"Gagal membaca metrik: {e}")
+            else:
+                invalidate_run(path)
+                st.toast(f"{frame.shape[1] - 1} series metrik server dilampirkan.", icon="📎")
+                st.rerun()
+        if attached and col_remove.button("🗑️ Hapus Lampiran", use_container_width=True, key=f"target_remove_{path}"):
+            remove_target_metrics(path)
+            invalidate_run(path)
+            st.rerun()
+
+    if target is None:
+        st.caption("Belum ada metrik server untuk run ini. Tanpa data server, penyebab degradasi di diagnosis hanya dugaan.")
+        return
+    if target['overlap_windows'] < CORR_MIN_WINDOWS:
+        st.warning(f"Timestamp metrik server hanya beririsan {target['overlap_windows']} jendela dengan run ini "
+                   f"(butuh minimal {CORR_MIN_WINDOWS}). Cek zona waktu / jam server, atau export untuk rentang waktu tes.")
+        return
+
+    first = target['first_saturated']
+    if first:
+        st.error(f"🖥️ **Resource jenuh pertama:** `{first['name']}` di {format_offset(first['saturated_at_s'], hours)} - {describe_resource(first)}.")
+    elif target['strongest']:
+        st.info(f"Tidak ada resource terlampir yang jenuh. Paling berkorelasi: `{target['strongest']['name']}` - {describe_resource(target['strongest'])}.")
+    else:
+        st.success("Tidak ada resource terlampir yang berkorelasi signifikan dengan P95 maupun error rate.")
+
+    def corr_cell(corr):
+        return f"{corr['r']:+.2f} (lag {corr['lag_s']}s)" if corr else "-"
+
+    st.dataframe(pd.DataFrame([{
+        'Resource': entry['name'],
+        'Jenis': 'Utilisasi' if entry['kind'] == 'utilization' else 'Level',
+        'Puncak': round(entry['peak'], 3),
+        'Jenuh di Detik': entry['saturated_at_s'],
+        'Korelasi P95': corr_cell(entry['p95']),
+        'Korelasi Error': corr_cell(entry['error_rate']),
+        'Terkait': "⚠️ Ya" if entry['related'] else "-",
+    } for entry in target['resources']]), use_container_width=True, hide_index=True)
+    st.caption(f"Jendela {target['window_s']} detik. Korelasi Pearson resource[t] vs gejala[t + lag] (resource mendahului gejala), "
+               "lag terkuat dipilih; 'Terkait' = signifikan (p < 0.01, koreksi Bonferroni) dan searah. "
+               "Jenuh = utilisasi >= 90%, atau metrik level yang mentok di puncaknya saat VUs masih naik.")
+
+    # Grafik: resource terkait (dinormalisasi 0-1) vs P95 pada sumbu waktu yang sama
+    shown = [e['name'] for e in target['resources'] if e['related']][:5] or [e['name'] for e in target['resources']][:3]
+    aligned = target['aligned']
+    x_title = 'Jam ke-' if hours else 'Detik ke-'
+    frame = pd.DataFrame({'x': aligned['start_s'] / 3600 if hours else aligned['start_s']})
+    for column in ['p95'] + shown:
+        series = aligned[column]
+        span = series.max() - series.min()
+        frame['P95 k6' if column == 'p95' else column] = (series - series.min()) / span if span else 0.0
+    long = frame.melt(id_vars='x', var_name='Series', value_name='Relatif').dropna()
+    st.altair_chart(alt.Chart(long).mark_line().encode(
+        x=alt.X('x:Q', title=x_title),
+        y=alt.Y('Relatif:Q', title='Nilai relatif (min-max)'),
+        color=alt.Color('Series:N'),
+        strokeDash=alt.condition(alt.datum.Series == 'P95 k6', alt.value([6, 4]), alt.value([1, 0])),
+        tooltip=[alt.Tooltip('x:Q', title=x_title), 'Series:N', alt.Tooltip('Relatif:Q', format='.2f')],
+    ).properties(height=280), use_container_width=True)
+    st.caption("Garis putus-putus = P95 k6. Resource yang naik / mentok sebelum P95 naik adalah kandidat bottleneck.")
+
+def acquire_soak_bundle(path):
+    """
+    Bundle mode berjendela dari cache bersama. Key = file rollup, jadi otomatis di-load ulang jika rollup berubah.
+    Rollup dibangun sekali dari CSV (per chunk) jika run belum punya sidecar; soak yang masih berjalan menunggu writer-nya.
+    """
+    if not os.path.exists(rollup_path(path)):
+        if is_rollup_writer_active(path):
+            return None
+        with st.spinner("Membangun agregat per menit dari CSV (sekali saja)..."):
+            if not build_rollups(path):
+                return None
+    return _acquire_session_bundle(run_cache_key(path, rollup_path(path)), lambda: build_soak_bundle(path))
+
+def render_soak_results(path):
+    """
+    Halaman hasil mode berjendela (soak / CSV sangat besar): semua dari rollup per menit,
+    sehingga memori & waktu render tetap konstan berapapun durasi run.
+    """
+    bundle = acquire_soak_bundle(path)
+    filename = os.path.basename(path)
+    metadata = load_run_metadata(path) or {}
+    st.info(f"📂 **File:** `{filename}`  |  🔗 **Target:** `{metadata.get('target_url', 'Unknown Target')}`")
+    if bundle is None and is_rollup_writer_active(path):
+        st.info("⏳ Tes masih berjalan, menunggu agregat per menit pertama (~2 menit). Muat ulang halaman sebentar lagi.")
+        return
+    if bundle is None or bundle['stats'] is None:
+        st.warning("Run ini belum memiliki request yang tercatat.")
+        return
+
+    rollups = bundle['rollups']
+    drift = bundle['drift']
+    hours = (rollups['start_s'].iloc[-1] + ROLLUP_WINDOW_S) / 3600
+    st.caption(f"🕰️ Mode analisis berjendela: {len(rollups):,} agregat per {ROLLUP_WINDOW_S // 60} menit (~{hours:.1f} jam). "
+               "CSV mentah tidak di-load ke memori; persentil dihitung dari histogram per menit.")
+
+    col_d1, col_d2, col_d3 = st.columns([0.70, 0.15, 0.15])
+    with col_d2:
+        with open(rollup_path(path), "rb") as file:
+            st.download_button("📥 Rollup", data=file, file_name=os.path.basename(rollup_path(path)),
+                               mime="application/x-ndjson", use_container_width=True,
+                               help="Agregat per menit (NDJSON). CSV mentah run panjang tersedia di folder results/.")
+    with col_d3:
+        pdf_data = generate_pdf_report(metadata.get('target_url', 'Unknown Target'), filename, bundle['stats'], bundle['failure_rate'],
+                                       bundle['total_reqs'], bundle['failed_reqs'], None, drift=drift, target=bundle['target'])
+        if pdf_data:
+            st.download_button("📄 PDF", data=pdf_data, file_name=f"report_{filename.replace('.csv', '')}.pdf",
+                               mime="application/pdf", use_container_width=True)
+
+    stats = bundle['stats']
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("Total Request", f"{bundle['total_reqs']:,}")
+    c2.metric("Durasi", f"{hours:.1f} jam")
+    c3.metric("Rata-rata Waktu (Avg)", f"{stats['avg']:.1f} ms")
+    c4.metric("P95 (Mayoritas User)", f"{stats['p95']:.1f} ms")
+    c5.metric("Error Rate", f"{bundle['failure_rate']:.2f}%")
+
+    # --- Drift jangka panjang ---
+    st.subheader("📉 Tren Jangka Panjang (Drift)")
+    if drift is None:
+        st.caption("Fase stabil terlalu pendek untuk analisis drift (butuh minimal 10 menit pada VUs puncak).")
+    else:
+        card = 'analysis-card' if drift['degrading'] else 'stable-card'
+        headline = (f"⚠️ Degradasi perlahan terdeteksi: {', '.join(drift['degrading'])}" if drift['degrading']
+                    else "✅ Tidak ada degradasi signifikan selama fase stabil")
+        eta = ""
+        if drift['p95_threshold_eta_h'] is not None:
+            eta = f"<p>📈 Jika tren berlanjut, P95 melewati threshold <strong>{metadata.get('threshold_p95')} ms</strong> dalam ~<strong>{drift['p95_threshold_eta_h']:.1f} jam</strong> lagi.</p>"
+        st.markdown(f"""
+        <div class="{card}">
+            <h4>{headline}</h4>
+            <p>Tren dihitung pada fase stabil ({drift['steady_start_s'] / 3600:.1f}-{drift['steady_end_s'] / 3600:.1f} jam, {drift['windows']} menit)
+            dengan slope Theil-Sen (tahan terhadap spike sesaat) dan uji tren Mann-Kendall.</p>
+            {eta}
+            {resource_card_html(bundle['target'], hours=True) if drift['degrading'] else ''}
+        </div>
+        """, unsafe_allow_html=True)
+        st.dataframe(pd.DataFrame([{
+            'Metrik': s['label'],
+            'Awal': round(s['start'], 3),
+            'Akhir': round(s['end'], 3),
+            'Perubahan': f"{s['change_pct']:+.1f}%" if s['label'] != 'Error Rate (%)' else f"{s['change']:+.2f} pp",
+            'Slope / jam': round(s['slope_per_hour'], 4),
+            'p-value': f"{s['p_value']:.2g}",
+            'Status': "⚠️ Degradasi" if s['degrading'] else "✅ Stabil",
+        } for s in drift['series'].values()]), use_container_width=True, hide_index=True)
+        if drift['degrading'] and not (bundle['target'] and bundle['target']['first_saturated']):
+            st.info("💡 Kenaikan latency / error yang konsisten pada beban konstan umumnya menandakan memory leak, "
+                    "connection/file handle yang tidak dilepas, cache atau tabel yang terus membesar, atau GC yang makin berat."
+                    + ("" if bundle['target'] else " Lampirkan metrik server (di bawah) untuk memastikan resource mana yang jenuh."))
+
+    # --- Grafik per menit ---
+    chart_df = rollups.assign(jam=rollups['start_s'] / 3600)
+    st.markdown("##### Latency per Menit")
+    latency_long = chart_df.melt(id_vars='jam', value_vars=['p50', 'p95', 'p99'], var_name='Persentil', value_name='ms')
+    layers = [alt.Chart(latency_long).mark_line().encode(
+        x=alt.X('jam:Q', title='Jam ke-'),
+        y=alt.Y('ms:Q', title='Latency (ms)'),
+        color=alt.Color('Persentil:N', sort=['p50', 'p95', 'p99']),
+        tooltip=[alt.Tooltip('jam:Q', format='.2f'), 'Persentil:N', alt.Tooltip('ms:Q', format='.1f')]
+    )]
+    if drift is not None:
+        p95_trend = drift['series']['p95']
+        trend_hours = np.array([drift['steady_start_s'], drift['steady_end_s']]) / 3600
+        layers.append(alt.Chart(pd.DataFrame({
+            'jam': trend_hours, 'ms': p95_trend['intercept'] + p95_trend['slope_per_hour'] * trend_hours,
+        })).mark_line(strokeDash=[6, 4], color='#ff4b4b').encode(x='jam:Q', y='ms:Q'))
+    st.altair_chart(alt.layer(*layers).properties(height=300), use_container_width=True)
+    st.caption("Garis putus-putus merah = tren P95 (Theil-Sen) pada fase stabil.")
+
+    col_e, col_t = st.columns(2)
+    with col_e:
+        st.markdown("##### Error Rate per Menit")
+        st.altair_chart(alt.Chart(chart_df).mark_area(color='#ff4b4b', opacity=0.6).encode(
+            x=alt.X('jam:Q', title='Jam ke-'), y=alt.Y('error_rate:Q', title='Error (%)'),
+            tooltip=[alt.Tooltip('jam:Q', format='.2f'), alt.Tooltip('error_rate:Q', format='.2f')]
+        ).properties(height=220), use_container_width=True)
+    with col_t:
+        st.markdown("##### Throughput & VUs per Menit")
+        base = alt.Chart(chart_df).encode(x=alt.X('jam:Q', title='Jam ke-'))
+        st.altair_chart(alt.layer(
+            base.mark_line(color='#0E61FE').encode(y=alt.Y('rps:Q', title='RPS')),
+            base.mark_line(color='#ffa500', strokeDash=[4, 4]).encode(y=alt.Y('vus:Q', title='VUs')),
+        ).resolve_scale(y='independent').properties(height=220), use_container_width=True)
+
+    render_target_metrics(path, bundle['target'], hours=True)
+
 def render_results():
     if st.session_state.test_success and st.session_state.test_results_path and os.path.exists(st.session_state.test_results_path):
         st.divider()
         st.header("📊 Hasil Analisis")
         
         try:
-            # Load Data
-            df = pd.read_csv(st.session_state.test_results_path)
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-
+            # Run soak / sangat besar: analisis berjendela dari rollup per menit (tanpa load CSV penuh)
+            if is_windowed_run(st.session_state.test_results_path, load_run_metadata(st.session_state.test_results_path)):
+                render_soak_results(st.session_state.test_results_path)
+                return
+            
+            # Load Data (shared cache lintas session)
+            bundle = acquire_run_bundle(st.session_state.test_results_path)
+            
             # --- METADATA HEADER (User Friendly) ---
             filename = os.path.basename(st.session_state.test_results_path)
-            
-            # Coba ambil URL dr data jika ada, atau fallback ke 'Unknown'
-            target_url_display = "Unknown Target"
-            if 'url' in df.columns:
-                # Ambil URL pertama yang tidak null/kosong
-                found_urls = df['url'].dropna().unique()
-                if len(found_urls) > 0:
-                    target_url_display = found_urls[0]
+            target_url_display = bundle['target_url']
             
             # Tampilkan Info Bar
             st.info(f"📂 **File:** `{filename}`  |  🔗 **Target:** `{target_url_display}`")
 
-            # Filter metrics
-            req_duration = df[df['metric_name'] == 'http_req_duration']
-            req_failed = df[df['metric_name'] == 'http_req_failed']
+            # Jendela waktu (zoom) - seluruh tes secara default
+            view, window = render_time_window(bundle, st.session_state.test_results_path)
+            if window and view['stats'] is None:
+                st.warning(f"Tidak ada request pada detik {window[0]}-{window[1]}. Menampilkan seluruh tes.")
+                view, window = bundle, None
+            elif window:
+                st.info(f"🔎 Menampilkan jendela **detik {window[0]}-{window[1]}** dari {bundle['duration_s']} detik.")
             
             # Basic Stats
-            total_reqs = len(req_duration)
-            failed_reqs = int(req_failed['metric_value'].sum()) if not req_failed.empty else 0
-            failure_rate = (failed_reqs / total_reqs * 100) if total_reqs > 0 else 0
+            total_reqs = view['total_reqs']
+            failed_reqs = view['failed_reqs']
+            failure_rate = view['failure_rate']
             
-            # Duration Stats
-            stats = get_metric_summary(df, 'http_req_duration')
+            # Duration Stats & Deep Analysis (dihitung sekali saat load; diagnosis selalu seluruh tes)
+            stats = view['stats']
+            diagnosis = bundle['diagnosis']
+            gen_df = bundle['gen_df']
+            generator = bundle['generator']
+            if window and gen_df is not None:
+                run_start = bundle['run_start']
+                gen_df = gen_df[(gen_df['timestamp'] >= run_start + pd.Timedelta(seconds=window[0]))
+                                & (gen_df['timestamp'] < run_start + pd.Timedelta(seconds=window[1]))]
             
-            # Deep Analysis - Pass overall stats for context
-            diagnosis = get_breaking_point_analysis(df, stats)
+            if generator and generator['saturated']:
+                st.warning(
+                    f"⚠️ **Load Generator Jenuh!** Proses k6 kehabisan resource selama ~{generator['saturated_seconds']:.0f} detik "
+                    f"(mulai detik ke-{generator['first_saturated']:.0f}, CPU maks {generator['max_cpu_util']:.0%}, RSS maks {generator['max_rss_mb']:.0f} MB). "
+                    + ("Breaking point terjadi saat generator jenuh, sehingga **bottleneck kemungkinan ada di k6, bukan sistem yang dites**. "
+                       if generator['invalidates_diagnosis'] else "")
+                    + "Kurangi VUs per instance atau jalankan k6 di mesin yang lebih besar."
+                )
+            
+            # Regression gate vs baseline proyek (selalu seluruh tes, tidak terpengaruh zoom)
+            regression = render_regression_gate(bundle, st.session_state.test_results_path)
             
             # --- ACTION BAR ---
             col_d1, col_d2, col_d3 = st.columns([0.70, 0.15, 0.15])
@@ -186,12 +732,16 @@ def render_results():
                 # Generate PDF Report
                 pdf_data = generate_pdf_report(
                     target_url_display, 
-                    filename, 
+                    filename if window is None else f"{filename} (window {window[0]}-{window[1]}s)", 
                     stats, 
                     failure_rate, 
                     total_reqs, 
                     failed_reqs, 
-                    diagnosis
+                    diagnosis,
+                    checks=view['checks'],
+                    check_level=st.session_state.get('check_min_pass_rate', CHECK_MIN_PASS_RATE),
+                    regression=regression,
+                    target=bundle['target']
                 )
                 if pdf_data:
                     st.download_button(
@@ -203,10 +753,12 @@ def render_results():
                     )
             
             # --- TAB LAYOUT ---
-            tab1, tab2, tab3, tab4, tab5 = st.tabs([
+            tab1, tab2, tab3, tab_err, tab_chk, tab4, tab5 = st.tabs([
                 "📋 Ringkasan Eksekutif", 
                 "🔍 Diagnostik AI",
                 "⏱️ Breakdown Latency", 
+                "❌ Analisis Error",
+                "✅ Checks (SLO)",
                 "📈 Grafik Performa", 
                 "📚 Penjelasan (Glosarium)"
             ])
@@ -245,12 +797,13 @@ def render_results():
                                    "Ini metrik yang lebih jujur daripada Rata-rata (Avg) karena mengabaikan data outlier yang ekstrem.")
 
                 with col_chart:
-                    # Simple Histogram using Altair
-                    if not req_duration.empty:
+                    # Simple Histogram using Altair (bin sudah dihitung di bundle)
+                    if total_reqs > 0:
                         st.markdown("##### Sebaran Waktu Respon")
-                        base = alt.Chart(req_duration).mark_bar().encode(
-                            x=alt.X("metric_value", bin=alt.Bin(maxbins=30), title="Durasi (ms)"),
-                            y='count()',
+                        base = alt.Chart(view['latency_hist']).mark_bar().encode(
+                            x=alt.X("bin_start", bin="binned", title="Durasi (ms)"),
+                            x2="bin_end",
+                            y=alt.Y('count', title='Jumlah'),
                             color=alt.value("#0E61FE")
                         ).properties(height=200)
                         st.altair_chart(base, use_container_width=True)
@@ -324,7 +877,16 @@ def render_results():
                             trend_desc = "Latency naik signifikan sebelum error muncul. Ini menunjukkan server kelebihan beban secara gradual (saturasi)."
                         else:
                             trend_text = "Kegagalan Mendadak"
-                            trend_desc = "Error muncul tiba-tiba tanpa peringatan latency tinggi sebelumnya. Kemungkinan rate limiting, connection refused, atau timeout."
+                            trend_desc = "Error muncul tiba-tiba tanpa peringatan latency tinggi sebelumnya."
+                        
+                        # Penyebab berdasarkan kelas error aktual (tag status/error_code), bukan tebakan dari pola latency
+                        cause_html = ""
+                        if diagnosis.get('error_class'):
+                            cause_html = f"""
+                            <hr>
+                            <h5>🧯 Penyebab Error: {diagnosis['error_class']}</h5>
+                            <p><em>{diagnosis['error_class_share']:.0f}% error di sekitar breaking point berasal dari kelas ini. {ERROR_CLASS_HINTS[diagnosis['error_class']]}</em></p>
+                            """
                             
                         st.markdown(f"""
                         <div class="analysis-card">
@@ -368,6 +930,7 @@ def render_results():
                             <hr>
                             <h5>📈 Pola Kejadian: {trend_text}</h5>
                             <p><em>{trend_desc}</em></p>
+                            {resource_card_html(diagnosis.get('target'))}{cause_html}
                         </div>
                         """, unsafe_allow_html=True)
                         
@@ -387,67 +950,238 @@ def render_results():
                         if diagnosis['overall_p95'] > 2000:
                             st.write("- 🐢 **Latency Sangat Tinggi (P95 > 2s):** Optimasi query database, cek N+1 problem, atau tambah caching layer.")
                         
-                        if diagnosis['pattern'] == 'degradasi_bertahap':
-                            st.write("- 📈 **Degradasi Bertahap:** Kemungkinan memory leak, connection pool exhaustion, atau CPU throttling. Monitor resource server.")
-                        else:
+                        target = diagnosis.get('target')
+                        first_saturated = target['first_saturated'] if target else None
+                        if first_saturated:
+                            st.write(f"- 🖥️ **Resource Jenuh Pertama:** `{first_saturated['name']}` (detik ke-{first_saturated['saturated_at_s']}). "
+                                     "Mulai investigasi dan scaling dari resource ini.")
+                        elif diagnosis['pattern'] == 'degradasi_bertahap':
+                            st.write("- 📈 **Degradasi Bertahap:** Kemungkinan memory leak, connection pool exhaustion, atau CPU throttling. "
+                                     + ("Tidak ada metrik server terlampir yang jenuh; periksa resource lain." if target
+                                        else "Lampirkan metrik server (🖥️ Metrik Server di bawah) untuk memastikan resource mana yang jenuh."))
+                        elif not diagnosis.get('error_class'):
                             st.write("- ⚡ **Kegagalan Mendadak:** Cek rate limiting, max connections di web server (Nginx/Apache), atau firewall rules.")
                         
+                        if diagnosis.get('error_class'):
+                            st.write(f"- 🧯 **{diagnosis['error_class']}:** {ERROR_CLASS_HINTS[diagnosis['error_class']]}")
+                        
                         if diagnosis['rps'] < 50 and diagnosis['total_errors'] > 100:
                             st.write("- 🔴 **RPS Rendah tapi Error Banyak:** Backend kemungkinan timeout atau 3rd party dependency gagal.")
                         
-                        st.write(f"- 🎯 **Kapasitas Aman:** Disarankan operasikan di bawah **{int(diagnosis['vus_at_saturation'] * 0.7)} User** untuk menjaga stabilitas.")
+                        capacity = diagnosis.get('capacity')
+                        if capacity and capacity['peak_vus'] and capacity['reliable']:
+                            st.write(f"- 🎯 **Kapasitas (Model USL):** Throughput maksimal ~**{capacity['peak_rps']:.0f} RPS** di ~**{capacity['peak_vus']} User**. "
+                                     "Menambah user setelah titik ini justru menurunkan throughput.")
+                    
+                    # --- CHANGE-POINT DETECTION ---
+                    st.markdown("### 📍 Change-Point Terdeteksi")
+                    st.caption("Titik perubahan level (PELT) pada rollup 5 detik. Confidence dihitung dengan CUSUM bootstrap.")
+                    if diagnosis['status'] == 'broken':
+                        sat_conf = f"{diagnosis['saturation_confidence']:.0%}" if diagnosis['saturation_confidence'] is not None else "-"
+                        break_conf = f"{diagnosis['break_confidence']:.0%}" if diagnosis['break_confidence'] is not None else "- (error sejak awal tes)"
+                        st.write(f"- **Confidence Saturasi:** {sat_conf}  |  **Confidence Breaking Point:** {break_conf}")
+                    if diagnosis['throughput_knee_vus']:
+                        st.write(f"- 📉 **Knee Throughput:** RPS per user mulai turun (>20%) di sekitar **{diagnosis['throughput_knee_vus']} VUs**. Menambah user setelah titik ini tidak menambah throughput secara proporsional.")
+                    
+                    if diagnosis['change_points']:
+                        knee_df = pd.DataFrame(diagnosis['change_points']).rename(columns={
+                            'series': 'Series', 'rel_time': 'Detik ke-', 'vus': 'VUs', 'before': 'Sebelum',
+                            'after': 'Sesudah', 'direction': 'Arah', 'confidence': 'Confidence'
+                        })
+                        knee_df['Arah'] = knee_df['Arah'].map({'up': '⬆️ Naik', 'down': '⬇️ Turun'})
+                        st.dataframe(knee_df.style.format({'Sebelum': "{:.2f}", 'Sesudah': "{:.2f}", 'Confidence': "{:.0%}"}),
+                                     use_container_width=True, hide_index=True)
+                    else:
+                        st.caption("Tidak ada perubahan level yang signifikan pada P95, error rate, maupun throughput.")
+                    
+                    # --- CAPACITY MODEL (USL + LITTLE'S LAW) ---
+                    st.markdown("### 📐 Model Kapasitas (Universal Scalability Law)")
+                    st.caption("Throughput sukses (RPS) vs VUs per bucket 5 detik di-fit ke USL: "
+                               "X(N) = λN / (1 + σ(N-1) + κN(N-1)). σ = contention (antrian/lock), κ = coherency (biaya koordinasi).")
+                    capacity = diagnosis.get('capacity')
+                    if capacity:
+                        cap1, cap2, cap3, cap4 = st.columns(4)
+                        cap1.metric("λ (RPS per User)", f"{capacity['lambda']:.2f}")
+                        cap2.metric("σ (Contention)", f"{capacity['sigma']:.4f}")
+                        cap3.metric("κ (Coherency)", f"{capacity['kappa']:.6f}")
+                        cap4.metric("Kualitas Fit (R²)", f"{capacity['r2']:.2f}",
+                                    delta="Baik" if capacity['reliable'] else "Rendah", delta_color="normal" if capacity['reliable'] else "inverse")
+                        
+                        if capacity['peak_vus']:
+                            note = (f" (ekstrapolasi di luar beban teruji {capacity['max_tested_vus']} VUs)" if capacity['extrapolated'] else "")
+                            st.write(f"- 🏔️ **Prediksi Puncak:** ~**{capacity['peak_rps']:.0f} RPS** di ~**{capacity['peak_vus']} VUs**{note}.")
+                        elif capacity['asymptote_rps']:
+                            st.write(f"- 📈 **Tidak ada puncak:** throughput terus naik namun melambat, mendekati batas ~**{capacity['asymptote_rps']:.0f} RPS** (contention tanpa coherency).")
+                        else:
+                            st.write(f"- 📈 **Skala Linear:** tidak ada contention terdeteksi sampai {capacity['max_tested_vus']} VUs. Naikkan beban untuk menemukan batasnya.")
+                        if not capacity['reliable']:
+                            st.write("- ⚠️ **Fit kurang akurat (R² < 0.8):** data noisy atau beban tidak naik bertahap. Gunakan prediksi sebagai indikasi saja.")
+                        
+                        littles_law = capacity['littles_law']
+                        if littles_law:
+                            if littles_law['consistent']:
+                                st.write(f"- ✅ **Little's Law konsisten:** VUs ≈ iterasi/detik × durasi iterasi (selisih median {littles_law['median_error']:.0%}).")
+                            else:
+                                st.write(f"- ⚠️ **Little's Law tidak konsisten** (selisih median {littles_law['median_error']:.0%}): sebagian VU tidak menyelesaikan iterasi "
+                                         "(tertahan timeout) atau generator jenuh. Throughput terukur bisa lebih rendah dari kapasitas sebenarnya.")
+                        
+                        fit_chart = alt.Chart(capacity['curve']).mark_line(color='#ff4b4b').encode(
+                            x=alt.X('VUs:Q', title='Virtual Users'),
+                            y=alt.Y('RPS:Q', title='Throughput Sukses (RPS)')
+                        )
+                        observed_chart = alt.Chart(capacity['observed']).mark_circle(color='#0E61FE', opacity=0.6).encode(
+                            x='VUs:Q', y='RPS:Q', tooltip=['VUs:Q', alt.Tooltip('RPS:Q', format='.1f')]
+                        )
+                        layers = [observed_chart, fit_chart]
+                        if capacity['peak_vus']:
+                            layers.append(alt.Chart(pd.DataFrame({'VUs': [capacity['peak_vus']]})).mark_rule(strokeDash=[4, 4], color='#ffa500').encode(x='VUs:Q'))
+                        st.altair_chart(alt.layer(*layers).properties(height=280), use_container_width=True)
+                        st.caption("Titik = observasi (rata-rata per level VU), garis = model USL, garis putus-putus = prediksi puncak.")
+                    else:
+                        st.caption("Data tidak cukup untuk model kapasitas (butuh minimal 3 level VU berbeda, misal Load/Stress Test dengan ramp-up).")
                             
                 else:
                     st.warning("Data tidak cukup untuk melakukan analisis forensik mendalam.")
+                
+                render_target_metrics(st.session_state.test_results_path, bundle['target'])
 
             # --- TAB 3: BREAKDOWN LATENCY (Request Lifecycle) ---
             with tab3:
                 st.subheader("Di mana waktu terbuang?")
                 st.markdown("Setiap request HTTP terdiri dari beberapa tahap. Ini membantu Anda tahu **siapa yang salah**: Jaringan atau Server?")
                 
-                # Get specific k6 metrics
-                waiting = get_metric_summary(df, 'http_req_waiting') # TTFB (Server Processing)
-                connecting = get_metric_summary(df, 'http_req_connecting') # Network/TCP
-                blocked = get_metric_summary(df, 'http_req_blocked') # DNS/Queue
+                # Distribusi semua tahapan (avg/p50/p95/p99) dalam satu grouped pass
+                breakdown = view['phase_breakdown']
                 
-                if waiting and connecting:
-                    # Create a comparison dataframe
-                    lifecycle_data = pd.DataFrame({
-                        'Tahapan': ['Blocked (DNS/Queue)', 'Connecting (Network)', 'Waiting (Server Processing)', 'Receiving (Download)'],
-                        'Waktu (Rata-rata ms)': [
-                            blocked['avg'], 
-                            connecting['avg'], 
-                            waiting['avg'], 
-                            stats['avg'] - (blocked['avg'] + connecting['avg'] + waiting['avg']) # Approximate receiving
-                        ]
-                    })
+                if breakdown is not None:
+                    lifecycle_data = breakdown[['p50', 'p95', 'p99']].reset_index(names='Tahapan').melt(
+                        id_vars='Tahapan', var_name='Persentil', value_name='Waktu (ms)'
+                    )
                     
                     lc_col1, lc_col2 = st.columns([2, 1])
                     with lc_col1:
+                        st.markdown("##### Persentil per Tahapan")
                         st.altair_chart(alt.Chart(lifecycle_data).mark_bar().encode(
-                            x='Waktu (Rata-rata ms)',
-                            y=alt.Y('Tahapan', sort=None),
-                            color=alt.Color('Tahapan', legend=None)
-                        ).properties(height=300), use_container_width=True)
+                            x='Waktu (ms)',
+                            y=alt.Y('Tahapan', sort=list(breakdown.index), title=None),
+                            yOffset=alt.YOffset('Persentil', sort=['p50', 'p95', 'p99']),
+                            color=alt.Color('Persentil', sort=['p50', 'p95', 'p99']),
+                            tooltip=['Tahapan', 'Persentil', alt.Tooltip('Waktu (ms)', format='.2f')]
+                        ).properties(height=360), use_container_width=True)
                     
                     with lc_col2:
                         st.info("""
                         **Cara Membaca:**
                         1. **Waiting Tinggi?** -> Kode Backend Anda lambat atau Database lemot.
-                        2. **Connecting Tinggi?** -> Masalah jaringan server atau latency internet.
-                        3. **Blocked Tinggi?** -> Antrian request penuh atau masalah DNS.
+                        2. **Connecting / TLS Tinggi?** -> Koneksi baru terus dibuat (keep-alive/pool tidak jalan) atau jaringan lambat.
+                        3. **Blocked Tinggi?** -> Antrian request penuh (connection pool habis) atau masalah DNS.
+                        4. **Receiving Tinggi?** -> Response terlalu besar atau bandwidth terbatas.
+                        
+                        Perhatikan **P99**: rata-rata sering terlihat aman padahal tail-nya bermasalah.
                         """)
+                    
+                    st.dataframe(breakdown.style.format("{:.2f} ms"), use_container_width=True)
+                    
+                    st.markdown("##### Tahapan per Detik (Stacked)")
+                    st.caption("Lihat kapan TLS handshake / antrian (Blocked) membengkak saat beban naik, dan kapan server (Waiting) mulai melambat. "
+                               "Blocked di sini hanya sisa di luar Connecting + TLS (k6 sudah memasukkan keduanya ke blocked), jadi tinggi tumpukan = total per request.")
+                    phase_timeline = view['phase_timeline']
+                    st.altair_chart(alt.Chart(phase_timeline).mark_area().encode(
+                        x='timestamp:T',
+                        y=alt.Y('ms:Q', stack='zero', title='Rata-rata (ms)'),
+                        color=alt.Color('Tahapan:N', sort=list(breakdown.index)),
+                        order=alt.Order('urutan:Q'),
+                        tooltip=['timestamp:T', 'Tahapan:N', alt.Tooltip('ms:Q', format='.2f')]
+                    ).properties(height=300), use_container_width=True)
                 else:
                     st.warning("Data detail breakdown tidak tersedia di file CSV ini.")
 
+            # --- TAB ERROR: STATUS CODE & ERROR CLASS ---
+            with tab_err:
+                st.subheader("Status Code & Kelas Error")
+                st.markdown("Error dikelompokkan berdasarkan tag `status` dan `error_code` dari k6, sehingga terlihat **jenis kegagalan** dan **kapan** masing-masing mulai muncul.")
+                
+                error_analysis = view['error_analysis']
+                
+                if error_analysis is None:
+                    st.warning("Data request tidak tersedia di file CSV ini.")
+                else:
+                    if error_analysis['total_failures'] == 0:
+                        st.success("✅ Tidak ada request yang gagal selama tes.")
+                    else:
+                        classes = error_analysis['classes']
+                        err_col1, err_col2 = st.columns([1, 1])
+                        with err_col1:
+                            st.markdown("##### Ringkasan per Kelas")
+                            st.dataframe(classes.style.format({'Porsi (%)': "{:.1f}%", 'Jumlah': "{:,}"}), use_container_width=True)
+                        with err_col2:
+                            st.markdown("##### Penjelasan")
+                            for cls in classes.index:
+                                st.write(f"- **{cls}** (mulai detik ke-{classes.loc[cls, 'Pertama Muncul (detik)']}): {ERROR_CLASS_HINTS[cls]}")
+                        
+                        st.markdown("##### Timeline Kelas Error (per Detik)")
+                        st.altair_chart(alt.Chart(error_analysis['class_timeline']).mark_bar().encode(
+                            x='timestamp:T',
+                            y=alt.Y('Jumlah:Q', stack='zero', title='Error / detik'),
+                            color=alt.Color('Kelas:N', sort=list(classes.index)),
+                            tooltip=['timestamp:T', 'Kelas:N', 'Jumlah:Q']
+                        ).properties(height=250), use_container_width=True)
+                    
+                    st.markdown("##### Timeline Status Code (per Detik)")
+                    st.altair_chart(alt.Chart(error_analysis['status_timeline']).mark_bar().encode(
+                        x='timestamp:T',
+                        y=alt.Y('Jumlah:Q', stack='zero', title='Request / detik'),
+                        color=alt.Color('Status:N'),
+                        tooltip=['timestamp:T', 'Status:N', 'Jumlah:Q']
+                    ).properties(height=250), use_container_width=True)
+                    st.caption("Status `0` berarti tidak ada response HTTP (timeout, connection refused/reset).")
+
+            # --- TAB CHECKS: PASS RATE PER CHECK ---
+            with tab_chk:
+                st.subheader("Pass Rate per Check")
+                st.markdown("Dihitung dari metrik `checks` (fungsi `check()` di `k6/main.js`). Pelanggaran pertama = "
+                            f"jendela {CHECK_WINDOW_S} detik pertama di mana pass rate sebuah check turun di bawah batas.")
+                
+                checks = view['checks']
+                if checks is None:
+                    st.warning("Metrik checks tidak tersedia di file CSV ini.")
+                else:
+                    min_pass_rate = st.number_input("Batas Pass Rate (%)", min_value=0.0, max_value=100.0, value=CHECK_MIN_PASS_RATE,
+                                                    step=0.5, key="check_min_pass_rate")
+                    breaches = find_check_breaches(checks['timeline'], min_pass_rate)
+                    
+                    chk_cols = st.columns(len(checks['summary']))
+                    for col, (name, row) in zip(chk_cols, checks['summary'].iterrows()):
+                        col.metric(name, f"{row['Pass Rate (%)']:.2f}%",
+                                   delta="Lulus" if row['Pass Rate (%)'] >= min_pass_rate else "Di bawah batas",
+                                   delta_color="normal" if row['Pass Rate (%)'] >= min_pass_rate else "inverse")
+                    
+                    if breaches.empty:
+                        st.success(f"✅ Semua check bertahan di atas {min_pass_rate:g}% sepanjang tes.")
+                    else:
+                        first_name = breaches.index[0]
+                        first = breaches.iloc[0]
+                        st.error(f"🚩 **Pelanggaran pertama:** check `{first_name}` turun ke {first['Pass Rate (%)']:.1f}% "
+                                 f"mulai detik ke-{int(first['Mulai Detik'])}.")
+                        st.dataframe(breaches.style.format({'Pass Rate (%)': "{:.1f}%", 'Mulai Detik': "{:.0f}"}), use_container_width=True)
+                    
+                    st.markdown("##### Timeline Pass Rate (per Detik)")
+                    timeline_chart = alt.Chart(checks['timeline']).mark_line().encode(
+                        x='timestamp:T',
+                        y=alt.Y('pass_rate:Q', title='Pass Rate (%)', scale=alt.Scale(domain=[0, 100])),
+                        color=alt.Color('Check:N', sort=list(checks['summary'].index)),
+                        tooltip=['timestamp:T', 'Check:N', alt.Tooltip('pass_rate:Q', format='.1f'), 'total:Q']
+                    )
+                    level_rule = alt.Chart(pd.DataFrame({'y': [min_pass_rate]})).mark_rule(strokeDash=[4, 4], color='#ff4b4b').encode(y='y:Q')
+                    st.altair_chart((timeline_chart + level_rule).properties(height=300), use_container_width=True)
+                    st.caption("Garis putus-putus = batas pass rate. Detik dengan sedikit iterasi (awal/akhir tes) wajar terlihat lebih fluktuatif.")
+
             # --- TAB 4: PERFORMANCE CHARTS ---
             with tab4:
                 st.subheader("Timeline Performa")
                 
                 # Determine metric columns based on k6 version
-                chart_df = df[df['metric_name'].isin(['http_req_duration', 'vus'])].pivot_table(
-                    index='timestamp', columns='metric_name', values='metric_value', aggfunc='mean'
-                ).reset_index()
+                chart_df, rps_df = view['chart_df'], view['rps_df']
                 
                 st.markdown("##### Virtual Users (Beban) vs Durasi (Kecepatan)")
                 if not chart_df.empty and 'vus' in chart_df.columns:
@@ -469,12 +1203,45 @@ def render_results():
                 else:
                     st.caption("Data time-series tidak lengkap.")
                 
+                # Heatmap waktu x latency (rata-rata di grafik atas menyembunyikan latency bimodal & lonjakan tail)
+                heatmap = view['latency_heatmap']
+                if not heatmap.empty:
+                    st.markdown("##### Heatmap Latency (Waktu × Bucket Latency)")
+                    st.altair_chart(alt.Chart(heatmap).mark_rect().encode(
+                        x=alt.X('t_start:Q', title='Detik ke-'),
+                        x2='t_end:Q',
+                        y=alt.Y('lat_lo:Q', scale=alt.Scale(type='log'), title='Durasi (ms, skala log)'),
+                        y2='lat_hi:Q',
+                        color=alt.Color('count:Q', scale=alt.Scale(type='log', scheme='viridis'), title='Request'),
+                        tooltip=[alt.Tooltip('t_start:Q', title='Detik'), alt.Tooltip('lat_lo:Q', format='.1f', title='Dari (ms)'),
+                                 alt.Tooltip('lat_hi:Q', format='.1f', title='Sampai (ms)'), alt.Tooltip('count:Q', title='Request')]
+                    ).properties(height=300), use_container_width=True)
+                    st.caption("Dua pita terpisah = latency bimodal (misal cache hit/miss). Garis vertikal terang = jeda serentak "
+                               "(GC pause, connection pool habis). Pita yang naik perlahan = antrian menumpuk (saturasi).")
+                
+                # Overlay resource load generator (k6) pada timeline latency
+                if gen_df is not None and not gen_df.empty and not chart_df.empty:
+                    st.markdown("##### Resource Load Generator (k6) vs Durasi")
+                    gen_long = gen_df.melt(id_vars='timestamp', value_vars=[c for c in ['cpu_util', 'mem_util'] if c in gen_df],
+                                           var_name='Resource', value_name='Utilisasi')
+                    gen_long['Resource'] = gen_long['Resource'].map({'cpu_util': 'CPU k6', 'mem_util': 'Memori k6'})
+                    
+                    gen_lines = alt.Chart(gen_long).mark_line().encode(
+                        x='timestamp:T',
+                        y=alt.Y('Utilisasi:Q', axis=alt.Axis(format='%'), title='Utilisasi Generator', scale=alt.Scale(domain=[0, 1])),
+                        color=alt.Color('Resource:N', scale=alt.Scale(range=['#ffa500', '#8e44ad'])),
+                        tooltip=['timestamp:T', 'Resource:N', alt.Tooltip('Utilisasi:Q', format='.0%')]
+                    )
+                    limit_rule = alt.Chart(pd.DataFrame({'y': [GEN_CPU_LIMIT]})).mark_rule(strokeDash=[4, 4], color='#ff4b4b').encode(y='y:Q')
+                    latency_line = alt.Chart(chart_df).mark_line(color='#ff4b4b', opacity=0.4).encode(
+                        x='timestamp:T',
+                        y=alt.Y('http_req_duration', title='Durasi (ms)')
+                    )
+                    st.altair_chart(alt.layer(gen_lines + limit_rule, latency_line).resolve_scale(y='independent'), use_container_width=True)
+                    st.caption(f"Garis putus-putus = batas {GEN_CPU_LIMIT:.0%} CPU. Jika latency naik bersamaan dengan CPU k6 di atas batas, bottleneck ada di generator.")
+                
                 st.markdown("---")
                 st.markdown("##### Throughput (Requests Per Second)")
-                # Resample to 1s
-                rps_df = req_duration.set_index('timestamp').resample('1s').count()[['metric_value']].reset_index()
-                rps_df.columns = ['timestamp', 'RPS']
-                
                 st.altair_chart(alt.Chart(rps_df).mark_bar().encode(
                     x='timestamp:T',
                     y='RPS',
@@ -492,9 +1259,15 @@ def render_results():
                 | **http_req_duration** | Total waktu dari klik sampai data selesai diterima. |
                 | **http_req_waiting** | Sering disebut **TTFB**. Waktu tunggu server "mikir" sebelum kirim data pertama. Kalau ini tinggi, optimasi database/kode backend Anda. |
                 | **http_req_connecting** | Waktu untuk membuat koneksi TCP ke server. Kalau tinggi, cek jaringan. |
+                | **http_req_tls_handshaking** | Waktu negosiasi TLS/HTTPS. Tinggi terus-menerus = koneksi tidak di-reuse. |
+                | **http_req_blocked** | Waktu menunggu slot koneksi (antrian) sebelum request dikirim, termasuk DNS. |
+                | **http_req_sending / receiving** | Waktu upload body request / download body response. |
                 | **vus** | Virtual Users. Berapa banyak "orang" tiruan yang sedang mengakses sistem bersamaan. |
                 | **p95 (95th Percentile)** | Batas nilai untuk 95% user tercepat. Jika P95 = 500ms, artinya 95% user aksesnya < 500ms, sisanya (5%) > 500ms. |
                 | **Thresholds** | Batas aman. Misalnya "Error harus < 1%". |
+                | **checks** | Hasil validasi per iterasi (`check()` di main.js): status sesuai, response < 500ms, < 1000ms. Pass rate = persen iterasi yang lulus. |
+                | **USL (σ, κ)** | Universal Scalability Law. σ = porsi kerja yang harus antri (contention), κ = biaya koordinasi antar request (coherency). κ > 0 berarti ada titik di mana menambah user justru menurunkan throughput. |
+                | **Little's Law** | Jumlah user aktif = throughput × waktu per iterasi. Jika tidak cocok, ada VU yang tertahan atau data tidak valid. |
                 """)
 
         except Exception as e:
@@ -0,0 +1,429 @@
+import io
+import os
+import json
+import math
+import threading
+import numpy as np
+import pandas as pd
+from .regression import LATENCY_EDGES
+from .scenarios import load_run_metadata, rollup_path
+from .history_index import read_run_start_time
+from .target_metrics import load_target_metrics, choose_window, get_target_analysis
+
+# Analisis berjendela untuk run panjang (soak 4-12 jam): CSV k6 diringkas menjadi agregat per menit
+# (histogram latency + hitungan) di sidecar results/<proyek>/<run>.rollup.ndjson.
+# Memori & waktu render halaman hasil konstan, berapapun durasi run.
+ROLLUP_WINDOW_S = 60
+TAIL_INTERVAL = 5.0          # Detik antar pembacaan CSV yang sedang ditulis k6
+TAIL_READ_BYTES = 64 * 1024 * 1024
+LATE_WINDOWS = 1             # Jendela ditahan 1 menit ekstra untuk baris CSV yang datang terlambat
+CHUNK_ROWS = 250_000         # Baris per chunk saat membangun rollup dari CSV yang sudah selesai
+ROLLUP_COLUMNS = ['metric_name', 'timestamp', 'metric_value']
+# Run di atas ukuran ini dibuka dalam mode berjendela walau bukan soak (env K6_DASHBOARD_WINDOWED_MB)
+DEFAULT_WINDOWED_MB = 1024
+
+# Drift: tren jangka panjang pada fase stabil (VUs >= 95% puncak)
+DRIFT_MIN_WINDOWS = 10
+DRIFT_ALPHA = 0.01
+DRIFT_P95_PCT = 10.0          # P95 naik >= 10% sepanjang fase stabil
+DRIFT_ERROR_PP = 0.5          # Error rate naik >= 0.5 poin persen
+DRIFT_THROUGHPUT_PCT = 10.0   # Throughput turun >= 10%
+DRIFT_MAX_POINTS = 1500       # Batas titik untuk Theil-Sen (O(n^2) pasangan)
+
+N_BUCKETS = len(LATENCY_EDGES) - 1
+
+# CSV yang sedang di-tail oleh start_rollup_writer (path absolut). Sidecar-nya hanya boleh ditulis writer tersebut:
+# rollup yang dibangun dari CSV setengah jadi akan ditambah ulang oleh writer, sehingga menitnya terhitung dua kali.
+_writers = set()
+_writers_lock = threading.Lock()
+
+def hist_percentile(counts, q):
+    """Persentil dari histogram bucket log (interpolasi geometrik di dalam bucket)."""
+    counts = np.asarray(counts, dtype=float)
+    total = counts.sum()
+    if total == 0:
+        return None
+    cum = np.cumsum(counts)
+    rank = q / 100 * total
+    idx = int(np.searchsorted(cum, rank, side='left'))
+    idx = min(idx, len(counts) - 1)
+    before = cum[idx] - counts[idx]
+    frac = (rank - before) / counts[idx] if counts[idx] else 0.0
+    lo, hi = LATENCY_EDGES[idx], LATENCY_EDGES[idx + 1]
+    return float(lo * (hi / lo) ** min(max(frac, 0.0), 1.0))
+
+class RollupAccumulator:
+    """
+    Agregasi baris CSV k6 ke jendela per menit secara inkremental. Hanya jendela yang masih terbuka
+    yang disimpan di memori (biasanya 1-2), jendela lama dikeluarkan lewat flush().
+    """
+
+    def __init__(self):
+        self.run_start = None
+        self._windows = {}
+        self.max_window = -1
+
+    def _window(self, idx):
+        window = self._windows.get(idx)
+        if window is None:
+            window = self._windows[idx] = {
+                'requests': 0, 'failed': 0, 'latency_sum': 0.0, 'hist': np.zeros(N_BUCKETS, dtype=np.int64),
+                'vus': 0, 'iterations': 0,
+            }
+        return window
+
+    def add(self, frame):
+        """Tambahkan potongan CSV (kolom metric_name, timestamp [epoch detik], metric_value)."""
+        if frame.empty:
+            return
+        ts = pd.to_numeric(frame['timestamp'], errors='coerce').to_numpy(dtype=float)
+        values = pd.to_numeric(frame['metric_value'], errors='coerce').to_numpy(dtype=float)
+        names = frame['metric_name'].to_numpy()
+        valid = ~np.isnan(ts) & ~np.isnan(values)
+        if not valid.any():
+            return
+        if self.run_start is None:
+            self.run_start = float(ts[valid][0])
+        idx = np.maximum((ts - self.run_start) // ROLLUP_WINDOW_S, 0)
+        idx = np.where(valid, idx, -1).astype(np.int64)
+        lo = int(idx[valid].min())
+        span = int(idx[valid].max()) - lo + 1
+        self.max_window = max(self.max_window, lo + span - 1)
+
+        def per_window(metric):
+            mask = (names == metric) & valid
+            return mask, idx[mask] - lo
+
+        mask, rel = per_window('http_req_duration')
+        req_counts = np.bincount(rel, minlength=span)
+        lat_sums = np.bincount(rel, weights=values[mask], minlength=span)
+        buckets = np.clip(np.searchsorted(LATENCY_EDGES, values[mask], side='right') - 1, 0, N_BUCKETS - 1)
+        hist = np.bincount(rel * N_BUCKETS + buckets, minlength=span * N_BUCKETS).reshape(span, N_BUCKETS)
+        mask, rel = per_window('http_req_failed')
+        failed = np.bincount(rel, weights=values[mask], minlength=span)
+        mask, rel = per_window('iterations')
+        iterations = np.bincount(rel, minlength=span)
+        mask, rel = per_window('vus')
+        vus = np.zeros(span)
+        np.maximum.at(vus, rel, values[mask])
+
+        for offset in np.nonzero(req_counts + failed + iterations + vus)[0]:
+            window = self._window(lo + int(offset))
+            window['requests'] += int(req_counts[offset])
+            window['failed'] += int(failed[offset])
+            window['latency_sum'] += float(lat_sums[offset])
+            window['hist'] += hist[offset]
+            window['iterations'] += int(iterations[offset])
+            window['vus'] = max(window['vus'], int(vus[offset]))
+
+    def flush(self, final=False):
+        """Keluarkan jendela yang sudah lengkap (semua jika final). Return: list baris rollup (dict)."""
+        limit = math.inf if final else self.max_window - LATE_WINDOWS
+        rows = []
+        for idx in sorted(i for i in self._windows if i < limit):
+            window = self._windows.pop(idx)
+            hist = window['hist']
+            requests = window['requests']
+            rows.append({
+                'minute': idx,
+                'start_s': idx * ROLLUP_WINDOW_S,
+                'requests': requests,
+                'failed': window['failed'],
+                'error_rate': window['failed'] / requests * 100 if requests else 0.0,
+                'rps': requests / ROLLUP_WINDOW_S,
+                'avg': window['latency_sum'] / requests if requests else None,
+                'p50': hist_percentile(hist, 50),
+                'p95': hist_percentile(hist, 95),
+                'p99': hist_percentile(hist, 99),
+                'vus': window['vus'],
+                'iterations': window['iterations'],
+                # Histogram sparse {bucket: count} untuk menggabungkan persentil lintas jendela
+                'hist': {str(i): int(hist[i]) for i in np.nonzero(hist)[0]},
+            })
+        return rows
+
+def _append_rows(path, rows):
+    if rows:
+        with open(path, "a") as f:
+            for row in rows:
+                f.write(json.dumps(row) + "\n")
+
+def is_rollup_writer_active(results_path):
+    """True jika run ini masih ditulis k6 dan sidecar rollup-nya diisi oleh writer (soak yang sedang berjalan)."""
+    with _writers_lock:
+        return os.path.abspath(results_path) in _writers
+
+def build_rollups(results_path):
+    """
+    Bangun sidecar rollup dari CSV yang sudah selesai (dibaca per chunk, memori konstan).
+    Dipakai untuk run lama / run yang dijalankan manual via CLI.
+    Return: False (tidak melakukan apa pun) jika run masih ditulis dan sidecar-nya milik writer, selain itu True.
+    """
+    if is_rollup_writer_active(results_path):
+        return False
+    target = rollup_path(results_path)
+    tmp = target + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    acc = RollupAccumulator()
+    for chunk in pd.read_csv(results_path, usecols=ROLLUP_COLUMNS, chunksize=CHUNK_ROWS, low_memory=False):
+        acc.add(chunk)
+        _append_rows(tmp, acc.flush())
+    _append_rows(tmp, acc.flush(final=True))
+    if not os.path.exists(tmp):
+        open(tmp, "w").close()
+    os.replace(tmp, target)
+    return True
+
+def _tail_loop(results_path, stop_event, interval):
+    """Baca baris baru CSV yang sedang ditulis k6 dan tambahkan jendela yang sudah lengkap ke sidecar."""
+    target = rollup_path(results_path)
+    acc = RollupAccumulator()
+    header, offset, pending = None, 0, b""
+    while True:
+        stopping = stop_event.wait(interval)
+        while True:
+            try:
+                with open(results_path, "rb") as f:
+                    f.seek(offset)
+                    data = f.read(TAIL_READ_BYTES)
+                    offset = f.tell()
+            except OSError:
+                data = b""
+            block = pending + data
+            cut = block.rfind(b"\n") + 1
+            lines, pending = block[:cut], block[cut:]
+            if header is None and lines:
+                first_end = lines.index(b"\n") + 1
+                header, lines = lines[:first_end], lines[first_end:]
+            if lines:
+                acc.add(pd.read_csv(io.BytesIO(header + lines), usecols=ROLLUP_COLUMNS, low_memory=False))
+                _append_rows(target, acc.flush())
+            if len(data) < TAIL_READ_BYTES:
+                break
+        if stopping:
+            _append_rows(target, acc.flush(final=True))
+            return
+
+def start_rollup_writer(results_path, interval=TAIL_INTERVAL):
+    """
+    Mulai agregasi per menit CSV k6 yang sedang berjalan di background thread.
+    Return: fungsi stop() yang memproses sisa CSV lalu menulis jendela terakhir (dipanggil setelah k6 selesai).
+    """
+    key = os.path.abspath(results_path)
+    with _writers_lock:
+        _writers.add(key)
+    if os.path.exists(rollup_path(results_path)):
+        os.remove(rollup_path(results_path))
+    stop_event = threading.Event()
+    thread = threading.Thread(target=_tail_loop, args=(results_path, stop_event, interval), daemon=True)
+    thread.start()
+
+    def stop():
+        stop_event.set()
+        thread.join()
+        with _writers_lock:
+            _writers.discard(key)
+    return stop
+
+def load_rollups(results_path, build=True):
+    """
+    Load rollup per menit (dibangun dari CSV jika belum ada dan build=True; run yang masih ditulis tidak pernah dibangun).
+    Return: (DataFrame tanpa histogram, ndarray histogram [jendela x bucket]) atau (None, None).
+    """
+    path = rollup_path(results_path)
+    if not os.path.exists(path):
+        if not build or not build_rollups(results_path):
+            return None, None
+    rows = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                rows.append(json.loads(line))
+    if not rows:
+        return None, None
+    rows.sort(key=lambda r: r['minute'])
+    hist = np.zeros((len(rows), N_BUCKETS), dtype=np.int64)
+    for i, row in enumerate(rows):
+        for bucket, count in row.pop('hist').items():
+            hist[i, int(bucket)] = count
+    rollups = pd.DataFrame(rows)
+    if rollups['minute'].duplicated().any():
+        rollups, hist = _merge_late_windows(rollups, hist)
+    return rollups, hist
+
+def _merge_late_windows(rollups, hist):
+    """Gabungkan baris menit yang sama (baris CSV yang datang setelah jendelanya sudah di-flush)."""
+    minutes, inverse = np.unique(rollups['minute'].to_numpy(), return_inverse=True)
+    merged_hist = np.zeros((len(minutes), N_BUCKETS), dtype=np.int64)
+    np.add.at(merged_hist, inverse, hist)
+    rollups = rollups.assign(latency_sum=rollups['avg'].fillna(0) * rollups['requests'])
+    merged = rollups.groupby('minute', sort=True).agg(
+        start_s=('start_s', 'first'), requests=('requests', 'sum'), failed=('failed', 'sum'),
+        latency_sum=('latency_sum', 'sum'), vus=('vus', 'max'), iterations=('iterations', 'sum'),
+    ).reset_index()
+    requests = merged['requests'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        merged['error_rate'] = np.where(requests > 0, merged['failed'] / requests * 100, 0.0)
+        merged['avg'] = np.where(requests > 0, merged['latency_sum'] / requests, np.nan)
+    merged['rps'] = requests / ROLLUP_WINDOW_S
+    for q in (50, 95, 99):
+        merged[f'p{q}'] = [hist_percentile(h, q) for h in merged_hist]
+    return merged.drop(columns='latency_sum')[list(rollups.columns.drop('latency_sum'))], merged_hist
+
+def is_windowed_run(results_path, metadata=None):
+    """Run soak, atau CSV terlalu besar untuk di-load penuh ke memori -> analisis berjendela."""
+    if metadata and metadata.get('test_type') == 'soak':
+        return True
+    limit_mb = float(os.environ.get("K6_DASHBOARD_WINDOWED_MB", DEFAULT_WINDOWED_MB))
+    try:
+        return os.path.getsize(results_path) > limit_mb * 1024 * 1024
+    except OSError:
+        return False
+
+def summarize_rollups(rollups, hist):
+    """Ringkasan seluruh run dari rollup (format sama dengan get_metric_summary + hitungan request)."""
+    total = hist.sum(axis=0)
+    total_reqs = int(rollups['requests'].sum())
+    failed_reqs = int(rollups['failed'].sum())
+    latency_sum = (rollups['avg'].fillna(0) * rollups['requests']).sum()
+    nonzero = np.nonzero(total)[0]
+    return {
+        'total_reqs': total_reqs,
+        'failed_reqs': failed_reqs,
+        'failure_rate': failed_reqs / total_reqs * 100 if total_reqs else 0.0,
+        'stats': {
+            'avg': latency_sum / total_reqs if total_reqs else 0.0,
+            'min': float(LATENCY_EDGES[nonzero[0]]) if len(nonzero) else 0.0,
+            'max': float(LATENCY_EDGES[nonzero[-1] + 1]) if len(nonzero) else 0.0,
+            'p90': hist_percentile(total, 90),
+            'p95': hist_percentile(total, 95),
+            'p99': hist_percentile(total, 99),
+            'count': total_reqs,
+        } if total_reqs else None,
+    }
+
+# --- Drift (tren jangka panjang) ---
+
+def theil_sen(x, y):
+    """Slope & intercept Theil-Sen (median slope semua pasangan; tahan outlier spike sesaat)."""
+    i, j = np.triu_indices(len(x), k=1)
+    dx = x[j] - x[i]
+    valid = dx != 0
+    slope = float(np.median((y[j] - y[i])[valid] / dx[valid]))
+    intercept = float(np.median(y - slope * x))
+    return slope, intercept
+
+def mann_kendall(y):
+    """Uji tren Mann-Kendall dua sisi (aproksimasi normal). Return: p_value."""
+    n = len(y)
+    i, j = np.triu_indices(n, k=1)
+    s = np.sign(y[j] - y[i]).sum()
+    _, ties = np.unique(y, return_counts=True)
+    var = (n * (n - 1) * (2 * n + 5) - (ties * (ties - 1) * (2 * ties + 5)).sum()) / 18
+    if var <= 0:
+        return 1.0
+    z = (s - np.sign(s)) / math.sqrt(var)
+    return math.erfc(abs(z) / math.sqrt(2))
+
+def get_drift_analysis(rollups, threshold_p95=None):
+    """
+    Tren drift P95, error rate, dan throughput pada fase stabil (VUs >= 95% puncak).
+    Degradasi = perubahan sepanjang fase stabil melewati batas DAN tren signifikan (Mann-Kendall p < alpha).
+    Return: dict {series, degrading, steady_start_s, steady_end_s, windows, p95_threshold_eta_h} atau None.
+    """
+    if rollups is None or rollups.empty:
+        return None
+    steady = rollups[(rollups['vus'] >= rollups['vus'].max() * 0.95) & (rollups['requests'] > 0)]
+    if len(steady) < DRIFT_MIN_WINDOWS:
+        return None
+    if len(steady) > DRIFT_MAX_POINTS:
+        steady = steady.iloc[np.linspace(0, len(steady) - 1, DRIFT_MAX_POINTS).astype(int)]
+
+    hours = steady['start_s'].to_numpy(dtype=float) / 3600
+    span_h = hours[-1] - hours[0]
+    series = {}
+    for key, label in (('p95', 'P95 Latency (ms)'), ('error_rate', 'Error Rate (%)'), ('rps', 'Throughput (RPS)')):
+        y = steady[key].to_numpy(dtype=float)
+        slope, intercept = theil_sen(hours, y)
+        start = intercept + slope * hours[0]
+        end = intercept + slope * hours[-1]
+        change = end - start
+        change_pct = change / start * 100 if start > 0 else 0.0
+        p_value = mann_kendall(y)
+        if key == 'p95':
+            degrading = change_pct >= DRIFT_P95_PCT
+        elif key == 'error_rate':
+            degrading = change >= DRIFT_ERROR_PP
+        else:
+            degrading = change_pct <= -DRIFT_THROUGHPUT_PCT
+        series[key] = {
+            'label': label,
+            'slope_per_hour': slope,
+            'start': start,
+            'end': end,
+            'change': change,
+            'change_pct': change_pct,
+            'p_value': p_value,
+            'degrading': bool(degrading and p_value < DRIFT_ALPHA),
+            'intercept': intercept,
+        }
+
+    # Proyeksi kapan P95 melewati threshold jika tren (signifikan) berlanjut
+    p95 = series['p95']
+    eta_h = None
+    if threshold_p95 and p95['slope_per_hour'] > 0 and p95['p_value'] < DRIFT_ALPHA and p95['end'] < threshold_p95:
+        eta_h = (threshold_p95 - p95['end']) / p95['slope_per_hour']
+
+    return {
+        'series': series,
+        'degrading': [s['label'] for s in series.values() if s['degrading']],
+        'steady_start_s': float(steady['start_s'].iloc[0]),
+        'steady_end_s': float(steady['start_s'].iloc[-1] + ROLLUP_WINDOW_S),
+        'windows': len(steady),
+        'span_h': span_h,
+        'p95_threshold_eta_h': eta_h,
+    }
+
+def get_soak_target_analysis(results_path, rollups, hist):
+    """
+    Analisis metrik target untuk run berjendela: rollup per menit digabung ke jendela selebar interval scrape
+    (persentil tetap eksak dari histogram gabungan). Return: dict atau None jika tidak ada lampiran.
+    """
+    target_df = load_target_metrics(results_path)
+    if target_df is None:
+        return None
+    window_s = choose_window(target_df, ROLLUP_WINDOW_S)
+    group = rollups['minute'].to_numpy() // (window_s // ROLLUP_WINDOW_S)
+    n_windows = int(group.max()) + 1
+    merged = np.zeros((n_windows, N_BUCKETS), dtype=np.int64)
+    np.add.at(merged, group, hist)
+    requests = np.bincount(group, weights=rollups['requests'].to_numpy(dtype=float), minlength=n_windows)
+    failed = np.bincount(group, weights=rollups['failed'].to_numpy(dtype=float), minlength=n_windows)
+    vus = np.full(n_windows, np.nan)
+    np.fmax.at(vus, group, rollups['vus'].to_numpy(dtype=float))
+    k6_series = pd.DataFrame({
+        'start_s': np.arange(n_windows) * window_s,
+        'p95': [hist_percentile(row, 95) if row.any() else np.nan for row in merged],
+        'error_rate': np.where(requests > 0, failed / np.maximum(requests, 1) * 100, np.nan),
+        'vus': vus,
+    })
+    return get_target_analysis(target_df, k6_series, read_run_start_time(results_path), window_s)
+
+def build_soak_bundle(results_path):
+    """
+    Semua data halaman hasil mode berjendela (dari rollup saja, tanpa load CSV penuh).
+    Return: dict {rollups, hist, total_reqs, failed_reqs, failure_rate, stats, drift, target, metadata} atau None jika run kosong.
+    """
+    rollups, hist = load_rollups(results_path)
+    if rollups is None:
+        return None
+    metadata = load_run_metadata(results_path)
+    return {
+        'rollups': rollups,
+        'hist': hist,
+        **summarize_rollups(rollups, hist),
+        'drift': get_drift_analysis(rollups, metadata.get('threshold_p95') if metadata else None),
+        'target': get_soak_target_analysis(results_path, rollups, hist),
+        'metadata': metadata,
+    }
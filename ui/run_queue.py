@@ -0,0 +1,409 @@
+import os
+import json
+import uuid
+import time
+import heapq
+import threading
+import subprocess
+from datetime import datetime
+from .generator_monitor import start_generator_monitor, generator_metrics_path
+from .history_index import get_history_index, RESULTS_ROOT
+from .scenarios import save_run_metadata, run_metadata_path, rollup_path, get_scenario_stages, get_total_duration, parse_duration
+from .data_pool import DATA_MODES
+
+# Antrian run k6 global (satu proses dashboard = satu antrian, dipakai bersama semua session).
+# Jumlah run paralel dibatasi K6_DASHBOARD_MAX_RUNS (default 1) agar run tidak saling berebut CPU.
+# Antrian disimpan ke file JSON sehingga tetap ada setelah dashboard restart.
+DEFAULT_MAX_RUNS = 1
+QUEUE_FILE = os.path.join(RESULTS_ROOT, ".run_queue.json")
+STARTUP_OVERHEAD = 5     # Detik tambahan per run (start k6 + flush CSV) untuk ETA
+KEEP_FINISHED = 50       # Riwayat job selesai yang disimpan
+LOG_TAIL_CHARS = 2000
+
+QUEUED, RUNNING, FINISHED = 'queued', 'running', 'finished'
+# Hasil akhir job yang sudah FINISHED
+SUCCESS = 'success'                    # k6 exit 0
+THRESHOLD_FAILED = 'threshold_failed'  # k6 exit != 0 tapi CSV ada (threshold terlampaui, normal untuk stress test)
+FAILED = 'failed'                      # Tidak ada hasil
+CANCELLED = 'cancelled'
+INTERRUPTED = 'interrupted'            # Dashboard mati saat run berjalan
+
+# Parameter sensitif (token di headers, isi payload) hanya disimpan di memori proses, tidak pernah ditulis ke QUEUE_FILE.
+# Job yang masih antri saat dashboard restart kehilangan parameter ini, jadi ditandai INTERRUPTED (harus submit ulang).
+SENSITIVE_PARAMS = ('headers', 'payload_data')
+QUEUE_FILE_MODE = 0o600
+
+# Parameter run (sama untuk form dashboard & HTTP API) beserta default-nya
+TEST_TYPES = ('load', 'stress', 'spike', 'soak', 'smoke')
+METHODS = ('GET', 'POST', 'PUT', 'DELETE')
+RUN_PARAM_DEFAULTS = {
+    'method': 'GET',
+    'project_name': None,
+    'csv_name': None,
+    'test_type': 'load',
+    'vus': 200,
+    'duration': '1m',
+    'payload_data': None,
+    'headers': '{}',
+    'expected_status': 200,
+    'threshold_p95': 500,
+    'data_file': None,
+    'data_mode': 'round-robin',
+}
+
+def _safe_name(text):
+    return "".join(c for c in text if c.isalnum() or c in (' ', '_', '-')).strip().replace(" ", "_")
+
+def build_output_path(project_name, csv_name):
+    """Path CSV hasil: results/<proyek>/<nama>.csv (nama custom diberi suffix _1, _2 jika sudah ada)."""
+    test_folder = os.path.join(RESULTS_ROOT, _safe_name(project_name if project_name else "Default_Project"))
+    os.makedirs(test_folder, exist_ok=True)
+
+    if csv_name and csv_name.strip():
+        safe_filename = _safe_name(csv_name)
+        if not safe_filename.lower().endswith(".csv"):
+            safe_filename += ".csv"
+        final_filename = safe_filename
+        counter = 1
+        while os.path.exists(os.path.join(test_folder, final_filename)):
+            base = safe_filename.replace(".csv", "")
+            final_filename = f"{base}_{counter}.csv"
+            counter += 1
+        return os.path.join(test_folder, final_filename)
+
+    return os.path.join(test_folder, f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv")
+
+def validate_run_params(params):
+    """
+    Lengkapi parameter run dengan default dan validasi sebelum masuk antrian.
+    Return: dict parameter ternormalisasi, atau raise ValueError dengan pesan untuk user.
+    """
+    unknown = set(params) - set(RUN_PARAM_DEFAULTS) - {'target_url'}
+    if unknown:
+        raise ValueError(f"Parameter tidak dikenal: {', '.join(sorted(unknown))}")
+    run = {**RUN_PARAM_DEFAULTS, **{k: v for k, v in params.items() if v is not None}}
+
+    if not run.get('target_url'):
+        raise ValueError("URL Wajib diisi!")
+    run['method'] = str(run['method']).upper()
+    if run['method'] not in METHODS:
+        raise ValueError(f"Method harus salah satu dari {', '.join(METHODS)}.")
+    if run['test_type'] not in TEST_TYPES:
+        raise ValueError(f"Jenis tes harus salah satu dari {', '.join(TEST_TYPES)}.")
+    try:
+        parse_duration(run['duration'])
+    except ValueError:
+        raise ValueError(f"Format durasi tidak valid: `{run['duration']}` (contoh: 30s, 5m, 1h30m).")
+    try:
+        run['vus'] = int(run['vus'])
+        run['expected_status'] = int(run['expected_status'])
+        threshold_p95 = float(run['threshold_p95'])
+        run['threshold_p95'] = int(threshold_p95) if threshold_p95.is_integer() else threshold_p95
+    except (TypeError, ValueError):
+        raise ValueError("vus, expected_status, dan threshold_p95 harus berupa angka.")
+    if run['vus'] < 1:
+        raise ValueError("Jumlah VUs minimal 1.")
+    if not isinstance(run['headers'], str):
+        run['headers'] = json.dumps(run['headers'])
+    if run['payload_data'] is not None and not isinstance(run['payload_data'], str):
+        run['payload_data'] = json.dumps(run['payload_data'])
+    if run['data_mode'] not in DATA_MODES:
+        raise ValueError(f"Mode data pool harus salah satu dari {', '.join(DATA_MODES)}.")
+    return run
+
+def _secret_keys(params):
+    """Parameter sensitif yang benar-benar diisi (bukan default), yaitu yang hilang jika job antri ikut restart."""
+    return [k for k in SENSITIVE_PARAMS if params.get(k) not in (None, '', RUN_PARAM_DEFAULTS[k])]
+
+def public_job(job):
+    """Salinan job tanpa parameter sensitif (untuk ditampilkan / dikirim lewat API)."""
+    info = dict(job)
+    info['params'] = {k: v for k, v in job['params'].items() if k not in SENSITIVE_PARAMS}
+    return info
+
+def build_k6_env(params):
+    """Environment variable untuk k6/main.js & k6/config.js dari parameter run."""
+    env = os.environ.copy()
+    env["TARGET_URL"] = params['target_url']
+    env["METHOD"] = params['method']
+    env["TEST_TYPE"] = params['test_type']
+    env["MY_VUS"] = str(params['vus'])
+    env["MY_DURATION"] = params['duration']
+    env["HEADERS"] = params['headers']
+    env["EXPECTED_STATUS"] = str(params['expected_status'])
+    env["THRESHOLD_P95"] = str(params['threshold_p95'])
+    if params.get('payload_data'):
+        env["PAYLOAD_DATA"] = params['payload_data'].replace('\n', '')
+    if params.get('data_file'):
+        env["DATA_FILE"] = params['data_file']
+        env["DATA_MODE"] = params.get('data_mode') or 'round-robin'
+    return env
+
+def expected_duration(params):
+    """Durasi run yang diharapkan (detik) dari stage skenario, untuk ETA."""
+    return get_total_duration(params['test_type'], params['vus'], params['duration']) + STARTUP_OVERHEAD
+
+class RunQueue:
+    """Antrian job k6 thread-safe dengan batas run paralel, ETA, pembatalan, dan persistensi ke file."""
+
+    def __init__(self, path=QUEUE_FILE, max_running=DEFAULT_MAX_RUNS):
+        self.path = path
+        self.max_running = max(1, max_running)
+        self._lock = threading.Lock()
+        self._jobs = []          # Urut sesuai waktu submit
+        self._processes = {}     # job_id -> Popen
+        self._logs = {}          # job_id -> tail output terminal
+        self._secrets = {}       # job_id -> parameter sensitif (hanya di memori)
+        self._load()
+        self._dispatch()
+
+    # --- Persistensi ---
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                self._jobs = json.load(f)
+        except (OSError, ValueError):
+            self._jobs = []
+        for job in self._jobs:
+            if job['state'] == RUNNING:
+                # Proses k6 ikut mati bersama dashboard; data parsial tetap bisa dibuka dari riwayat
+                self._finish(job, INTERRUPTED, error="Dashboard berhenti saat run berjalan.")
+            elif job['state'] == QUEUED and (job.get('secret_params') or _secret_keys(job['params'])):
+                # Header / payload tidak ikut tersimpan, menjalankannya tanpa itu akan menghasilkan run yang salah
+                self._finish(job, INTERRUPTED, error="Dashboard berhenti sebelum run dimulai; headers/payload tidak disimpan ke disk, submit ulang tes.")
+        self._save()
+
+    def _save(self):
+        """
+        Tulis atomik (tmp + rename) agar file tidak korup jika proses mati saat menulis.
+        File dibuat dengan mode 0600 dan tidak pernah berisi parameter sensitif (lihat SENSITIVE_PARAMS).
+        """
+        finished = [j for j in self._jobs if j['state'] == FINISHED][-KEEP_FINISHED:]
+        self._jobs = [j for j in self._jobs if j['state'] != FINISHED or j in finished]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        with os.fdopen(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, QUEUE_FILE_MODE), "w") as f:
+            json.dump([public_job(j) for j in self._jobs], f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _finish(self, job, outcome, exit_code=None, error=None):
+        job['state'] = FINISHED
+        job['outcome'] = outcome
+        job['finished_at'] = time.time()
+        job['exit_code'] = exit_code
+        job['error'] = error
+        self._secrets.pop(job['id'], None)
+        for key in SENSITIVE_PARAMS:
+            job['params'].pop(key, None)
+
+    # --- API ---
+    def submit(self, params, owner=None):
+        """Masukkan run ke antrian. Return: job_id."""
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'state': QUEUED,
+            'outcome': None,
+            'owner': owner,
+            'params': {k: v for k, v in params.items() if k not in SENSITIVE_PARAMS},
+            'secret_params': _secret_keys(params),
+            'expected_duration': expected_duration(params),
+            'submitted_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'output_csv': None,
+            'exit_code': None,
+            'error': None,
+        }
+        with self._lock:
+            self._jobs.append(job)
+            self._secrets[job['id']] = {k: params[k] for k in SENSITIVE_PARAMS if k in params}
+            self._save()
+        self._dispatch()
+        return job['id']
+
+    def cancel(self, job_id):
+        """Batalkan job antri (langsung) atau yang sedang berjalan (kirim SIGTERM ke k6). Return: True jika ada yang dibatalkan."""
+        with self._lock:
+            job = self._find(job_id)
+            if job is None or job['state'] == FINISHED:
+                return False
+            if job['state'] == QUEUED:
+                self._finish(job, CANCELLED)
+                self._save()
+                return True
+            job['cancel_requested'] = True
+            process = self._processes.get(job_id)
+        if process is not None:
+            process.terminate()  # k6 berhenti dengan graceful, CSV parsial tetap tersimpan
+        return True
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._find(job_id)
+            return self._with_eta(job) if job else None
+
+    def jobs(self):
+        """Semua job (aktif dulu, lalu yang selesai terbaru) lengkap dengan ETA."""
+        with self._lock:
+            active = [self._with_eta(j) for j in self._jobs if j['state'] != FINISHED]
+            finished = [dict(j) for j in reversed(self._jobs) if j['state'] == FINISHED]
+        return active + finished
+
+    def log_tail(self, job_id):
+        with self._lock:
+            return self._logs.get(job_id, "")
+
+    def _find(self, job_id):
+        return next((j for j in self._jobs if j['id'] == job_id), None)
+
+    # --- ETA ---
+    def _with_eta(self, job):
+        """
+        Simulasi slot run: job berjalan selesai pada started_at + expected_duration, job antri mengisi slot
+        yang paling cepat kosong sesuai urutan. Return: salinan job + eta_start, eta_finish, position (detik epoch).
+        """
+        now = time.time()
+        slots = []
+        for j in self._jobs:
+            if j['state'] == RUNNING:
+                slots.append(max(now, j['started_at'] + j['expected_duration']))
+        slots += [now] * (self.max_running - len(slots))
+        heapq.heapify(slots)
+
+        info = dict(job)
+        if job['state'] == RUNNING:
+            info['eta_start'] = job['started_at']
+            info['eta_finish'] = max(now, job['started_at'] + job['expected_duration'])
+            info['position'] = 0
+        elif job['state'] == QUEUED:
+            position = 0
+            for j in self._jobs:
+                if j['state'] != QUEUED:
+                    continue
+                position += 1
+                start = heapq.heappop(slots)
+                heapq.heappush(slots, start + j['expected_duration'])
+                if j['id'] == job['id']:
+                    info['eta_start'] = start
+                    info['eta_finish'] = start + j['expected_duration']
+                    info['position'] = position
+                    break
+        return info
+
+    # --- Worker ---
+    def _dispatch(self):
+        """Jalankan job antri berikutnya selama slot run paralel masih tersedia."""
+        with self._lock:
+            running = sum(1 for j in self._jobs if j['state'] == RUNNING)
+            to_start = []
+            for job in self._jobs:
+                if running >= self.max_running:
+                    break
+                if job['state'] == QUEUED:
+                    job['state'] = RUNNING
+                    job['started_at'] = time.time()
+                    to_start.append(job)
+                    running += 1
+            if to_start:
+                self._save()
+        for job in to_start:
+            threading.Thread(target=self._run_job, args=(job,), daemon=True).start()
+
+    def _run_job(self, job):
+        with self._lock:
+            secrets = self._secrets.get(job['id'], {})
+        params = {**{k: RUN_PARAM_DEFAULTS[k] for k in SENSITIVE_PARAMS}, **job['params'], **secrets}
+        stop_rollups = None
+        try:
+            output_csv = build_output_path(params.get('project_name'), params.get('csv_name'))
+            save_run_metadata(output_csv, {
+                'job_id': job['id'],
+                'target_url': params['target_url'],
+                'method': params['method'],
+                'test_type': params['test_type'],
+                'vus': params['vus'],
+                'duration': params['duration'],
+                'expected_status': params['expected_status'],
+                'threshold_p95': params['threshold_p95'],
+                'data_file': os.path.basename(params['data_file']) if params.get('data_file') else None,
+                'data_mode': params.get('data_mode') if params.get('data_file') else None,
+                'started_at': datetime.now().isoformat(timespec='seconds'),
+                'stages': get_scenario_stages(params['test_type'], params['vus'], params['duration']),
+            })
+            # Soak: agregat per menit ditulis selama tes berjalan (halaman hasil tidak perlu load CSV penuh).
+            # Writer dimulai sebelum k6 membuat CSV agar sidecar-nya tidak sempat dibangun dari CSV setengah jadi.
+            if params['test_type'] == 'soak':
+                from .rollups import start_rollup_writer  # numpy/pandas hanya dimuat jika ada job soak
+                stop_rollups = start_rollup_writer(output_csv)
+            cmd = ["k6", "run", "--out", f"csv={output_csv}", "k6/main.js"]
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1,
+                                       env=build_k6_env(params), encoding='utf-8')
+        except Exception as e:
+            if stop_rollups:
+                stop_rollups()
+            with self._lock:
+                self._finish(job, FAILED, error=f"Error executing k6: {e}")
+                self._save()
+            self._dispatch()
+            return
+
+        with self._lock:
+            job['output_csv'] = output_csv
+            self._processes[job['id']] = process
+            self._logs[job['id']] = ""
+            cancel_requested = job.get('cancel_requested')
+            self._save()
+        if cancel_requested:
+            process.terminate()  # Dibatalkan di antara dispatch dan Popen
+
+        # Sampling CPU/RSS/thread/socket proses k6 selama tes (untuk deteksi generator jenuh)
+        stop_monitor = start_generator_monitor(process.pid, output_csv)
+        try:
+            for line in process.stdout:
+                with self._lock:
+                    self._logs[job['id']] = (self._logs[job['id']] + line)[-LOG_TAIL_CHARS:]
+            exit_code = process.wait()
+        finally:
+            stop_monitor()
+            if stop_rollups:
+                stop_rollups()
+
+        has_results = os.path.exists(output_csv) and os.path.getsize(output_csv) > 0
+        if has_results:
+            get_history_index().add_run(output_csv)
+        else:
+            for sidecar in (run_metadata_path(output_csv), generator_metrics_path(output_csv), rollup_path(output_csv)):
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+
+        with self._lock:
+            if job.get('cancel_requested'):
+                outcome = CANCELLED
+            elif exit_code == 0:
+                outcome = SUCCESS
+            elif has_results:
+                outcome = THRESHOLD_FAILED
+            else:
+                outcome = FAILED
+            self._finish(job, outcome, exit_code=exit_code,
+                         error=None if has_results or outcome == CANCELLED else "Tidak ada data output yang dihasilkan.")
+            if not has_results:
+                job['output_csv'] = None
+            job['log_tail'] = self._logs.pop(job['id'], "")
+            self._processes.pop(job['id'], None)
+            self._save()
+        self._dispatch()
+
+_queue = None
+_queue_lock = threading.Lock()
+
+def get_run_queue():
+    """Singleton antrian run untuk seluruh proses (job yang tersimpan dilanjutkan saat pertama dipanggil)."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            max_runs = int(os.environ.get("K6_DASHBOARD_MAX_RUNS", DEFAULT_MAX_RUNS))
+            _queue = RunQueue(os.environ.get("K6_DASHBOARD_QUEUE_FILE", QUEUE_FILE), max_runs)
+        return _queue
@@ -0,0 +1,104 @@
+import os
+import re
+import json
+import math
+
+# Mirror Python dari getScenarios() di k6/config.js.
+# Dipakai untuk preset zoom per stage, ETA, dan metadata run. Jika config.js diubah, sesuaikan juga di sini.
+
+DURATION_PATTERN = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+DURATION_UNITS = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+
+def parse_duration(text):
+    """Durasi format k6 ('30s', '1m30s', '2h', '500ms', atau angka detik) -> detik (float)."""
+    text = str(text).strip()
+    if not text:
+        return 0.0
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    parts = DURATION_PATTERN.findall(text)
+    if not parts or ''.join(n + u for n, u in parts) != text:
+        raise ValueError(f"Format durasi tidak valid: {text}")
+    return sum(float(n) * DURATION_UNITS[u] for n, u in parts)
+
+def get_scenario_stages(test_type, vus=None, duration=None):
+    """
+    Stage skenario sesuai k6/config.js (MY_VUS & MY_DURATION).
+    Return: list dict {name, start_s, end_s, target} dengan offset dari awal tes.
+    """
+    target = int(vus) if vus else None
+    hold = duration or '1m'
+
+    if test_type == 'smoke':
+        stages = [('Konstan (1 VU)', hold if hold != '1m' else '10s', 1)]
+    elif test_type == 'stress':
+        stages = [
+            ('Ramp-up 50%', '30s', math.ceil((target or 500) * 0.5)),
+            ('Ramp-up 100%', '1m', target or 500),
+            ('Hold (Peak)', hold, target or 500),
+            ('Recovery', '1m', 0),
+        ]
+    elif test_type == 'soak':
+        stages = [
+            ('Ramp-up', '5m', target or 100),
+            ('Hold (Soak)', duration or '4h', target or 100),
+            ('Ramp-down', '5m', 0),
+        ]
+    elif test_type == 'spike':
+        stages = [
+            ('Tenang', '10s', 0),
+            ('Lonjakan', '10s', target or 1000),
+            ('Hold (Peak)', hold, target or 1000),
+            ('Turun', '10s', 0),
+        ]
+    else:  # load (default)
+        stages = [
+            ('Warm-up', '30s', math.ceil((target or 20) * 0.2)),
+            ('Ramp-up', '1m', target or 200),
+            ('Hold (Peak)', hold, target or 200),
+            ('Ramp-down', '30s', 0),
+        ]
+
+    result = []
+    offset = 0.0
+    for name, stage_duration, stage_target in stages:
+        seconds = parse_duration(stage_duration)
+        result.append({'name': name, 'start_s': offset, 'end_s': offset + seconds, 'target': stage_target})
+        offset += seconds
+    return result
+
+def get_total_duration(test_type, vus=None, duration=None):
+    """Total durasi terjadwal skenario (detik, tanpa gracefulRampDown)."""
+    stages = get_scenario_stages(test_type, vus, duration)
+    return stages[-1]['end_s'] if stages else 0.0
+
+# --- Metadata run (sidecar JSON di samping CSV hasil) ---
+
+def run_metadata_path(results_path):
+    """results/Proyek/run.csv -> results/Proyek/run.meta.json"""
+    return os.path.splitext(results_path)[0] + ".meta.json"
+
+def rollup_path(results_path):
+    """results/Proyek/run.csv -> results/Proyek/run.rollup.ndjson (ditulis oleh ui/rollups.py)"""
+    return os.path.splitext(results_path)[0] + ".rollup.ndjson"
+
+def target_metrics_path(results_path):
+    """results/Proyek/run.csv -> results/Proyek/run.target.ndjson (metrik server yang dilampirkan, ui/target_metrics.py)"""
+    return os.path.splitext(results_path)[0] + ".target.ndjson"
+
+def save_run_metadata(results_path, metadata):
+    with open(run_metadata_path(results_path), "w") as f:
+        json.dump(metadata, f, indent=2)
+
+def load_run_metadata(results_path):
+    """Return: dict metadata atau None (run lama / dijalankan manual via CLI)."""
+    path = run_metadata_path(results_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
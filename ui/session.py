@@ -0,0 +1,11 @@
+import uuid
+import streamlit as st
+
+def session_holder_id():
+    """
+    ID unik session Streamlit ini (dibuat sekali per session). Dipakai sebagai holder di ResultCache
+    (bundle yang sedang dibuka tidak di-evict) dan sebagai owner job di antrian run.
+    """
+    if 'cache_holder_id' not in st.session_state:
+        st.session_state.cache_holder_id = uuid.uuid4().hex
+    return st.session_state.cache_holder_id
@@ -1,42 +1,63 @@
 import streamlit as st
 import os
 import datetime
+from .generator_monitor import generator_metrics_path
+from .scenarios import run_metadata_path, rollup_path, target_metrics_path
+from .result_cache import get_result_cache, invalidate_run
+from .history_index import get_history_index
 
-def get_readable_time(filename):
+def get_readable_time(filename, start_time=None):
     """
     Format filename 2026-01-21_15-30-00.csv -> '21 Jan 2026, 15:30'
+    Nama custom (Run1.csv) -> 'Run1 (21 Jan 2026, 15:30)' jika waktu mulai run diketahui.
     """
     clean_name = filename.replace(".csv", "")
     try:
         dt = datetime.datetime.strptime(clean_name, "%Y-%m-%d_%H-%M-%S")
         return dt.strftime("%d %b %Y, %H:%M")
     except Exception:
+        if start_time:
+            return f"{clean_name} ({datetime.datetime.fromtimestamp(start_time).strftime('%d %b %Y, %H:%M')})"
         return clean_name
 
+def render_cache_stats():
+    """Statistik cache hasil tes yang di-share semua user dashboard ini."""
+    stats = get_result_cache().stats()
+    with st.expander("🧠 Cache Hasil (Shared)", expanded=False):
+        used_mb = stats['bytes'] / (1024 * 1024)
+        max_mb = stats['max_bytes'] / (1024 * 1024)
+        st.progress(min(used_mb / max_mb, 1.0) if max_mb else 0.0, text=f"{used_mb:,.0f} / {max_mb:,.0f} MB")
+        c1, c2 = st.columns(2)
+        c1.metric("Hit", stats['hits'])
+        c2.metric("Miss", stats['misses'])
+        c1.metric("Eviction", stats['evictions'])
+        c2.metric("Run di Cache", stats['entries'], help=f"{stats['pinned']} sedang dibuka user")
+        st.caption(f"{stats['coalesced']} request menunggu load yang sama (single-flight).")
+
 def render_sidebar():
     with st.sidebar:
         st.header("📂 Riwayat Tes")
         
-        results_root = "results"
-        if not os.path.exists(results_root): 
-            os.makedirs(results_root)
+        # Index riwayat di memori (tidak rescan folder setiap interaksi)
+        history = get_history_index()
+        results_root = history.root
         
         # Get list of folders (Projects/Test Names)
-        test_folders = [f for f in os.listdir(results_root) if os.path.isdir(os.path.join(results_root, f))]
+        test_folders = history.projects()
         
         if test_folders:
             selected_folder = st.selectbox("Pilih Kategori Tes", test_folders)
             
-            # Get list of files in that folder
+            # Get list of files in that folder - Newest first based on real run start time
             folder_path = os.path.join(results_root, selected_folder)
-            files = [f for f in os.listdir(folder_path) if f.endswith(".csv")]
-            files.sort(reverse=True) # Newest first based on YYYY-MM-DD name
+            runs = {r['filename']: r for r in history.runs(selected_folder)}
+            files = list(runs)
             
             if files:
                 selected_file = st.selectbox(
                     "Pilih Waktu Running", 
                     files, 
-                    format_func=get_readable_time
+                    format_func=lambda f: get_readable_time(f, runs[f]['start_time'])
                 )
                 
                 full_path = os.path.join(folder_path, selected_file)
@@ -62,9 +83,16 @@ def render_sidebar():
                         if st.button("Ya", use_container_width=True, type="primary", key="del_yes"):
                             try:
                                 os.remove(full_path)
+                                # Hapus juga sidecar milik run ini (metrik load generator, metadata skenario, rollup per menit, metrik server)
+                                for sidecar in (generator_metrics_path(full_path), run_metadata_path(full_path), rollup_path(full_path),
+                                                target_metrics_path(full_path)):
+                                    if os.path.exists(sidecar):
+                                        os.remove(sidecar)
+                                invalidate_run(full_path)
                                 # If folder empty, remove it too
                                 if not os.listdir(folder_path):
                                     os.rmdir(folder_path)
+                                history.remove_run(full_path)
                                 st.toast("File berhasil dihapus!", icon="🗑️")
                                 del st.session_state["confirm_delete"]
                                 st.rerun()
@@ -80,6 +108,9 @@ def render_sidebar():
             st.info("Belum ada riwayat tes.")
             st.markdown("Run tes baru untuk melihat history disini.")
         
+        st.markdown("---")
+        render_cache_stats()
+        
         st.markdown("---")
         st.markdown("### 📖 Panduan")
         with st.expander("Cara Penggunaan", expanded=False):
@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import threading
+import importlib
+from .history_index import get_history_index
+from .scenarios import load_run_metadata, rollup_path
+
+# Layanan background saat startup (sekali per proses), agar render pertama tidak menunggu:
+# 1. Scan history index  2. HTTP API  3. Pre-warm modul halaman hasil + bundle run terbaru ke cache.
+# Pre-warm bisa dimatikan lewat env K6_DASHBOARD_PREWARM=0 (mis. container dengan memori sangat kecil).
+PREWARM_HOLDER = "prewarm"
+
+_status = {'started_at': None, 'finished_at': None, 'steps': {}, 'latest_run': None, 'errors': []}
+_thread = None
+_thread_lock = threading.Lock()
+
+def _step(name, func):
+    """Jalankan satu langkah startup; catat durasinya. Error dicatat, langkah berikutnya tetap jalan."""
+    t0 = time.perf_counter()
+    try:
+        return func()
+    except Exception as e:
+        _status['errors'].append(f"{name}: {e}")
+        print(f"Startup '{name}' gagal: {e}", file=sys.stderr)
+        return None
+    finally:
+        _status['steps'][name] = round(time.perf_counter() - t0, 3)
+
+def find_latest_run(index):
+    """Run terbaru lintas proyek (berdasarkan waktu mulai run). Return: path CSV atau None."""
+    latest = None
+    for project in index.projects():
+        runs = index.runs(project)
+        if runs and (latest is None or runs[0]['start_time'] > latest['start_time']):
+            latest = runs[0]
+    return latest['path'] if latest else None
+
+def prewarm_run(path):
+    """Muat bundle run ke cache bersama lalu lepas lagi (tidak di-pin; tetap bisa di-evict)."""
+    from .result_cache import get_result_cache, run_cache_key
+    from .rollups import is_windowed_run, build_rollups, build_soak_bundle
+
+    cache = get_result_cache()
+    if is_windowed_run(path, load_run_metadata(path)):
+        if not os.path.exists(rollup_path(path)) and not build_rollups(path):
+            return  # Soak masih berjalan: sidecar diisi writer-nya
+        key = run_cache_key(path, rollup_path(path))
+        cache.acquire(key, lambda: build_soak_bundle(path), PREWARM_HOLDER)
+    else:
+        from .utils import build_run_bundle
+        key = run_cache_key(path)
+        cache.acquire(key, lambda: build_run_bundle(path), PREWARM_HOLDER)
+    cache.release(key, PREWARM_HOLDER)
+
+def _run_startup():
+    _status['started_at'] = time.time()
+    index = _step('history_index', get_history_index)
+
+    def start_api():
+        from .api import start_api_server
+        start_api_server()
+    _step('api', start_api)
+
+    if os.environ.get("K6_DASHBOARD_PREWARM", "1") != "0":
+        # Modul halaman hasil (pandas, altair) di-import di sini, bukan saat render pertama
+        _step('results_modules', lambda: importlib.import_module('.results', __package__))
+        latest = find_latest_run(index) if index else None
+        if latest:
+            _status['latest_run'] = latest
+            _step('latest_run', lambda: prewarm_run(latest))
+    _status['finished_at'] = time.time()
+
+def start_background_startup():
+    """Mulai thread startup sekali per proses (rerun Streamlit berikutnya tidak mengulang)."""
+    global _thread
+    with _thread_lock:
+        if _thread is None:
+            _thread = threading.Thread(target=_run_startup, daemon=True, name="k6-dashboard-startup")
+            _thread.start()
+        return _thread
+
+def get_startup_status():
+    """Ringkasan startup: durasi tiap langkah (detik), run yang di-pre-warm, dan error jika ada."""
+    return {**_status, 'steps': dict(_status['steps']), 'errors': list(_status['errors']), 'done': _status['finished_at'] is not None}
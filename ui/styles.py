@@ -0,0 +1,58 @@
+import streamlit as st
+
+def apply_custom_css():
+    st.markdown("""
+    <style>
+        .main .block-container { padding-top: 2rem; padding-bottom: 3rem; }
+        .stButton>button { width: 100%; border-radius: 8px; font-weight: 600; }
+        [data-testid="stMetricValue"] { font-size: 1.8rem; color: #0E61FE; }
+        
+        /* Metric Card - Adapted to Theme */
+        .metric-card { 
+            background-color: var(--secondary-background-color); 
+            color: var(--text-color); 
+            padding: 15px; 
+            border-radius: 10px; 
+            border: 1px solid rgba(128, 128, 128, 0.2); 
+            margin-bottom: 10px; 
+        }
+        
+        /* Explanation Box - Adapted to Theme */
+        .explanation-box { 
+            background-color: var(--secondary-background-color); 
+            color: var(--text-color); 
+            border-left: 5px solid #0E61FE; 
+            padding: 15px; 
+            border-radius: 5px; 
+            font-size: 0.9em; 
+            margin-bottom: 20px; 
+        }
+        
+        h3 { font-size: 1.3rem; font-weight: 700; margin-top: 20px; color: var(--text-color);}
+        
+        /* Analysis Card - Adapted to Theme */
+        .analysis-card { 
+            background-color: var(--secondary-background-color); 
+            color: var(--text-color); 
+            padding: 20px; 
+            border-radius: 10px; 
+            border-left: 6px solid #ff4b4b; 
+            box-shadow: 0 2px 4px rgba(0,0,0,0.2); 
+        }
+        .analysis-card h4 { color: var(--text-color); margin-top: 0; font-weight: bold; }
+        .analysis-card span { color: var(--text-color); }
+        .analysis-card small { color: var(--text-color); opacity: 0.8; }
+        
+        /* Stable Card - Adapted to Theme */
+        .stable-card { 
+            background-color: var(--secondary-background-color); 
+            color: var(--text-color); 
+            padding: 20px; 
+            border-radius: 10px; 
+            border-left: 6px solid #09ab3b; 
+            box-shadow: 0 2px 4px rgba(0,0,0,0.2); 
+        }
+        .stable-card h4 { color: var(--text-color); margin-top: 0; font-weight: bold; }
+        .stable-card p, .stable-card li { color: var(--text-color); }
+    </style>
+    """, unsafe_allow_html=True)
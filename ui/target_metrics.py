@@ -0,0 +1,454 @@
+import io
+import os
+import re
+import sys
+import json
+import math
+import argparse
+import numpy as np
+import pandas as pd
+from .scenarios import target_metrics_path
+
+# Metrik sistem yang dites (CPU, memori, koneksi DB, antrian, ...) yang dilampirkan ke sebuah run,
+# lalu disejajarkan dengan agregat k6 per jendela untuk menentukan resource yang jenuh lebih dulu.
+# Format masukan:
+#   - CSV / NDJSON wide : timestamp + satu kolom per metrik
+#   - CSV / NDJSON long : timestamp, metric, value
+#   - Prometheus text   : sampel dengan timestamp (ms), atau baris penanda "# scrape <unix detik>" sebelum tiap scrape
+# Timestamp: epoch (s/ms/us/ns, dideteksi otomatis) atau ISO 8601 (tanpa zona waktu = UTC). Jam server harus sinkron (NTP).
+# Disimpan ternormalisasi (wide, epoch detik) sebagai sidecar results/<proyek>/<run>.target.ndjson.
+
+TARGET_FORMATS = ('csv', 'ndjson', 'prometheus')
+TIMESTAMP_COLUMNS = ('timestamp', 'time', 'ts', 'datetime', 'date')
+MAX_SERIES = 40             # Series terbanyak yang disimpan (yang paling bervariasi)
+
+MIN_WINDOW_S = 5            # Sama dengan rollup 5 detik diagnosis; diperbesar jika interval scrape lebih jarang
+MAX_LAG_S = 300             # Resource boleh mendahului gejala sampai 5 menit ...
+MAX_LAG_WINDOWS = 12        # ... dan maksimal 12 jendela
+CORR_MIN_WINDOWS = 8
+CORR_ALPHA = 0.01
+
+UTIL_LIMIT = 0.9            # Utilisasi >= 90% = jenuh
+PLATEAU_SHARE = 0.95        # Metrik level: sudah mencapai >= 95% dari total kenaikannya ...
+PLATEAU_MIN_WINDOWS = 3     # ... bertahan minimal 3 jendela berturut-turut ...
+PLATEAU_LOAD_GROWTH = 1.1   # ... sementara VUs masih naik >= 10% (resource mentok, beban belum)
+MIN_RISE = 0.2              # Metrik level harus naik >= 20% dari baseline agar dianggap bisa jenuh
+
+UTILIZATION_PATTERN = re.compile(r'cpu|mem|util|usage|percent|pct|ratio|saturation', re.I)
+PERCENT_PATTERN = re.compile(r'percent|pct|%', re.I)
+INVERTED_PATTERN = re.compile(r'free|avail|idle', re.I)  # Makin kecil makin jenuh
+PROM_SAMPLE = r'^(?P<name>[A-Za-z_:][A-Za-z0-9_:]*)(?P<labels>\{[^}]*\})?\s+(?P<value>\S+)(?:\s+(?P<ts>-?\d+))?$'
+PROM_SCRAPE_MARKER = r'^#\s*scrape\s+(?P<scrape>\d+(?:\.\d+)?)$'
+
+# --- Parsing & penyimpanan ---
+
+def detect_format(filename, text):
+    """Tebak format dari ekstensi file, lalu dari baris pertama."""
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext in ('.prom', '.metrics', '.txt'):
+        return 'prometheus'
+    if ext in ('.ndjson', '.jsonl', '.json'):
+        return 'ndjson'
+    if ext == '.csv':
+        return 'csv'
+    first = next((line.strip() for line in text.splitlines() if line.strip()), '')
+    if first.startswith(('{', '[')):
+        return 'ndjson'
+    if first.startswith('#') or re.match(PROM_SAMPLE, first):
+        return 'prometheus'
+    return 'csv'
+
+def to_epoch_seconds(values):
+    """Kolom timestamp (epoch s/ms/us/ns atau string tanggal) -> ndarray epoch detik."""
+    numeric = pd.to_numeric(values, errors='coerce')
+    if numeric.notna().all():
+        seconds = numeric.to_numpy(dtype=float)
+        scale = np.median(np.abs(seconds)) if len(seconds) else 0
+        for limit, divisor in ((1e17, 1e9), (1e14, 1e6), (1e11, 1e3)):
+            if scale > limit:
+                return seconds / divisor
+        return seconds
+    parsed = pd.to_datetime(values, utc=True, errors='coerce', format='mixed')
+    if parsed.isna().all():
+        raise ValueError("Kolom timestamp tidak bisa dibaca (gunakan epoch atau ISO 8601).")
+    return ((parsed - pd.Timestamp(0, tz='UTC')) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+
+def _pivot_long(timestamps, names, values):
+    """Format long (timestamp, nama series, nilai) -> wide."""
+    long = pd.DataFrame({'timestamp': timestamps, 'series': names, 'value': values})
+    wide = long.pivot_table(index='timestamp', columns='series', values='value', aggfunc='mean')
+    return wide.rename_axis(columns=None).reset_index()
+
+def _parse_tabular(frame):
+    columns = {str(c).lower(): c for c in frame.columns}
+    ts_col = next((columns[c] for c in TIMESTAMP_COLUMNS if c in columns), None)
+    if ts_col is None:
+        raise ValueError(f"Kolom timestamp tidak ditemukan (salah satu dari: {', '.join(TIMESTAMP_COLUMNS)}).")
+    timestamps = to_epoch_seconds(frame[ts_col])
+    if 'metric' in columns and 'value' in columns:
+        return _pivot_long(timestamps, frame[columns['metric']].astype(str).to_numpy(),
+                           pd.to_numeric(frame[columns['value']], errors='coerce').to_numpy(dtype=float))
+    values = frame.drop(columns=[ts_col]).apply(pd.to_numeric, errors='coerce')
+    values.columns = [str(c) for c in values.columns]
+    values.insert(0, 'timestamp', timestamps)
+    return values
+
+def _parse_prometheus(text):
+    lines = pd.Series(text.splitlines(), dtype=object).str.strip()
+    lines = lines[lines != ''].reset_index(drop=True)
+    # Scrape tanpa timestamp per sampel: pakai penanda "# scrape <unix>" terakhir sebelum baris tsb.
+    scrape = pd.to_numeric(lines.str.extract(PROM_SCRAPE_MARKER)['scrape'], errors='coerce').ffill()
+    samples = lines.str.extract(PROM_SAMPLE)
+    is_sample = samples['name'].notna() & ~lines.str.startswith('#')
+    samples = samples[is_sample]
+    if samples.empty:
+        raise ValueError("Tidak ada sampel metrik Prometheus di file ini.")
+    timestamps = (pd.to_numeric(samples['ts'], errors='coerce') / 1000).fillna(scrape[is_sample])
+    if timestamps.isna().any():
+        raise ValueError("Sampel Prometheus tanpa timestamp: sertakan timestamp (ms) per sampel, "
+                         "atau baris '# scrape <unix detik>' sebelum tiap scrape.")
+    names = (samples['name'] + samples['labels'].fillna('')).to_numpy()
+    values = pd.to_numeric(samples['value'], errors='coerce').to_numpy(dtype=float)
+    return _pivot_long(timestamps.to_numpy(dtype=float), names, values)
+
+def _series_base_name(column):
+    return column.split('{', 1)[0]
+
+def normalize_target_metrics(frame):
+    """
+    Urutkan, gabungkan timestamp kembar, ubah counter (*_total) menjadi rate per detik,
+    buang series konstan, dan batasi ke MAX_SERIES series paling bervariasi.
+    """
+    frame = frame.replace([np.inf, -np.inf], np.nan).dropna(subset=['timestamp'])
+    frame = frame.groupby('timestamp', as_index=False).mean().sort_values('timestamp', ignore_index=True)
+    timestamps = frame['timestamp']
+    series = {}
+    for column in frame.columns.drop('timestamp'):
+        values = frame[column]
+        if _series_base_name(column).endswith('_total'):
+            # Counter Prometheus: nilai kumulatif -> rate per detik (reset counter = nilai turun -> dibuang)
+            present = values.dropna()
+            rate = present.diff() / timestamps[present.index].diff()
+            values = rate.where(rate >= 0).reindex(values.index)
+            column = f"rate({column})"
+        if values.notna().sum() >= 2 and values.std() > 0:
+            series[column] = values
+    if not series:
+        raise ValueError("Tidak ada metrik numerik yang bervariasi di file ini.")
+    values = pd.DataFrame(series)
+    if values.shape[1] > MAX_SERIES:
+        variation = values.std() / values.mean().abs().replace(0, np.nan)
+        values = values[variation.fillna(values.std()).nlargest(MAX_SERIES).index]
+    values.insert(0, 'timestamp', timestamps)
+    return values.dropna(how='all', subset=values.columns[1:]).reset_index(drop=True)
+
+def parse_target_metrics(data, filename=None, fmt=None):
+    """Bytes/str export metrik target -> DataFrame wide ternormalisasi. Raise ValueError jika format tidak valid."""
+    text = data.decode('utf-8-sig') if isinstance(data, bytes) else data
+    fmt = fmt or detect_format(filename, text)
+    if fmt not in TARGET_FORMATS:
+        raise ValueError(f"Format tidak dikenal: {fmt} (pilihan: {', '.join(TARGET_FORMATS)}).")
+    try:
+        if fmt == 'prometheus':
+            frame = _parse_prometheus(text)
+        elif fmt == 'ndjson':
+            stripped = text.lstrip()
+            frame = pd.read_json(io.StringIO(text), lines=not stripped.startswith('['),
+                                 convert_dates=False, keep_default_dates=False)
+            frame = _parse_tabular(frame)
+        else:
+            frame = _parse_tabular(pd.read_csv(io.StringIO(text)))
+    except (pd.errors.ParserError, pd.errors.EmptyDataError) as e:
+        raise ValueError(f"File {fmt} tidak valid: {e}")
+    if frame.empty:
+        raise ValueError("File tidak berisi sampel metrik.")
+    return normalize_target_metrics(frame)
+
+def save_target_metrics(results_path, frame):
+    path = target_metrics_path(results_path)
+    tmp_path = path + ".tmp"
+    frame.to_json(tmp_path, orient='records', lines=True)
+    os.replace(tmp_path, path)
+
+def attach_target_metrics(results_path, data, filename=None, fmt=None):
+    """Parse export metrik target lalu simpan sebagai sidecar run (menimpa lampiran sebelumnya). Return: DataFrame."""
+    frame = parse_target_metrics(data, filename, fmt)
+    save_target_metrics(results_path, frame)
+    return frame
+
+def remove_target_metrics(results_path):
+    path = target_metrics_path(results_path)
+    if os.path.exists(path):
+        os.remove(path)
+
+def load_target_metrics(results_path):
+    """Return: DataFrame (timestamp epoch detik + satu kolom per series) atau None jika run belum punya lampiran."""
+    path = target_metrics_path(results_path)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+    frame = pd.read_json(path, lines=True, convert_dates=False, keep_default_dates=False)
+    return frame if 'timestamp' in frame and frame.shape[1] > 1 else None
+
+# --- Penyejajaran dengan agregat k6 ---
+
+def choose_window(target_df, base_window_s):
+    """Lebar jendela = kelipatan jendela k6 yang tidak lebih rapat dari interval scrape (median)."""
+    interval = float(np.median(np.diff(target_df['timestamp'].to_numpy()))) if len(target_df) > 1 else base_window_s
+    return int(base_window_s * max(1, math.ceil(interval / base_window_s - 1e-9)))
+
+def k6_window_series(df, run_start, window_s):
+    """P95, error rate (%) dan VUs per jendela dari CSV k6 (DataFrame hasil load_test_results)."""
+    rel = (df['timestamp'] - run_start).dt.total_seconds().to_numpy()
+    bucket = np.maximum(rel // window_s, 0).astype(np.int64)
+    names = df['metric_name'].to_numpy()
+    values = pd.to_numeric(df['metric_value'], errors='coerce').to_numpy(dtype=float)
+    n_windows = int(bucket.max()) + 1 if len(bucket) else 0
+
+    reqs = names == 'http_req_duration'
+    p95 = pd.Series(values[reqs]).groupby(bucket[reqs]).quantile(0.95).reindex(range(n_windows))
+    failed = names == 'http_req_failed'
+    total = np.bincount(bucket[failed], minlength=n_windows)
+    errors = np.bincount(bucket[failed], weights=values[failed], minlength=n_windows)
+    vus = names == 'vus'
+    vus_max = pd.Series(values[vus]).groupby(bucket[vus]).max().reindex(range(n_windows)).ffill()
+    return pd.DataFrame({
+        'start_s': np.arange(n_windows) * window_s,
+        'p95': p95.to_numpy(),
+        'error_rate': np.where(total > 0, errors / np.maximum(total, 1) * 100, np.nan),
+        'vus': vus_max.to_numpy(),
+    })
+
+def align_target_metrics(target_df, run_start_s, n_windows, window_s):
+    """
+    Rata-rata tiap series per jendela k6 (semua series sekaligus via satu bincount pada index jendela x series).
+    Jendela kosong (jitter scrape) diisi nilai jendela sebelumnya, maksimal satu jendela.
+    """
+    columns = list(target_df.columns.drop('timestamp'))
+    bucket = np.floor((target_df['timestamp'].to_numpy(dtype=float) - run_start_s) / window_s)
+    inside = (bucket >= 0) & (bucket < n_windows)
+    values = target_df[columns].to_numpy(dtype=float)[inside]
+    flat = (bucket[inside].astype(np.int64)[:, None] * len(columns) + np.arange(len(columns))).ravel()
+    valid = ~np.isnan(values.ravel())
+    size = n_windows * len(columns)
+    sums = np.bincount(flat[valid], weights=values.ravel()[valid], minlength=size)
+    counts = np.bincount(flat[valid], minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(counts > 0, sums / counts, np.nan).reshape(n_windows, len(columns))
+    return pd.DataFrame(means, columns=columns).ffill(limit=1)
+
+def lagged_correlation(resources, target, max_lag):
+    """
+    Korelasi Pearson resource[t] vs target[t + lag] untuk lag 0..max_lag jendela (resource mendahului gejala).
+    resources: ndarray [jendela x series], target: ndarray [jendela].
+    Return: (r, p_value) masing-masing [lag x series]. p-value memakai Fisher z dengan koreksi Bonferroni atas
+    jumlah lag yang diuji. Series yang sama-sama mengikuti ramp beban akan berkorelasi; karena itu resource
+    "jenuh pertama" juga harus lolos deteksi saturasi, bukan korelasi saja.
+    """
+    n_windows, n_series = resources.shape
+    r = np.full((max_lag + 1, n_series), np.nan)
+    p_value = np.ones((max_lag + 1, n_series))
+    for lag in range(min(max_lag, n_windows - CORR_MIN_WINDOWS) + 1):
+        x = resources[:n_windows - lag]
+        y = target[lag:, None]
+        mask = ~np.isnan(x) & ~np.isnan(y)
+        count = mask.sum(axis=0)
+        safe = np.maximum(count, 1)
+        dx = np.where(mask, x - np.where(mask, x, 0).sum(axis=0) / safe, 0)
+        dy = np.where(mask, y - np.where(mask, y, 0).sum(axis=0) / safe, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            r_lag = (dx * dy).sum(axis=0) / np.sqrt((dx ** 2).sum(axis=0) * (dy ** 2).sum(axis=0))
+        z = np.arctanh(np.clip(np.nan_to_num(r_lag), -0.999999, 0.999999)) * np.sqrt(np.maximum(count - 3, 1))
+        p_lag = np.array([math.erfc(abs(v) / math.sqrt(2)) for v in z])
+        usable = (count >= CORR_MIN_WINDOWS) & ~np.isnan(r_lag)
+        r[lag] = np.where(usable, r_lag, np.nan)
+        p_value[lag] = np.where(usable, np.minimum(p_lag * (max_lag + 1), 1.0), 1.0)
+    return r, p_value
+
+def detect_saturation(values, name, vus, window_s):
+    """
+    Kapan sebuah series jenuh (detik dari awal tes) atau None.
+    - Utilisasi (nama cpu/mem/util/..., nilai 0-1 atau 0-100%): >= 90% bertahan PLATEAU_MIN_WINDOWS jendela.
+    - Level (koneksi, antrian, thread, ...): mentok di puncaknya sementara VUs masih naik.
+    Series free/available/idle dibalik (makin kecil makin jenuh).
+    """
+    finite = values[~np.isnan(values)]
+    direction = -1 if INVERTED_PATTERN.search(name) else 1
+    result = {'kind': 'level', 'limit': None, 'peak': None, 'saturated_at_s': None}
+    if len(finite) == 0:
+        return result  # Tidak ada sampel di dalam jendela run (mis. pod yang hanya hidup sebelum / sesudah tes)
+    result['peak'] = float(finite.max() if direction > 0 else finite.min())
+    if len(finite) < PLATEAU_MIN_WINDOWS:
+        return result
+
+    if UTILIZATION_PATTERN.search(name) and finite.min() >= 0:
+        scale = 1.0 if finite.max() <= 1.0 + 1e-9 else 100.0 if PERCENT_PATTERN.search(name) and finite.max() <= 100 + 1e-6 else None
+        if scale:
+            limit = UTIL_LIMIT * scale if direction > 0 else (1 - UTIL_LIMIT) * scale
+            result.update(kind='utilization', limit=limit)
+            hot = values >= limit if direction > 0 else values <= limit
+            onset = _sustained_onset(hot)
+            if onset is not None:
+                result['saturated_at_s'] = onset * window_s
+            return result
+
+    level = values * direction
+    head = level[:max(PLATEAU_MIN_WINDOWS, len(level) // 5)]
+    baseline = np.nanmedian(head) if (~np.isnan(head)).any() else np.nan
+    peak = np.nanmax(level)
+    if np.isnan(baseline) or peak - baseline <= MIN_RISE * abs(baseline) or peak <= baseline:
+        return result
+    with np.errstate(invalid='ignore'):
+        hot = (level - baseline) / (peak - baseline) >= PLATEAU_SHARE
+    onset = _sustained_onset(hot)
+    if onset is None or vus is None:
+        return result
+    load_at_onset = vus[onset]
+    if np.isnan(load_at_onset) or np.nanmax(vus[onset:]) < max(load_at_onset, 1) * PLATEAU_LOAD_GROWTH:
+        return result  # Plateau karena beban juga datar, bukan karena resource mentok
+    result['saturated_at_s'] = onset * window_s
+    return result
+
+def _sustained_onset(hot):
+    """Index jendela pertama dari PLATEAU_MIN_WINDOWS jendela 'hot' berturut-turut, atau None."""
+    if len(hot) < PLATEAU_MIN_WINDOWS:
+        return None
+    runs = np.lib.stride_tricks.sliding_window_view(np.asarray(hot, dtype=bool), PLATEAU_MIN_WINDOWS).all(axis=1)
+    return int(np.argmax(runs)) if runs.any() else None
+
+def get_target_analysis(target_df, k6_series, run_start_s, window_s, symptom_s=None):
+    """
+    Sejajarkan metrik target dengan agregat k6 per jendela, hitung korelasi ber-lag tiap resource terhadap
+    P95 & error rate, dan tentukan resource yang jenuh lebih dulu.
+    k6_series: DataFrame per jendela kontigu dari detik 0 (start_s, p95, error_rate, vus).
+    Return: dict {window_s, overlap_windows, resources, first_saturated, strongest, symptom_s, leads_symptom, aligned}
+    atau None jika tidak ada data.
+    """
+    if target_df is None or k6_series is None or k6_series.empty:
+        return None
+    n_windows = len(k6_series)
+    aligned = align_target_metrics(target_df, run_start_s, n_windows, window_s)
+    aligned = aligned.loc[:, aligned.notna().any()]  # Series tanpa sampel di jendela run tidak bisa dianalisis
+    overlap = int(aligned.notna().any(axis=1).sum())
+    analysis = {
+        'window_s': window_s,
+        'overlap_windows': overlap,
+        'resources': [],
+        'first_saturated': None,
+        'strongest': None,
+        'symptom_s': symptom_s,
+        'leads_symptom': None,
+        'aligned': pd.concat([k6_series[['start_s', 'p95', 'error_rate']].reset_index(drop=True), aligned], axis=1),
+    }
+    if overlap < CORR_MIN_WINDOWS:
+        return analysis
+
+    max_lag = max(1, min(MAX_LAG_WINDOWS, MAX_LAG_S // window_s))
+    matrix = aligned.to_numpy(dtype=float)
+    correlations = {}
+    for target in ('p95', 'error_rate'):
+        y = k6_series[target].to_numpy(dtype=float)
+        if np.nanstd(y) > 0:
+            correlations[target] = lagged_correlation(matrix, y, max_lag)
+    vus = k6_series['vus'].to_numpy(dtype=float) if 'vus' in k6_series else None
+
+    for i, name in enumerate(aligned.columns):
+        direction = -1 if INVERTED_PATTERN.search(name) else 1
+        entry = {'name': name, **detect_saturation(matrix[:, i], name, vus, window_s), 'related': False}
+        for target in ('p95', 'error_rate'):
+            entry[target] = None
+            if target not in correlations:
+                continue
+            r, p_value = correlations[target]
+            if np.isnan(r[:, i]).all():
+                continue
+            # Lag dengan korelasi terkuat searah "makin jenuh -> makin buruk"
+            best = int(np.nanargmax(np.nan_to_num(r[:, i] * direction, nan=-np.inf)))
+            entry[target] = {'r': float(r[best, i]), 'lag_s': best * window_s, 'p_value': float(p_value[best, i])}
+            if p_value[best, i] < CORR_ALPHA and r[best, i] * direction > 0:
+                entry['related'] = True
+        analysis['resources'].append(entry)
+
+    def strength(entry):
+        return max(abs(entry[t]['r']) for t in ('p95', 'error_rate') if entry[t]) if entry['p95'] or entry['error_rate'] else 0.0
+
+    for entry in analysis['resources']:
+        entry['strength'] = strength(entry)
+    analysis['resources'].sort(key=lambda e: (e['saturated_at_s'] is None, e['saturated_at_s'] or 0, not e['related'], -e['strength']))
+    related = [e for e in analysis['resources'] if e['related']]
+    saturated = [e for e in related if e['saturated_at_s'] is not None]
+    if saturated:
+        analysis['first_saturated'] = saturated[0]
+        if symptom_s is not None:
+            analysis['leads_symptom'] = saturated[0]['saturated_at_s'] <= symptom_s
+    if related:
+        analysis['strongest'] = max(related, key=lambda e: e['strength'])
+    return analysis
+
+def get_run_target_analysis(results_path, df, run_start, diagnosis=None):
+    """Analisis metrik target untuk run biasa (CSV k6 sudah di-load). Return: dict atau None jika tidak ada lampiran."""
+    target_df = load_target_metrics(results_path)
+    if target_df is None or df.empty:
+        return None
+    window_s = choose_window(target_df, MIN_WINDOW_S)
+    symptom_s = None
+    if diagnosis and diagnosis.get('status') == 'broken':
+        # Gejala pertama: onset saturasi latency jika ada, jika tidak breaking point
+        symptom_s = diagnosis.get('saturation_rel_time')
+        if symptom_s is None:
+            symptom_s = diagnosis['rel_time']
+    return get_target_analysis(target_df, k6_window_series(df, run_start, window_s), run_start.timestamp(), window_s, symptom_s)
+
+def describe_resource(entry):
+    """Ringkasan satu baris korelasi resource (dipakai kartu diagnosis, tabel, CLI)."""
+    parts = []
+    for target, label in (('p95', 'P95'), ('error_rate', 'error rate')):
+        corr = entry.get(target)
+        if corr:
+            p_text = "p<0.001" if corr['p_value'] < 0.001 else f"p={corr['p_value']:.2g}"
+            parts.append(f"r={corr['r']:+.2f} dengan {label} (lag {corr['lag_s']}s, {p_text})")
+    return "; ".join(parts) or "tidak cukup data untuk korelasi"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lampirkan metrik server (target) ke run k6 dan cari resource yang jenuh lebih dulu.")
+    parser.add_argument("csv", help="CSV hasil k6 (results/<proyek>/<run>.csv)")
+    parser.add_argument("metrics", nargs="?", help="Export metrik target (CSV, NDJSON, atau Prometheus text). Kosong = analisis lampiran yang ada")
+    parser.add_argument("--format", choices=TARGET_FORMATS, help="Paksa format (default: dari ekstensi / isi file)")
+    parser.add_argument("--remove", action="store_true", help="Hapus lampiran metrik target dari run ini")
+    parser.add_argument("--json", action="store_true", help="Cetak hasil analisis sebagai JSON")
+    args = parser.parse_args(argv)
+
+    if args.remove:
+        remove_target_metrics(args.csv)
+        print(f"Lampiran metrik target dihapus dari {os.path.basename(args.csv)}")
+        return 0
+    if args.metrics:
+        with open(args.metrics, "rb") as f:
+            try:
+                frame = attach_target_metrics(args.csv, f.read(), args.metrics, args.format)
+            except ValueError as e:
+                print(f"Gagal membaca metrik target: {e}", file=sys.stderr)
+                return 1
+        print(f"{frame.shape[1] - 1} series, {len(frame):,} sampel dilampirkan ke {os.path.basename(args.csv)}")
+
+    from .utils import load_test_results, get_breaking_point_analysis  # Import lokal: utils mengimpor modul ini
+    df = load_test_results(args.csv)
+    analysis = get_run_target_analysis(args.csv, df, df['timestamp'].iloc[0], get_breaking_point_analysis(df))
+    if analysis is None:
+        print("Run ini belum punya lampiran metrik target.", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps({k: v for k, v in analysis.items() if k != 'aligned'}, indent=2))
+        return 0
+    print(f"Jendela {analysis['window_s']}s, {analysis['overlap_windows']} jendela beririsan dengan run")
+    for entry in analysis['resources']:
+        saturated = f"jenuh detik ke-{entry['saturated_at_s']}" if entry['saturated_at_s'] is not None else "tidak jenuh"
+        flag = "TERKAIT" if entry['related'] else "-"
+        print(f"  [{flag:>7}] {entry['name']:<40} {saturated:<22} {describe_resource(entry)}")
+    first = analysis['first_saturated']
+    print(f"Resource jenuh pertama: {first['name']} (detik ke-{first['saturated_at_s']})" if first
+          else "Tidak ada resource terkait yang jenuh.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
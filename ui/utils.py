@@ -1,67 +1,21 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from .changepoint import detect_change_points
+from .capacity import get_capacity_model
+from .generator_monitor import load_generator_metrics, get_generator_analysis
+from .regression import build_run_sketch
+from .target_metrics import get_run_target_analysis
+from .scenarios import get_scenario_stages, load_run_metadata
 
-def apply_custom_css():
-    st.markdown("""
-    <style>
-        .main .block-container { padding-top: 2rem; padding-bottom: 3rem; }
-        .stButton>button { width: 100%; border-radius: 8px; font-weight: 600; }
-        [data-testid="stMetricValue"] { font-size: 1.8rem; color: #0E61FE; }
-        
-        /* Metric Card - Adapted to Theme */
-        .metric-card { 
-            background-color: var(--secondary-background-color); 
-            color: var(--text-color); 
-            padding: 15px; 
-            border-radius: 10px; 
-            border: 1px solid rgba(128, 128, 128, 0.2); 
-            margin-bottom: 10px; 
-        }
-        
-        /* Explanation Box - Adapted to Theme */
-        .explanation-box { 
-            background-color: var(--secondary-background-color); 
-            color: var(--text-color); 
-            border-left: 5px solid #0E61FE; 
-            padding: 15px; 
-            border-radius: 5px; 
-            font-size: 0.9em; 
-            margin-bottom: 20px; 
-        }
-        
-        h3 { font-size: 1.3rem; font-weight: 700; margin-top: 20px; color: var(--text-color);}
-        
-        /* Analysis Card - Adapted to Theme */
-        .analysis-card { 
-            background-color: var(--secondary-background-color); 
-            color: var(--text-color); 
-            padding: 20px; 
-            border-radius: 10px; 
-            border-left: 6px solid #ff4b4b; 
-            box-shadow: 0 2px 4px rgba(0,0,0,0.2); 
-        }
-        .analysis-card h4 { color: var(--text-color); margin-top: 0; font-weight: bold; }
-        .analysis-card span { color: var(--text-color); }
-        .analysis-card small { color: var(--text-color); opacity: 0.8; }
-        
-        /* Stable Card - Adapted to Theme */
-        .stable-card { 
-            background-color: var(--secondary-background-color); 
-            color: var(--text-color); 
-            padding: 20px; 
-            border-radius: 10px; 
-            border-left: 6px solid #09ab3b; 
-            box-shadow: 0 2px 4px rgba(0,0,0,0.2); 
-        }
-        .stable-card h4 { color: var(--text-color); margin-top: 0; font-weight: bold; }
-        .stable-card p, .stable-card li { color: var(--text-color); }
-    </style>
-    """, unsafe_allow_html=True)
+# Jendela kelas error di sekitar breaking point: bucket resample 5 detik tempat breaking point + 30 detik berikutnya
+ERROR_WINDOW_S = 5 + 30
 
 def get_breaking_point_analysis(df, overall_stats=None):
     """
     Melakukan analisis deep-dive untuk mencari titik retak (Breaking Point).
     IMPROVED: Menggunakan P95 dan tren keseluruhan, bukan latency instan.
+    Saturasi & breaking point dideteksi dengan change-point (PELT + CUSUM), lihat ui/changepoint.py.
     Return: Dict info atau None jika tidak bisa dianalisis.
     """
     try:
@@ -98,6 +52,13 @@ def get_breaking_point_analysis(df, overall_stats=None):
         
         if analysis_df.empty: return None
         
+        # Iterasi per detik & durasi iterasi (untuk cek Little's Law di model kapasitas)
+        iters = df_sorted[df_sorted['metric_name'] == 'iteration_duration']
+        if not iters.empty:
+            iter_resampled = iters.set_index('ts').resample('5s')['metric_value']
+            analysis_df['iteration_rate'] = (iter_resampled.count() / 5).reindex(analysis_df.index).fillna(0)
+            analysis_df['iteration_avg'] = iter_resampled.mean().reindex(analysis_df.index).fillna(0)
+        
         # --- OVERALL STATS (untuk konteks) ---
         total_errors = int(errors_series.sum())
         peak_vu = int(analysis_df['vus'].max())
@@ -105,57 +66,65 @@ def get_breaking_point_analysis(df, overall_stats=None):
         overall_p95 = overall_stats['p95'] if overall_stats else reqs['metric_value'].quantile(0.95)
         overall_avg = overall_stats['avg'] if overall_stats else reqs['metric_value'].mean()
         
-        # 2. Cari Detik Pertama Error Muncul (dengan toleransi > 1 error per 5s)
-        fail_points = analysis_df[analysis_df['errors'] > 1]
+        # 2. Deteksi change-point (PELT + CUSUM) pada rollup P95, error rate, dan RPS per VU
+        change_points = detect_change_points(analysis_df)
+        knee_list = _summarize_knees(change_points, analysis_df)
+        throughput_onset = change_points['throughput']['onset']
+        common = {
+            'peak_vu': peak_vu,
+            'peak_rps': peak_rps,
+            'overall_p95': overall_p95,
+            'overall_avg': overall_avg,
+            'change_points': knee_list,
+            'throughput_knee_vus': int(analysis_df['vus'].iloc[throughput_onset['index']]) if throughput_onset else None,
+            'capacity': get_capacity_model(analysis_df),
+        }
         
-        if fail_points.empty:
-            # PERFECT atau ERROR SANGAT MINOR
-            if total_errors == 0:
-                return {
-                    'status': 'perfect',
-                    'peak_vu': peak_vu,
-                    'peak_rps': peak_rps,
-                    'overall_p95': overall_p95,
-                    'overall_avg': overall_avg
-                }
-            else:
-                # Ada error tapi sangat sporadis (< 1 per 5s)
-                return {
-                    'status': 'minor_errors',
-                    'total_errors': total_errors,
-                    'peak_vu': peak_vu,
-                    'peak_rps': peak_rps,
-                    'overall_p95': overall_p95,
-                    'overall_avg': overall_avg
-                }
+        # 3. Breaking Point = onset kenaikan error rate yang signifikan
+        error_onset = change_points['errors']['onset']
+        if error_onset:
+            bp_idx = error_onset['index']
+            break_confidence = error_onset['confidence']
+        else:
+            # Error tinggi sejak awal tes (tidak ada perubahan yang bisa dideteksi)
+            fail_points = analysis_df[analysis_df['errors'] > 1]
+            error_rate = total_errors / max(analysis_df['rps'].sum() * 5, 1) * 100
+            if fail_points.empty or error_rate < 1:
+                # PERFECT atau ERROR SANGAT MINOR (sporadis)
+                if total_errors == 0:
+                    return {'status': 'perfect', **common}
+                return {'status': 'minor_errors', 'total_errors': total_errors, **common}
+            bp_idx = analysis_df.index.get_loc(fail_points.index[0])
+            break_confidence = None
         
         # BREAKING POINT FOUND
-        bp_time = fail_points.index[0]
-        bp_vus = int(fail_points['vus'].iloc[0])
-        bp_rps = int(fail_points['rps'].iloc[0])
+        bp_time = analysis_df.index[bp_idx]
+        bp_vus = int(analysis_df['vus'].iloc[bp_idx])
+        bp_rps = int(analysis_df['rps'].iloc[bp_idx])
         
-        # 3. Analisis Latency SEBELUM Breaking Point (bukan saat error)
-        # Cari momen dimana latency mulai naik drastis
-        pre_incident_df = analysis_df[analysis_df.index < bp_time]
-        
-        stable_latency = 0
-        degraded_latency = 0
+        # 3b. Saturasi = onset kenaikan P95 (> 2x plateau) SEBELUM breaking point
+        latency_onset = change_points['latency']['onset']
         saturation_point = None
+        saturation_confidence = None
+        stable_latency = change_points['latency']['baseline']
+        degraded_latency = 0
+        if latency_onset and latency_onset['index'] < bp_idx:
+            saturation_point = analysis_df.index[latency_onset['index']]
+            saturation_confidence = latency_onset['confidence']
+            stable_latency = latency_onset['before']
+            degraded_latency = latency_onset['level']
         
-        if len(pre_incident_df) > 2:
-            # Ambil latency P95 rata-rata di 1/3 awal tes (baseline)
-            first_third = pre_incident_df.head(len(pre_incident_df) // 3)
-            stable_latency = first_third['latency_p95'].mean() if not first_third.empty else 0
-            
-            # Cari titik dimana latency > 2x baseline (Saturation Point)
-            if stable_latency > 0:
-                saturated = pre_incident_df[pre_incident_df['latency_p95'] > (stable_latency * 2)]
-                if not saturated.empty:
-                    saturation_point = saturated.index[0]
-                    degraded_latency = saturated['latency_p95'].iloc[0]
-        
-        # 4. Tentukan Pola Kejadian
-        if saturation_point and saturation_point < bp_time:
+        # 4. Kelas error dominan di sekitar breaking point (bucket breaking point + 30 detik berikutnya)
+        error_class = None
+        error_class_share = 0
+        window = fails[(fails['ts'] >= bp_time) & (fails['ts'] < bp_time + pd.Timedelta(seconds=ERROR_WINDOW_S)) & (fails['metric_value'] == 1)]
+        if not window.empty:
+            class_counts = pd.Series(classify_errors(window)).value_counts()
+            error_class = class_counts.index[0]
+            error_class_share = class_counts.iloc[0] / class_counts.sum() * 100
+
+        # 5. Tentukan Pola Kejadian
+        if saturation_point is not None:
             trend = "degradasi_bertahap"  # Latency naik dulu, baru error
             sat_vus = int(analysis_df.loc[saturation_point, 'vus'])
         else:
@@ -167,23 +136,447 @@ def get_breaking_point_analysis(df, overall_stats=None):
             'status': 'broken',
             'timestamp': bp_time,
             'rel_time': (bp_time - analysis_df.index[0]).total_seconds(),
+            'saturation_rel_time': (saturation_point - analysis_df.index[0]).total_seconds() if saturation_point is not None else None,
             'vus_at_error': bp_vus,
             'vus_at_saturation': sat_vus,
             'rps': bp_rps,
             'stable_latency': stable_latency,
             'degraded_latency': degraded_latency,
-            'overall_p95': overall_p95,
-            'overall_avg': overall_avg,
             'total_errors': total_errors,
-            'peak_vu': peak_vu,
-            'peak_rps': peak_rps,
-            'pattern': trend
+            'pattern': trend,
+            'break_confidence': break_confidence,
+            'saturation_confidence': saturation_confidence,
+            'error_class': error_class,
+            'error_class_share': error_class_share,
+            **common
         }
             
     except Exception as e:
         print(f"Error analaysis: {e}")
         return None
 
+CHANGE_POINT_SERIES = {
+    'latency': 'Latency P95',
+    'errors': 'Error Rate',
+    'throughput': 'RPS per VU',
+}
+
+def _summarize_knees(change_points, analysis_df):
+    """Ubah hasil detect_change_points jadi list baris (waktu relatif & VU) untuk UI/PDF."""
+    start = analysis_df.index[0]
+    rows = []
+    for key, label in CHANGE_POINT_SERIES.items():
+        for knee in change_points[key]['knees']:
+            ts = analysis_df.index[knee['index']]
+            rows.append({
+                'series': label,
+                'rel_time': int((ts - start).total_seconds()),
+                'vus': int(analysis_df['vus'].iloc[knee['index']]),
+                'before': knee['before'],
+                'after': knee['after'],
+                'direction': knee['direction'],
+                'confidence': knee['confidence'],
+            })
+    return sorted(rows, key=lambda r: r['rel_time'])
+
+def load_test_results(path):
+    """Load CSV hasil k6 dan konversi kolom timestamp (unix detik) ke datetime."""
+    df = pd.read_csv(path, low_memory=False)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+    # Urutkan sekali (stable) agar jendela waktu bisa dipotong dengan binary search
+    if not df['timestamp'].is_monotonic_increasing:
+        df = df.sort_values('timestamp', kind='stable', ignore_index=True)
+    return df
+
+def slice_time_window(df, start, end):
+    """
+    Potong df (terurut timestamp) ke rentang [start, end) dengan binary search, tanpa scan/mask penuh.
+    Return: potongan df.iloc (tidak menyalin data).
+    """
+    ts = df['timestamp'].to_numpy()
+    lo, hi = ts.searchsorted([pd.Timestamp(start).to_datetime64(), pd.Timestamp(end).to_datetime64()], side='left')
+    return df.iloc[lo:hi]
+
+def get_timeline_chart_data(df):
+    """
+    Siapkan data grafik Tab 4: rata-rata durasi & VUs per timestamp, plus RPS per detik.
+    Return: (chart_df, rps_df)
+    """
+    chart_df = df[df['metric_name'].isin(['http_req_duration', 'vus'])].pivot_table(
+        index='timestamp', columns='metric_name', values='metric_value', aggfunc='mean'
+    ).reset_index()
+
+    req_duration = df[df['metric_name'] == 'http_req_duration']
+    rps_df = req_duration.set_index('timestamp').resample('1s').count()[['metric_value']].reset_index()
+    rps_df.columns = ['timestamp', 'RPS']
+    return chart_df, rps_df
+
+# Tahapan request HTTP k6 (urut sesuai lifecycle request)
+PHASE_METRICS = {
+    'http_req_blocked': 'Blocked (DNS/Queue)',
+    'http_req_connecting': 'Connecting (TCP)',
+    'http_req_tls_handshaking': 'TLS Handshaking',
+    'http_req_sending': 'Sending (Upload)',
+    'http_req_waiting': 'Waiting (Server Processing)',
+    'http_req_receiving': 'Receiving (Download)',
+}
+
+def get_phase_breakdown(df):
+    """
+    Distribusi latency per tahapan request (avg, p50, p95, p99) dalam satu groupby.
+    Return: DataFrame index = label tahapan, atau None jika metrik tahapan tidak ada.
+    """
+    phases = df[df['metric_name'].isin(list(PHASE_METRICS))]
+    if phases.empty:
+        return None
+
+    grouped = phases.groupby('metric_name', sort=False)['metric_value']
+    breakdown = grouped.quantile([0.5, 0.95, 0.99]).unstack()
+    breakdown.columns = ['p50', 'p95', 'p99']
+    breakdown.insert(0, 'avg', grouped.mean())
+
+    order = [m for m in PHASE_METRICS if m in breakdown.index]
+    breakdown = breakdown.loc[order]
+    breakdown.index = [PHASE_METRICS[m] for m in order]
+    return breakdown
+
+def get_phase_timeline(df):
+    """
+    Rata-rata tiap tahapan per detik (format long untuk stacked area chart).
+    http_req_blocked di k6 sudah mencakup DNS, connecting, dan TLS pada koneksi baru, jadi yang ditumpuk hanya
+    sisa blocked di luar connecting + TLS (dipotong di 0) agar tinggi tumpukan tidak menghitung fase yang sama dua kali.
+    Return: DataFrame kolom [timestamp, Tahapan, ms, urutan] (urutan = index lifecycle untuk urutan tumpukan).
+    """
+    phases = df[df['metric_name'].isin(list(PHASE_METRICS))]
+    if phases.empty:
+        return pd.DataFrame(columns=['timestamp', 'Tahapan', 'ms', 'urutan'])
+
+    wide = phases.groupby([phases['timestamp'].dt.floor('1s'), 'metric_name'])['metric_value'].mean().unstack()
+    if 'http_req_blocked' in wide:
+        overlap = wide.reindex(columns=['http_req_connecting', 'http_req_tls_handshaking']).fillna(0).sum(axis=1)
+        wide['http_req_blocked'] = (wide['http_req_blocked'] - overlap).clip(lower=0)
+    order = [m for m in PHASE_METRICS if m in wide.columns]
+    timeline = wide[order].rename_axis(columns='Tahapan').stack().reset_index(name='ms')
+    timeline['urutan'] = timeline['Tahapan'].map({m: i for i, m in enumerate(PHASE_METRICS)})
+    timeline['Tahapan'] = timeline['Tahapan'].map(PHASE_METRICS)
+    return timeline
+
+# Kelas error berdasarkan tag error_code / status k6 (lihat k6 docs: "Error codes")
+ERROR_CLASS_HINTS = {
+    'Timeout': "Request melewati batas timeout 5s (main.js). Backend terlalu lambat atau antrian worker penuh.",
+    'Connection Refused': "Server menolak koneksi baru. Cek max connections / backlog web server, atau service sedang down.",
+    'Connection Reset': "Koneksi diputus sepihak oleh server/load balancer. Cek idle timeout, keep-alive, atau crash worker.",
+    'DNS Error': "Gagal resolve hostname. Cek DNS resolver atau rate limit DNS.",
+    'TLS Error': "Handshake TLS gagal. Cek sertifikat atau batas handshake di load balancer.",
+    'Rate Limited (429)': "Server/WAF membatasi request. Naikkan rate limit untuk IP load generator atau turunkan beban.",
+    'HTTP 5xx': "Server error internal. Cek application logs, exception, dan dependency (database, 3rd party).",
+    'HTTP 4xx': "Request ditolak (bukan 429). Cek payload, auth token, atau Expected HTTP Status.",
+    'Network Error': "Error jaringan lain tanpa status HTTP. Cek konektivitas load generator.",
+    'Lainnya': "Status tidak sesuai ekspektasi. Cek konfigurasi Expected HTTP Status.",
+}
+
+def classify_errors(reqs):
+    """
+    Klasifikasi baris request (tag status & error_code) ke kelas error secara vektor.
+    Return: array label (np.ndarray of str).
+    """
+    status = pd.to_numeric(reqs['status'], errors='coerce').fillna(0).to_numpy() if 'status' in reqs else np.zeros(len(reqs))
+    code = pd.to_numeric(reqs['error_code'], errors='coerce').fillna(0).to_numpy() if 'error_code' in reqs else np.zeros(len(reqs))
+
+    conditions = [
+        (code == 1050) | (code == 1211),
+        code == 1212,
+        code == 1220,
+        (code >= 1100) & (code < 1200),
+        (code >= 1300) & (code < 1400),
+        status == 429,
+        (status >= 500) & (status < 600),
+        (status >= 400) & (status < 500),
+        status == 0,
+    ]
+    labels = list(ERROR_CLASS_HINTS)[:len(conditions)]
+    return np.select(conditions, labels, default='Lainnya')
+
+def get_error_analysis(df, run_start=None):
+    """
+    Analisis error per status code & kelas error.
+    run_start: acuan "Pertama Muncul (detik)" (default awal df; isi dengan awal tes saat df berupa jendela waktu).
+    Return: dict {status_timeline, class_timeline, classes, total_failures} atau None jika tidak ada data request.
+    """
+    reqs = df[df['metric_name'] == 'http_req_failed']
+    if reqs.empty:
+        return None
+
+    start = run_start if run_start is not None else df['timestamp'].min()
+    second = reqs['timestamp'].dt.floor('1s')
+
+    # Timeline status code (semua request, termasuk yang sukses)
+    status = pd.to_numeric(reqs['status'], errors='coerce').fillna(0).astype(int).astype(str) if 'status' in reqs else pd.Series('?', index=reqs.index)
+    status_timeline = reqs.groupby([second, status]).size().reset_index()
+    status_timeline.columns = ['timestamp', 'Status', 'Jumlah']
+
+    failed_mask = reqs['metric_value'].to_numpy() == 1
+    failures = reqs[failed_mask]
+    total_failures = len(failures)
+    if total_failures == 0:
+        return {
+            'status_timeline': status_timeline,
+            'class_timeline': pd.DataFrame(columns=['timestamp', 'Kelas', 'Jumlah']),
+            'classes': pd.DataFrame(columns=['Jumlah', 'Porsi (%)', 'Pertama Muncul (detik)']),
+            'total_failures': 0,
+        }
+
+    error_class = classify_errors(failures)
+    class_timeline = failures.groupby([second[failed_mask], error_class]).size().reset_index()
+    class_timeline.columns = ['timestamp', 'Kelas', 'Jumlah']
+
+    by_class = failures['timestamp'].groupby(error_class)
+    classes = pd.DataFrame({
+        'Jumlah': by_class.size(),
+        'Pertama Muncul (detik)': (by_class.min() - start).dt.total_seconds().astype(int),
+    })
+    classes.insert(1, 'Porsi (%)', classes['Jumlah'] / total_failures * 100)
+    classes = classes.sort_values('Jumlah', ascending=False)
+
+    return {
+        'status_timeline': status_timeline,
+        'class_timeline': class_timeline,
+        'classes': classes,
+        'total_failures': total_failures,
+    }
+
+def get_latency_histogram(df, bins=30):
+    """Histogram http_req_duration (numpy) agar chart hanya menerima hasil binning, bukan semua baris."""
+    values = df.loc[df['metric_name'] == 'http_req_duration', 'metric_value'].to_numpy()
+    if len(values) == 0:
+        return pd.DataFrame(columns=['bin_start', 'bin_end', 'count'])
+    counts, edges = np.histogram(values, bins=bins)
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+# Checks (k6 check()) - batas pass rate & jendela untuk flag pelanggaran pertama
+CHECK_MIN_PASS_RATE = 95.0   # Persen
+CHECK_WINDOW_S = 5           # Detik per jendela evaluasi
+CHECK_MIN_SAMPLES = 5        # Jendela dengan sample lebih sedikit diabaikan (noise di awal/akhir tes)
+
+def get_checks_analysis(df, run_start=None):
+    """
+    Pass rate per check dari baris metrik `checks`, dikelompokkan per nama check dalam satu pass vektor (bincount).
+    Return: dict {summary, timeline} atau None jika tidak ada metrik checks.
+      summary  : DataFrame index = nama check, kolom [Total, Lulus, Pass Rate (%)]
+      timeline : DataFrame per detik [timestamp, detik, Check, passes, total, pass_rate]
+    """
+    checks = df.loc[df['metric_name'] == 'checks', ['timestamp', 'metric_value', 'check']] if 'check' in df else None
+    if checks is None or checks.empty:
+        return None
+
+    origin = run_start if run_start is not None else checks['timestamp'].iloc[0]
+    codes, names = pd.factorize(checks['check'].fillna('(tanpa nama)'))
+    seconds = ((checks['timestamp'].to_numpy() - origin.to_datetime64()) // np.timedelta64(1, 's')).astype(np.int64)
+    passed = checks['metric_value'].to_numpy(dtype=float)
+    n_names = len(names)
+
+    first = seconds.min()
+    key = (seconds - first) * n_names + codes
+    total = np.bincount(key)
+    passes = np.bincount(key, weights=passed)
+    cells = np.nonzero(total)[0]
+    sec_idx, check_idx = np.divmod(cells, n_names)
+
+    timeline = pd.DataFrame({
+        'detik': first + sec_idx,
+        'Check': np.asarray(names)[check_idx],
+        'passes': passes[cells],
+        'total': total[cells],
+    })
+    timeline['pass_rate'] = timeline['passes'] / timeline['total'] * 100
+    timeline.insert(0, 'timestamp', origin + pd.to_timedelta(timeline['detik'], unit='s'))
+
+    summary_total = np.bincount(codes, minlength=n_names)
+    summary_passes = np.bincount(codes, weights=passed, minlength=n_names)
+    summary = pd.DataFrame({
+        'Total': summary_total,
+        'Lulus': summary_passes.astype(int),
+        'Pass Rate (%)': summary_passes / summary_total * 100,
+    }, index=list(names))
+    return {'summary': summary, 'timeline': timeline}
+
+def find_check_breaches(timeline, min_pass_rate=CHECK_MIN_PASS_RATE, window_s=CHECK_WINDOW_S, min_samples=CHECK_MIN_SAMPLES):
+    """
+    Jendela pertama (per window_s detik) di mana pass rate tiap check turun di bawah min_pass_rate.
+    Return: DataFrame index = nama check, kolom [Mulai Detik, Pass Rate (%)] (hanya check yang melanggar, urut waktu).
+    """
+    window = timeline.assign(window=timeline['detik'] // window_s * window_s)
+    grouped = window.groupby(['Check', 'window'], sort=True)[['passes', 'total']].sum()
+    grouped = grouped[grouped['total'] >= min_samples]
+    rate = grouped['passes'] / grouped['total'] * 100
+    below = rate[rate < min_pass_rate].reset_index()
+    if below.empty:
+        return pd.DataFrame(columns=['Mulai Detik', 'Pass Rate (%)'])
+    first = below.groupby('Check').first()
+    first.columns = ['Mulai Detik', 'Pass Rate (%)']
+    return first.sort_values('Mulai Detik')
+
+# Heatmap latency x waktu: bucket latency log-scale, kolom waktu dibatasi agar matrix tetap kecil
+HEATMAP_LATENCY_BUCKETS = 40
+HEATMAP_MAX_COLUMNS = 300
+
+def get_latency_heatmap(df, run_start=None, latency_buckets=HEATMAP_LATENCY_BUCKETS, max_columns=HEATMAP_MAX_COLUMNS):
+    """
+    Histogram 2D http_req_duration (waktu x bucket latency log-scale) dalam satu pass numpy (bincount).
+    Lebar kolom waktu = kelipatan 1 detik sehingga paling banyak max_columns kolom, berapapun panjang run.
+    Return: DataFrame sel yang terisi saja [t_start, t_end, lat_lo, lat_hi, count] (detik relatif, ms).
+    """
+    columns = ['t_start', 't_end', 'lat_lo', 'lat_hi', 'count']
+    reqs = df.loc[df['metric_name'] == 'http_req_duration', ['timestamp', 'metric_value']]
+    if reqs.empty:
+        return pd.DataFrame(columns=columns)
+
+    origin = run_start if run_start is not None else reqs['timestamp'].iloc[0]
+    seconds = (reqs['timestamp'].to_numpy() - origin.to_datetime64()) / np.timedelta64(1, 's')
+    values = reqs['metric_value'].to_numpy(dtype=float)
+
+    # Bucket latency log-scale antara latency positif terkecil & terbesar (0 ms masuk bucket pertama)
+    positive = values[values > 0]
+    lo = max(positive.min(), 0.01) if len(positive) else 0.01
+    hi = max(values.max(), lo * 10)
+    edges = np.geomspace(lo, hi, latency_buckets + 1)
+    lat_idx = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, latency_buckets - 1)
+
+    first = np.floor(seconds.min())
+    span = seconds.max() - first + 1
+    width = max(1, int(np.ceil(span / max_columns)))
+    time_idx = ((seconds - first) // width).astype(np.int64)
+    n_cols = int(time_idx.max()) + 1
+
+    counts = np.bincount(time_idx * latency_buckets + lat_idx, minlength=n_cols * latency_buckets)
+    cells = np.nonzero(counts)[0]
+    t_idx, l_idx = np.divmod(cells, latency_buckets)
+    return pd.DataFrame({
+        't_start': first + t_idx * width,
+        't_end': first + (t_idx + 1) * width,
+        'lat_lo': edges[l_idx],
+        'lat_hi': edges[l_idx + 1],
+        'count': counts[cells],
+    })
+
+def get_window_aggregates(df, run_start=None):
+    """
+    Agregat headline (stats, persentil, breakdown tahapan, error, timeline) untuk df.
+    Dipakai untuk seluruh run (bundle) maupun jendela waktu hasil slice_time_window().
+    Return: dict agregat.
+    """
+    is_duration = df['metric_name'] == 'http_req_duration'
+    req_failed = df.loc[df['metric_name'] == 'http_req_failed', 'metric_value']
+    total_reqs = int(is_duration.sum())
+    failed_reqs = int(req_failed.sum()) if not req_failed.empty else 0
+
+    chart_df, rps_df = get_timeline_chart_data(df)
+    return {
+        'total_reqs': total_reqs,
+        'failed_reqs': failed_reqs,
+        'failure_rate': (failed_reqs / total_reqs * 100) if total_reqs > 0 else 0,
+        'stats': get_metric_summary(df, 'http_req_duration'),
+        'latency_hist': get_latency_histogram(df),
+        'latency_heatmap': get_latency_heatmap(df, run_start),
+        'phase_breakdown': get_phase_breakdown(df),
+        'phase_timeline': get_phase_timeline(df),
+        'error_analysis': get_error_analysis(df, run_start),
+        'checks': get_checks_analysis(df, run_start),
+        'chart_df': chart_df,
+        'rps_df': rps_df,
+    }
+
+def infer_stages_from_vus(chart_df, run_start):
+    """
+    Perkiraan stage dari kurva VUs (untuk run tanpa metadata skenario): ramp-up, hold di puncak, ramp-down.
+    Return: list dict {name, start_s, end_s, target} seperti get_scenario_stages().
+    """
+    if chart_df.empty or 'vus' not in chart_df:
+        return []
+    vus = chart_df[['timestamp', 'vus']].dropna()
+    if vus.empty or vus['vus'].max() <= 0:
+        return []
+    rel = (vus['timestamp'] - run_start).dt.total_seconds().to_numpy()
+    values = vus['vus'].to_numpy()
+    peak = values.max()
+    at_peak = np.nonzero(values >= peak * 0.95)[0]
+    hold_start, hold_end = float(rel[at_peak[0]]), float(rel[at_peak[-1]])
+
+    stages = []
+    if hold_start > 0:
+        stages.append({'name': 'Ramp-up', 'start_s': 0.0, 'end_s': hold_start, 'target': int(peak)})
+    stages.append({'name': 'Hold (Peak)', 'start_s': hold_start, 'end_s': hold_end, 'target': int(peak)})
+    if hold_end < rel[-1]:
+        stages.append({'name': 'Ramp-down', 'start_s': hold_end, 'end_s': float(rel[-1]), 'target': 0})
+    return stages
+
+def get_stage_presets(path, chart_df, run_start, duration_s):
+    """
+    Preset zoom jendela waktu: seluruh tes + tiap stage skenario.
+    Stage diambil dari metadata run (skenario k6/config.js) jika ada, selain itu diperkirakan dari kurva VUs.
+    Return: list (label, start_s, end_s) dalam detik relatif dari awal tes.
+    """
+    presets = [("Seluruh Tes", 0, duration_s)]
+    metadata = load_run_metadata(path)
+    if metadata:
+        stages = get_scenario_stages(metadata.get('test_type'), metadata.get('vus'), metadata.get('duration'))
+    else:
+        stages = infer_stages_from_vus(chart_df, run_start)
+
+    for i, stage in enumerate(stages, start=1):
+        start_s = int(stage['start_s'])
+        end_s = min(int(np.ceil(stage['end_s'])), duration_s)
+        if end_s <= start_s:
+            continue
+        presets.append((f"Stage {i}: {stage['name']} → {stage['target']} VU ({start_s}-{end_s}s)", start_s, end_s))
+    return presets
+
+def build_run_bundle(path):
+    """
+    Load satu run dan hitung semua agregat yang dipakai halaman hasil & laporan.
+    Hasilnya di-share lintas session lewat ResultCache, jadi JANGAN dimodifikasi setelah dibuat.
+    Return: dict bundle.
+    """
+    df = load_test_results(path)
+
+    # Coba ambil URL dr data jika ada, atau fallback ke 'Unknown'
+    target_url = "Unknown Target"
+    if 'url' in df.columns:
+        found_urls = df['url'].dropna().unique()
+        if len(found_urls) > 0:
+            target_url = found_urls[0]
+
+    run_start = df['timestamp'].iloc[0] if not df.empty else pd.Timestamp(0)
+    duration_s = int(np.ceil((df['timestamp'].iloc[-1] - run_start).total_seconds())) + 1 if not df.empty else 0
+
+    aggregates = get_window_aggregates(df, run_start)
+    diagnosis = get_breaking_point_analysis(df, aggregates['stats'])
+
+    # Self-monitoring load generator (k6) - apakah hasil tes valid?
+    gen_df = load_generator_metrics(path)
+    generator = get_generator_analysis(gen_df, diagnosis)
+    if diagnosis is not None:
+        diagnosis['generator'] = generator
+
+    # Metrik server yang dilampirkan (opsional): resource mana yang jenuh lebih dulu
+    target = get_run_target_analysis(path, df, run_start, diagnosis)
+    if diagnosis is not None:
+        diagnosis['target'] = target
+
+    return {
+        'df': df,
+        'target_url': target_url,
+        'run_start': run_start,
+        'duration_s': duration_s,
+        'stage_presets': get_stage_presets(path, aggregates['chart_df'], run_start, duration_s),
+        'diagnosis': diagnosis,
+        'gen_df': gen_df,
+        'generator': generator,
+        'target': target,
+        'sketch': build_run_sketch(df, run_start, path),
+        **aggregates,
+    }
+
 def get_metric_summary(df, metric_name):
     """Extracts summary stats for a specific metric."""
     subset = df[df['metric_name'] == metric_name]['metric_value']